@@ -1,7 +1,18 @@
+import os
+import sys
 import streamlit as st
 import joblib
 from time import sleep
 
+# Make the project root importable when launched as `streamlit run analysis/app.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.data_clean import TextCleaningEngine  # noqa: E402
+from src.linear_scorer import build_fused_scorer  # noqa: E402
+from src.model_artifacts import load_mmap_scorer  # noqa: E402
+from src.prediction_cache import PredictionCache, artifact_version  # noqa: E402
+
+MMAP_ARTIFACTS_DIR = "model_artifacts"
+
 # MUST be the first Streamlit command
 st.set_page_config(page_title="Fake News Detector",
                    page_icon="📰", layout="centered")
@@ -11,12 +22,36 @@ st.set_page_config(page_title="Fake News Detector",
 
 @st.cache_resource
 def load_model():
+    # The version is taken before the files are read and kept with the model
+    # for the life of the process: if a retrain lands in between, predictions
+    # of the new model are filed under the old version and dropped on reload,
+    # never the other way round.
+    version = artifact_version(
+        os.path.join(MMAP_ARTIFACTS_DIR, "meta.json"), 'model.pkl', 'vectorizer.pkl')
+    # Prefer the memory-mapped artifacts: they load instantly and share pages
+    # between processes. Fall back to the joblib pickles.
+    if os.path.isdir(MMAP_ARTIFACTS_DIR):
+        return load_mmap_scorer(MMAP_ARTIFACTS_DIR).predict, version
     vectorizer = joblib.load('vectorizer.pkl')
     model = joblib.load('model.pkl')
-    return vectorizer, model
+    # The fused scorer skips sparse matrix construction for single articles
+    scorer = build_fused_scorer(vectorizer, model)
+    if scorer is not None:
+        return scorer.predict, version
+    return (lambda texts: model.predict(vectorizer.transform(texts))), version
+
+
+@st.cache_resource
+def load_prediction_cache(model_version: str):
+    # Versioned on the loaded model, so a restart after retraining starts afresh.
+    # The file is not shared with stream.py, which versions on the deployed model.
+    return PredictionCache(model_version=model_version,
+                           disk_path=".cache/predictions-local.sqlite")
 
 
-vectorizer, model = load_model()
+predict, model_version = load_model()
+prediction_cache = load_prediction_cache(model_version)
+cleaner = TextCleaningEngine()
 
 # Sidebar info
 st.sidebar.title("About")
@@ -39,8 +74,10 @@ if st.button("🔍 Check News"):
     else:
         with st.spinner("Analyzing the news..."):
             sleep(1)  # Simulate processing delay
-            transformed_input = vectorizer.transform([news_input])
-            prediction = model.predict(transformed_input)
+            # The model was trained on cleaned text, which is also the cache key
+            cleaned_input = cleaner.clean(news_input)
+            prediction = prediction_cache.get_or_compute_many(
+                [cleaned_input], lambda texts: predict(texts).tolist())
 
         if prediction[0] == 1:
             st.success("✅ The news article is **REAL**.", icon="✅")
@@ -0,0 +1,309 @@
+"""
+Reproducible offline benchmark of every pipeline stage.
+
+Builds seeded synthetic corpora (src.synthetic_data) at several scales and
+times cleaning, term counting and TF-IDF fitting as the training pipeline
+does them (StoredTfidfFeatureEngineeringStrategy), serving-time transform,
+training, evaluation, and single- and batch-article prediction. The corpora
+have a few thousand distinct terms and class cue words, so the model learns
+well above chance and accuracy numbers are meaningful. For each stage it records seconds, throughput
+in documents per second, and peak traced memory. Results can be saved as a
+baseline, and later runs compared against it with a regression threshold.
+A dtype parity check also trains the model on float64 and float32 features
+and fails when accuracy differs. No ZenML stack, MLflow server or network
+access is needed.
+
+    python benchmarks/pipeline_benchmark.py --scales 1000,100000
+    python benchmarks/pipeline_benchmark.py --dtype float64
+    python benchmarks/pipeline_benchmark.py --save benchmarks/baseline.json
+    python benchmarks/pipeline_benchmark.py --baseline benchmarks/baseline.json --threshold 0.15
+"""
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import click
+import numpy as np
+import pandas as pd
+import sklearn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sklearn.linear_model import LogisticRegression  # noqa: E402
+from sklearn.model_selection import train_test_split  # noqa: E402
+
+from src.data_clean import TextCleaningEngine  # noqa: E402
+from src.feature_engineering import StoredTfidfFeatureEngineeringStrategy, compact_csr  # noqa: E402
+from src.linear_scorer import FusedLinearScorer  # noqa: E402
+from src.model_evaluator import (  # noqa: E402
+    ModelEvaluator,
+    RegressionModelEvaluatorStrategy,
+    StreamingModelEvaluatorStrategy,
+)
+from src.synthetic_data import COMMON_WORDS, SyntheticNewsGenerator  # noqa: E402
+
+SEED = 42
+SINGLE_PREDICTIONS = 200
+REPEAT = 3
+# Distinct filler terms, and cue terms drawn only by one class. With about
+# 1% cue terms per article, test accuracy is about 0.8 from 20,000 articles up.
+VOCABULARY_SIZE = 5000
+CUE_WORDS_PER_CLASS = 50
+
+
+def pseudo_word(index: int, prefix: str) -> str:
+    """Letters-only word for `index` (the cleaner drops words containing digits)."""
+    letters = ""
+    while True:
+        index, remainder = divmod(index, 26)
+        letters += chr(ord("a") + remainder)
+        if index == 0:
+            return prefix + letters
+
+
+def labelled_news(n_docs: int, seed: int = SEED) -> pd.DataFrame:
+    """
+    Synthetic articles with a learnable class signal: both classes draw from
+    COMMON_WORDS plus VOCABULARY_SIZE pseudo-words, and each class also from
+    its own cue words. Classes are balanced and the rows shuffled.
+    """
+    shared = list(COMMON_WORDS) + [pseudo_word(index, "w") for index in range(VOCABULARY_SIZE)]
+    frames = []
+    for label in (0, 1):
+        cues = [pseudo_word(index, f"cue{'ab'[label]}") for index in range(CUE_WORDS_PER_CLASS)]
+        generator = SyntheticNewsGenerator(vocabulary=shared + cues, seed=seed + label)
+        frames.append(generator.generate(n_docs // 2 + label * (n_docs % 2)).assign(**{"class": label}))
+    df = pd.concat(frames, ignore_index=True)
+    return df.iloc[np.random.default_rng(seed).permutation(len(df))].reset_index(drop=True)
+
+
+def run_stage(fn: Callable[[], object], n_docs: int, measure_memory: bool,
+              repeat: int = REPEAT) -> Dict[str, float]:
+    """
+    Time `fn` (best of `repeat` runs) and, optionally, rerun it under
+    tracemalloc to get its peak memory.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    seconds = min(timings)
+    result = {"seconds": seconds, "docs_per_s": n_docs / seconds if seconds > 0 else float("inf")}
+    if measure_memory:
+        # A separate pass, so that tracing overhead does not distort the timing
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mb"] = peak / 2 ** 20
+    return result
+
+
+def benchmark_scale(n_docs: int, measure_memory: bool, dtype=np.float32,
+                    repeat: int = REPEAT) -> Dict[str, Dict[str, float]]:
+    """Run every stage on a synthetic corpus of `n_docs` documents."""
+    df = labelled_news(n_docs)
+    cleaner = TextCleaningEngine()
+    state = {}
+    stages = {}
+
+    def stage(name, fn, docs):
+        stages[name] = run_stage(fn, docs, measure_memory, repeat)
+
+    def clean():
+        state["cleaned"] = df.assign(text=cleaner.clean_series(df["text"]))
+    stage("clean", clean, n_docs)
+
+    cleaned = state["cleaned"]
+    train_indices, test_indices = train_test_split(
+        np.arange(n_docs), test_size=0.25, random_state=SEED)
+    y_train = cleaned["class"].to_numpy()[train_indices]
+    y_test = cleaned["class"].iloc[test_indices]
+    test_texts = cleaned["text"].iloc[test_indices]
+
+    # The training pipeline counts the whole corpus once, then fits TF-IDF
+    # on a split by selecting rows of the count matrix
+    def tfidf_count():
+        state["strategy"] = StoredTfidfFeatureEngineeringStrategy(None, cleaned, dtype=dtype)
+    stage("tfidf_count", tfidf_count, n_docs)
+
+    def tfidf_fit():
+        xv_train, xv_test = state["strategy"].fit_transform_split(cleaned, train_indices, test_indices)
+        state["xv_train"], state["xv_test"] = compact_csr(xv_train, dtype), compact_csr(xv_test, dtype)
+        state["vectorizer"] = state["strategy"].get_vectorizer()
+    stage("tfidf_fit", tfidf_fit, n_docs)
+
+    # Serving vectorizes raw (cleaned) text with the rebuilt vectorizer
+    def tfidf_transform():
+        state["vectorizer"].transform(test_texts)
+    stage("tfidf_transform", tfidf_transform, len(test_indices))
+
+    def train():
+        state["model"] = LogisticRegression().fit(state["xv_train"], y_train)
+    stage("train", train, len(train_indices))
+
+    def evaluate():
+        state["metrics"] = ModelEvaluator(RegressionModelEvaluatorStrategy()).evaluate(
+            state["model"], state["xv_test"], y_test)
+    stage("evaluate", evaluate, len(test_indices))
+
+    def evaluate_streaming():
+        ModelEvaluator(StreamingModelEvaluatorStrategy()).evaluate(
+            state["model"], state["xv_test"], y_test)
+    stage("evaluate_streaming", evaluate_streaming, len(test_indices))
+
+    vectorizer, model = state["vectorizer"], state["model"]
+    single_docs: List[str] = test_texts.iloc[:SINGLE_PREDICTIONS].tolist()
+
+    def predict_single():
+        for doc in single_docs:
+            model.predict_proba(vectorizer.transform([doc]))
+    stage("predict_single", predict_single, len(single_docs))
+
+    scorer = FusedLinearScorer.from_fitted(vectorizer, model)
+
+    def predict_single_fused():
+        for doc in single_docs:
+            scorer.predict_proba([doc])
+    stage("predict_single_fused", predict_single_fused, len(single_docs))
+
+    def predict_batch():
+        model.predict_proba(vectorizer.transform(test_texts))
+    stage("predict_batch", predict_batch, len(test_indices))
+    return stages, state["metrics"]["accuracy"]
+
+
+def matrix_mb(matrix) -> float:
+    """Memory of a CSR matrix's value and index arrays."""
+    return (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2 ** 20
+
+
+def dtype_parity(n_docs: int) -> Dict[str, float]:
+    """
+    Train the same TF-IDF + LogisticRegression model on float64 and on
+    float32 features and compare test accuracy, predictions and matrix size.
+    """
+    df = labelled_news(n_docs)
+    df = df.assign(text=TextCleaningEngine().clean_series(df["text"]))
+    train_indices, test_indices = train_test_split(
+        np.arange(n_docs), test_size=0.25, random_state=SEED)
+    labels = df["class"].to_numpy()
+    results = {}
+    for dtype in (np.float64, np.float32):
+        strategy = StoredTfidfFeatureEngineeringStrategy(None, df, dtype=dtype)
+        xv_train, xv_test = (compact_csr(matrix, dtype) for matrix in
+                             strategy.fit_transform_split(df, train_indices, test_indices))
+        model = LogisticRegression().fit(xv_train, labels[train_indices])
+        results[np.dtype(dtype).name] = {
+            "predictions": model.predict(xv_test),
+            "accuracy": model.score(xv_test, labels[test_indices]),
+            "matrix_mb": matrix_mb(xv_train) + matrix_mb(xv_test),
+        }
+    wide, narrow = results["float64"], results["float32"]
+    return {
+        "accuracy_float64": wide["accuracy"],
+        "accuracy_float32": narrow["accuracy"],
+        "accuracy_diff": abs(wide["accuracy"] - narrow["accuracy"]),
+        "prediction_agreement": float(np.mean(wide["predictions"] == narrow["predictions"])),
+        "matrix_mb_float64": wide["matrix_mb"],
+        "matrix_mb_float32": narrow["matrix_mb"],
+    }
+
+
+def environment() -> Dict[str, str]:
+    """Versions and hardware details stored alongside results."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scikit-learn": sklearn.__version__,
+        "machine": platform.machine(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return 'scale/stage' names whose throughput dropped by more than `threshold`."""
+    regressions = []
+    for scale, stages in results["scales"].items():
+        for stage, metrics in stages.items():
+            reference = baseline.get("scales", {}).get(scale, {}).get(stage)
+            if reference and metrics["docs_per_s"] < reference["docs_per_s"] * (1 - threshold):
+                regressions.append(f"{scale}/{stage}")
+    return regressions
+
+
+@click.command()
+@click.option("--scales", default="1000,100000",
+              help="Comma-separated corpus sizes, e.g. 1000,100000,1000000.")
+@click.option("--repeat", default=REPEAT, type=int, help="Timed runs per stage; the fastest is kept.")
+@click.option("--memory/--no-memory", default=True,
+              help="Also measure peak traced memory (runs every stage twice).")
+@click.option("--save", "save_path", default=None, help="Write results to this JSON file.")
+@click.option("--baseline", "baseline_path", default=None, help="Compare against a saved JSON file.")
+@click.option("--threshold", default=0.15, type=float,
+              help="Relative throughput drop that counts as a regression.")
+@click.option("--dtype", default="float32", type=click.Choice(["float32", "float64"]),
+              help="Value type of the TF-IDF matrices in the timed stages.")
+@click.option("--parity-tolerance", default=0.001, type=float,
+              help="Largest accepted float64/float32 accuracy difference.")
+def main(scales: str, repeat: int, memory: bool, save_path: str, baseline_path: str,
+         threshold: float, dtype: str, parity_tolerance: float):
+    """Benchmark every pipeline stage on synthetic corpora."""
+    results = {"environment": environment(), "seed": SEED, "repeat": repeat, "dtype": dtype,
+               "scales": {}, "accuracy": {}, "dtype_parity": {}}
+    parity_failures = []
+    baseline = {}
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    for n_docs in [int(scale) for scale in scales.split(",")]:
+        print(f"\n== {n_docs} documents ==")
+        stages, accuracy = benchmark_scale(n_docs, memory, np.dtype(dtype).type, repeat)
+        results["scales"][str(n_docs)] = stages
+        results["accuracy"][str(n_docs)] = accuracy
+        reference = baseline.get("scales", {}).get(str(n_docs), {})
+        print(f"{'stage':22s} {'seconds':>9s} {'docs/s':>12s} {'peak MB':>9s} {'vs baseline':>12s}")
+        for stage, metrics in stages.items():
+            change = ""
+            if stage in reference:
+                change = f"{metrics['docs_per_s'] / reference[stage]['docs_per_s'] - 1:+.1%}"
+            peak = f"{metrics['peak_mb']:.1f}" if "peak_mb" in metrics else "-"
+            print(f"{stage:22s} {metrics['seconds']:9.3f} {metrics['docs_per_s']:12.0f} "
+                  f"{peak:>9s} {change:>12s}")
+        print(f"test accuracy: {accuracy:.4f}")
+
+        parity = dtype_parity(n_docs)
+        results["dtype_parity"][str(n_docs)] = parity
+        print(f"dtype parity: accuracy float64 {parity['accuracy_float64']:.4f}, "
+              f"float32 {parity['accuracy_float32']:.4f}, predictions agree "
+              f"{parity['prediction_agreement']:.2%}, matrices {parity['matrix_mb_float64']:.1f} MB "
+              f"-> {parity['matrix_mb_float32']:.1f} MB")
+        if parity["accuracy_diff"] > parity_tolerance:
+            parity_failures.append(str(n_docs))
+
+    if save_path:
+        with open(save_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {save_path}")
+    if parity_failures:
+        print(f"\nfloat32 accuracy differs from float64 by more than {parity_tolerance} "
+              f"at scales: {', '.join(parity_failures)}")
+        sys.exit(1)
+    if baseline:
+        regressions = compare(results, baseline, threshold)
+        if regressions:
+            print(f"\nThroughput regressions over {threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nNo throughput regressions over {threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measures how long each entry point takes to import, so that import-time
+regressions (eager artifact loads, stack lookups, heavy imports) show up.
+
+Each module is imported in a fresh interpreter with `python -X importtime`.
+The script reports the median wall time and the cumulative import time of
+the module itself.
+
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --save benchmarks/startup_baseline.json
+    python benchmarks/startup_benchmark.py --baseline benchmarks/startup_baseline.json --threshold 0.2
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import click
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = [
+    "run_pipeline",
+    "run_deployment",
+    "run_inference_server",
+    "pipelines.training_pipeline",
+    "pipelines.deployment_pipeline",
+    "steps.predictor",
+    "steps.model_building_step",
+]
+IMPORTTIME_LINE = re.compile(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+(.*)$")
+
+
+def measure_import(module: str) -> dict:
+    """Import `module` in a fresh interpreter and return its timings in seconds."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    cumulative = None
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and match.group(2).strip() == module:
+            cumulative = int(match.group(1)) / 1e6
+    return {"ok": result.returncode == 0, "wall_s": wall, "import_s": cumulative,
+            "error": result.stderr.strip().splitlines()[-1] if result.returncode else None}
+
+
+@click.command()
+@click.option("--repeat", default=5, type=int, help="Imports per entry point; the median is reported.")
+@click.option("--save", "save_path", default=None, help="Write the results to this JSON file.")
+@click.option("--baseline", "baseline_path", default=None, help="Compare against a saved JSON file.")
+@click.option("--threshold", default=0.2, type=float,
+              help="Relative slowdown over the baseline that counts as a regression.")
+def main(repeat: int, save_path: str, baseline_path: str, threshold: float):
+    """Benchmark the import time of every entry point."""
+    results = {}
+    for module in ENTRY_POINTS:
+        runs = [measure_import(module) for _ in range(repeat)]
+        if not all(run["ok"] for run in runs):
+            print(f"{module:35s} FAILED: {runs[0]['error']}")
+            continue
+        imports = [run["import_s"] for run in runs if run["import_s"] is not None]
+        results[module] = {
+            "wall_s": statistics.median(run["wall_s"] for run in runs),
+            "import_s": statistics.median(imports) if imports else None,
+        }
+
+    baseline = {}
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'entry point':35s} {'wall (s)':>10s} {'import (s)':>11s} {'vs baseline':>12s}")
+    for module, timing in results.items():
+        change = ""
+        if module in baseline:
+            ratio = timing["wall_s"] / baseline[module]["wall_s"] - 1
+            change = f"{ratio:+.1%}"
+            if ratio > threshold:
+                regressions.append(module)
+                change += " !"
+        import_s = f"{timing['import_s']:.3f}" if timing["import_s"] is not None else "-"
+        print(f"{module:35s} {timing['wall_s']:10.3f} {import_s:>11s} {change:>12s}")
+
+    if save_path:
+        with open(save_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {save_path}")
+    if regressions:
+        print(f"Import time regressions over {threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ from steps.dynamic_importer import dynamic_importer
 from steps.model_loader import model_loader
 from steps.prediction_service_loader import prediction_service_loader
 from steps.predictor import predictor
+from steps.text_model_logger_step import text_model_logger_step
+from src.resources import experiment_tracker_name
 from zenml import pipeline
 from zenml.integrations.mlflow.steps import mlflow_model_deployer_step
 
@@ -23,13 +25,18 @@ requirements_file = os.path.join(os.path.dirname(__file__), "requirements.txt")
 def continuous_deployment_pipeline():
     """Run a training job and deploy an MLflow model deployment."""
     # Run the training pipeline
-    # fake_news_detection_pipeline now returns (model, accuracy, classification_report)
+    # fake_news_detection_pipeline returns (model, accuracy, classification_report, vectorizer)
     # Unpack and ignore accuracy/report for deployment
-    trained_model, _, _ = fake_news_detection_pipeline()
+    trained_model, _, _, vectorizer = fake_news_detection_pipeline()
 
-    # Deploy the trained model
+    # Bundle cleaner, vectorizer and classifier into a text-in pyfunc model
+    text_model_uri = text_model_logger_step.with_options(
+        experiment_tracker=experiment_tracker_name())(
+        model=trained_model, vectorizer=vectorizer, artifact_path="text_model")
+
+    # Deploy the text-in model, so clients send raw text instead of dense vectors
     mlflow_model_deployer_step(
-        workers=3, deploy_decision=True, model=trained_model)
+        workers=3, deploy_decision=True, model=text_model_uri, model_name="text_model")
 
 
 @pipeline(enable_cache=False)
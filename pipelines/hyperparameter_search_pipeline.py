@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Optional
+
+from steps.data_ingestion_step import data_ingestion_step
+from steps.data_prep_step import data_prep_step
+from steps.outlier_detection_step import outlier_detection_step
+from steps.text_cleaning_step import text_cleaning_step
+from steps.hyperparameter_search_step import hyperparameter_search_step
+from src.resources import experiment_tracker_name
+from zenml import pipeline
+
+
+@pipeline
+def hyperparameter_search_pipeline(
+    true_csv_path: str = "./data/True.csv",
+    fake_csv_path: str = "./data/Fake.csv",
+    text_column: str = "text",
+    target_column: str = "class",
+    param_grid: Optional[Dict[str, List[Any]]] = None,
+    n_iter: Optional[int] = None,
+    n_splits: int = 3,
+    random_state: int = 42,
+    n_jobs: int = -1,
+    ingest_cache_dir: str = ".cache/ingestion",
+    outlier_action: str = "truncate",
+    cleaning_n_jobs: int = 1,
+    feature_store_dir: str = ".cache/features",
+    search_work_dir: str = ".cache/search"
+):
+    """
+    Prepares and cleans the data like the training pipeline, then searches
+    TF-IDF and LogisticRegression parameters over term counts computed once
+    and shared by all worker processes through memory-mapped arrays.
+    """
+
+    true_data_df = data_ingestion_step(
+        file_path=true_csv_path,
+        columns=[text_column],
+        dtype={text_column: "str"},
+        cache_dir=ingest_cache_dir
+    )
+    fake_data_df = data_ingestion_step(
+        file_path=fake_csv_path,
+        columns=[text_column],
+        dtype={text_column: "str"},
+        cache_dir=ingest_cache_dir
+    )
+    prepared_data_df = data_prep_step(
+        true_raw_df=true_data_df,
+        fake_raw_df=fake_data_df
+    )
+    bounded_data_df = outlier_detection_step(
+        data=prepared_data_df,
+        column_name=text_column,
+        action=outlier_action
+    )
+    cleaned_data_df = text_cleaning_step(
+        data=bounded_data_df,
+        text_column=text_column,
+        n_jobs=cleaning_n_jobs,
+        feature_store_dir=feature_store_dir
+    )
+
+    # Every trial is logged as a nested run of the experiment tracker
+    results = hyperparameter_search_step.with_options(
+        experiment_tracker=experiment_tracker_name())(
+        data=cleaned_data_df,
+        text_column=text_column,
+        target_column=target_column,
+        param_grid=param_grid,
+        n_iter=n_iter,
+        n_splits=n_splits,
+        random_state=random_state,
+        n_jobs=n_jobs,
+        work_dir=search_work_dir,
+        feature_store_dir=feature_store_dir
+    )
+    return results
@@ -1,11 +1,17 @@
+from typing import List, Optional, Union
+
 from steps.data_ingestion_step import data_ingestion_step
 from steps.data_prep_step import data_prep_step  # Added
+from steps.outlier_detection_step import outlier_detection_step
 from steps.text_cleaning_step import text_cleaning_step
 from steps.data_splitter_step import data_splitter_step
 from steps.feature_engineering_step import feature_engineering_step
+from steps.vocabulary_budget_step import vocabulary_budget_step
 from steps.model_building_step import model_building_step
+from steps.incremental_model_building_step import incremental_model_building_step
 from steps.model_evaluator_step import model_evaluator_step
 from steps.model_serializer_step import model_serializer_step
+from src.resources import experiment_tracker_name
 from zenml import Model, pipeline
 
 
@@ -21,17 +27,42 @@ def fake_news_detection_pipeline(
     target_column: str = "class",
     test_size: float = 0.25,
     random_state: int = 42,
+    split_strategy: str = "random",
+    ingest_cache_dir: str = ".cache/ingestion",
+    outlier_action: str = "truncate",
+    cleaning_n_jobs: int = 1,
+    cleaning_chunk_size: int = 10000,
+    feature_store_dir: str = ".cache/features",
+    feature_strategy: str = "tfidf",
+    hashing_n_features: int = 2 ** 20,
+    feature_dtype: str = "float32",
+    vocabulary_min_df: Union[int, float] = 2,
+    vocabulary_max_df: Union[int, float] = 0.95,
+    vocabulary_max_features: Optional[int] = None,
+    vocabulary_selection: str = "chi2",
+    vocabulary_budgets: Optional[List[int]] = None,
+    trainer: str = "logistic",
+    evaluation_chunk_size: int = 10000,
     model_output_path: str = "model.pkl",
-    vectorizer_output_path: str = "vectorizer.pkl"
+    vectorizer_output_path: str = "vectorizer.pkl",
+    mmap_artifacts_dir: str = "model_artifacts",
+    artifact_quantization: Optional[str] = None,
+    quantized_artifacts_dir: str = "model_artifacts_quantized"
 ):
     """Defines an end-to-end machine learning pipeline for fake news detection."""
 
-    # Data Ingestion Step
+    # Data Ingestion Step (cached as Parquet, reading only the text column)
     true_data_df = data_ingestion_step(
-        file_path=true_csv_path
+        file_path=true_csv_path,
+        columns=[text_column],
+        dtype={text_column: "str"},
+        cache_dir=ingest_cache_dir
     )
     fake_data_df = data_ingestion_step(
-        file_path=fake_csv_path
+        file_path=fake_csv_path,
+        columns=[text_column],
+        dtype={text_column: "str"},
+        cache_dir=ingest_cache_dir
     )
 
     # Data Preparation Step
@@ -40,52 +71,113 @@ def fake_news_detection_pipeline(
         fake_raw_df=fake_data_df
     )
 
+    # Outlier Detection Step (bounds huge or junk documents before cleaning)
+    bounded_data_df = outlier_detection_step(
+        data=prepared_data_df,
+        column_name=text_column,
+        action=outlier_action
+    )
+
     # Text Cleaning Step
     cleaned_data_df = text_cleaning_step(
-        data=prepared_data_df,  # Changed from raw_data_df
-        text_column=text_column
+        data=bounded_data_df,
+        text_column=text_column,
+        n_jobs=cleaning_n_jobs,
+        chunk_size=cleaning_chunk_size,
+        feature_store_dir=feature_store_dir
     )
 
-    # Data Splitting Step
-    X_train, X_test, y_train, y_test = data_splitter_step(
+    # Data Splitting Step (row indices only, no copies of the text)
+    train_indices, test_indices, y_train, y_test = data_splitter_step(
         df=cleaned_data_df,
-        text_column=text_column,
         target_column=target_column,
         test_size=test_size,
-        random_state=random_state
+        random_state=random_state,
+        strategy=split_strategy
     )
 
-    # Feature Engineering Step (TF-IDF)
+    # Vocabulary Budget Step (optional): size/throughput/accuracy report per
+    # budget on a validation split of the training rows; the smallest model
+    # within 0.5% accuracy of the full one is used, which needs the budgeted
+    # feature strategy
+    min_df, max_df, max_features = vocabulary_min_df, vocabulary_max_df, vocabulary_max_features
+    if vocabulary_budgets:
+        feature_strategy = "budgeted"
+        _, min_df, max_df, max_features = vocabulary_budget_step.with_options(
+            experiment_tracker=experiment_tracker_name())(
+            data=cleaned_data_df,
+            train_indices=train_indices,
+            budgets=vocabulary_budgets,
+            text_column=text_column,
+            target_column=target_column,
+            min_df=vocabulary_min_df,
+            max_df=vocabulary_max_df,
+            feature_selection=vocabulary_selection,
+            random_state=random_state,
+            feature_store_dir=feature_store_dir
+        )
+
+    # Feature Engineering Step (TF-IDF, budgeted TF-IDF or feature hashing,
+    # built once and sliced)
     vectorizer, xv_train, xv_test = feature_engineering_step(
-        x_train=X_train,
-        x_test=X_test
+        data=cleaned_data_df,
+        train_indices=train_indices,
+        test_indices=test_indices,
+        text_column=text_column,
+        target_column=target_column,
+        strategy=feature_strategy,
+        n_features=hashing_n_features,
+        min_df=min_df,
+        max_df=max_df,
+        max_features=max_features,
+        feature_selection=vocabulary_selection,
+        dtype=feature_dtype,
+        feature_store_dir=feature_store_dir
     )
 
-    # Model Building Step (Logistic Regression)
-    trained_model = model_building_step(
-        xv_train=xv_train,
-        y_train=y_train
-    )
+    # Model Building Step (Logistic Regression, or incremental SGD trained in
+    # resumable chunks of the in-memory training matrix)
+    # The experiment tracker is resolved here, on first use, rather than at import
+    tracker = experiment_tracker_name()
+    if trainer == "sgd":
+        trained_model = incremental_model_building_step.with_options(
+            experiment_tracker=tracker)(
+            xv_train=xv_train,
+            y_train=y_train
+        )
+    else:
+        trained_model = model_building_step.with_options(
+            experiment_tracker=tracker)(
+            xv_train=xv_train,
+            y_train=y_train
+        )
 
     # Model Evaluation Step
-    accuracy, classification_report = model_evaluator_step(  # Unpack directly
+    # Streams the test set in chunks; all metrics are logged to the tracker
+    accuracy, classification_report, evaluation_metrics = model_evaluator_step.with_options(
+        experiment_tracker=tracker)(
         trained_model=trained_model,
         xv_test=xv_test,
-        y_test=y_test
+        y_test=y_test,
+        chunk_size=evaluation_chunk_size
     )
-    # accuracy = metrics["accuracy"] # No longer needed
-    # classification_report = metrics["classification_report"] # No longer needed
 
     # Model Serialization Step
     model_serializer_step(
         model=trained_model,
         vectorizer=vectorizer,
         model_path=model_output_path,
-        vectorizer_path=vectorizer_output_path
+        vectorizer_path=vectorizer_output_path,
+        mmap_artifacts_dir=mmap_artifacts_dir,
+        quantize=artifact_quantization,
+        quantized_artifacts_dir=quantized_artifacts_dir,
+        fidelity_data=cleaned_data_df if artifact_quantization else None,
+        fidelity_indices=test_indices if artifact_quantization else None,
+        text_column=text_column
     )
 
     # Return the trained model first, so it can be used by deployment pipelines
-    return trained_model, accuracy, classification_report
+    return trained_model, accuracy, classification_report, vectorizer
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+import os
+import sys
+from typing import Optional
+
+import click
+from src.batch_scoring import BatchScorer
+
+
+def print_progress(rows: int, total: Optional[int], seconds: float) -> None:
+    """One-line progress display: rows written, percentage, throughput and ETA."""
+    rate = rows / seconds if seconds > 0 else 0.0
+    line = f"\r{rows:,} rows"
+    if total:
+        remaining = (total - rows) / rate if rate > 0 else float("inf")
+        line += f" / {total:,} ({rows / total:.1%}), ETA {remaining:,.0f}s"
+    sys.stderr.write(f"{line}, {rate:,.0f} rows/s   ")
+    sys.stderr.flush()
+
+
+@click.command()
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--output", "output_path", default=None,
+              help="CSV file for the predictions (default: <input>.predictions.csv).")
+@click.option("--model-path", default="model.pkl", help="Pickled model from model_serializer_step.")
+@click.option("--vectorizer-path", default="vectorizer.pkl",
+              help="Pickled vectorizer from model_serializer_step.")
+@click.option("--text-column", default="text", help="Column holding the article text.")
+@click.option("--id-column", default=None, help="Column copied to the output to join results.")
+@click.option("--chunk-size", default=10000, type=int, help="Articles scored per task.")
+@click.option("--n-jobs", default=-1, type=int, help="Worker processes (-1 = all cores).")
+@click.option("--resume/--no-resume", default=True,
+              help="Continue an interrupted run from its last written chunk; "
+                   "--no-resume overwrites an existing output.")
+def run_main(input_path: str, output_path: Optional[str], model_path: str, vectorizer_path: str,
+             text_column: str, id_column: Optional[str], chunk_size: int, n_jobs: int, resume: bool):
+    """Score a large CSV or Parquet file of articles locally, without the prediction service."""
+    output_path = output_path or f"{os.path.splitext(input_path)[0]}.predictions.csv"
+    scorer = BatchScorer(model_path=model_path, vectorizer_path=vectorizer_path,
+                         text_column=text_column, id_column=id_column,
+                         chunk_size=chunk_size, n_jobs=n_jobs)
+    stats = scorer.score_file(input_path, output_path, resume=resume, progress=print_progress)
+    sys.stderr.write("\n")
+    print(f"Scored {stats['rows_scored']:,} articles ({stats['rows_skipped']:,} already done) "
+          f"in {stats['seconds']:.1f}s, {stats['rows_per_second']:,.0f} rows/s -> {output_path}")
+
+
+if __name__ == "__main__":
+    run_main()
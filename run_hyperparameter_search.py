@@ -0,0 +1,31 @@
+import json
+
+import click
+
+
+@click.command()
+@click.option("--param-grid", default=None,
+              help='JSON object of candidate values, e.g. \'{"C": [0.1, 1, 10], "min_df": [1, 5]}\'.')
+@click.option("--n-iter", type=int, default=None,
+              help="Sample this many random settings instead of the full grid.")
+@click.option("--n-splits", type=int, default=3, show_default=True,
+              help="Stratified folds per trial (1 = single train/test split).")
+@click.option("--n-jobs", type=int, default=-1, show_default=True,
+              help="Worker processes sharing the memory-mapped features (-1 = all cores).")
+def main(param_grid, n_iter, n_splits, n_jobs):
+    """Search TF-IDF and LogisticRegression parameters, logging every trial to MLflow."""
+    # Imported here so --help does not load ZenML
+    from pipelines.hyperparameter_search_pipeline import hyperparameter_search_pipeline
+
+    hyperparameter_search_pipeline(
+        param_grid=json.loads(param_grid) if param_grid else None,
+        n_iter=n_iter,
+        n_splits=n_splits,
+        n_jobs=n_jobs,
+    )
+    print("Search complete. Compare the trial runs in the MLflow UI "
+          "(see run_pipeline.py for the tracking URI).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import click
+import joblib
+import numpy as np
+from src.incremental_training import train_from_file
+from src.model_artifacts import remove_artifacts
+
+
+@click.command()
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--text-column", default="text", help="Column holding the article text.")
+@click.option("--target-column", default="class", help="Column holding the labels.")
+@click.option("--classes", default="0,1", help="Comma-separated class labels in the file.")
+@click.option("--chunk-size", default=50000, type=int, help="Rows read and trained on at a time.")
+@click.option("--n-features", default=2 ** 20, type=int, help="Number of hashed feature columns.")
+@click.option("--epochs", default=5, type=int, help="Passes over the file.")
+@click.option("--alpha", default=1e-5, type=float, help="L2 regularisation strength.")
+@click.option("--checkpoint-path", default=".cache/checkpoints/out_of_core_model.joblib",
+              help="Checkpoint used to resume an interrupted run.")
+@click.option("--model-path", default="model.pkl", help="Where to save the trained model.")
+@click.option("--vectorizer-path", default="vectorizer.pkl", help="Where to save the vectorizer.")
+@click.option("--mmap-artifacts-dir", default="model_artifacts",
+              help="Memory-mappable export of an earlier model, removed so servers load the new pickles.")
+def run_main(input_path: str, text_column: str, target_column: str, classes: str, chunk_size: int,
+             n_features: int, epochs: int, alpha: float, checkpoint_path: str, model_path: str,
+             vectorizer_path: str, mmap_artifacts_dir: str):
+    """Train on a CSV or Parquet file larger than memory by streaming it in chunks."""
+    labels = np.array([int(label) if label.lstrip("-").isdigit() else label
+                       for label in classes.split(",")])
+    model, vectorizer = train_from_file(
+        input_path, labels, text_column=text_column, target_column=target_column,
+        chunk_size=chunk_size, n_features=n_features, epochs=epochs, alpha=alpha,
+        checkpoint_path=checkpoint_path)
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+    # Hashed features cannot be exported as memory-mappable artifacts
+    remove_artifacts(mmap_artifacts_dir)
+    print(f"Trained on {input_path} for {epochs} epochs -> {model_path}, {vectorizer_path}")
+
+
+if __name__ == "__main__":
+    run_main()
@@ -0,0 +1,54 @@
+import asyncio
+import os
+
+import click
+from src.batching_server import InferenceServer, MicroBatcher, load_batch_predictor
+from src.model_artifacts import META_FILE
+from src.prediction_cache import PredictionCache, artifact_version
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Interface to bind to.")
+@click.option("--port", default=8080, type=int, help="Port to listen on.")
+@click.option("--max-batch-size", default=64, type=int,
+              help="Maximum number of articles scored in one batch.")
+@click.option("--max-wait-ms", default=5.0, type=float,
+              help="Longest time a request waits for its batch to fill.")
+@click.option("--model-path", default="model.pkl", help="Pickled model from model_serializer_step.")
+@click.option("--vectorizer-path", default="vectorizer.pkl",
+              help="Pickled vectorizer from model_serializer_step.")
+@click.option("--mmap-artifacts-dir", default="model_artifacts",
+              help="Memory-mappable artifacts (float or quantized export), used instead "
+                   "of the pickles when present.")
+@click.option("--cache-size", default=10000, type=int,
+              help="Number of cached predictions kept in memory (0 disables the cache).")
+@click.option("--cache-path", default=None,
+              help="SQLite file that keeps cached predictions across restarts.")
+def run_main(host: str, port: int, max_batch_size: int, max_wait_ms: float,
+             model_path: str, vectorizer_path: str, mmap_artifacts_dir: str,
+             cache_size: int, cache_path: str):
+    """Serve the fake news detector locally with asyncio micro-batching."""
+    cache = None
+    if cache_size > 0:
+        cache = PredictionCache(
+            model_version=artifact_version(
+                model_path, vectorizer_path, os.path.join(mmap_artifacts_dir, META_FILE)),
+            max_entries=cache_size, disk_path=cache_path)
+    predict_batch = load_batch_predictor(
+        model_path=model_path, vectorizer_path=vectorizer_path,
+        mmap_artifacts_dir=mmap_artifacts_dir, cache=cache)
+    batcher = MicroBatcher(predict_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    server = InferenceServer(batcher, host=host, port=port)
+
+    print(
+        f"Serving on http://{host}:{port}\n"
+        f"    curl -X POST http://{host}:{port}/predict -d '{{\"text\": \"...\"}}'"
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Inference server stopped.")
+
+
+if __name__ == "__main__":
+    run_main()
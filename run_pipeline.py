@@ -1,5 +1,6 @@
 import click
 from pipelines.training_pipeline import fake_news_detection_pipeline
+from src.instrumentation import format_summary, load_step_metrics
 from zenml.integrations.mlflow.mlflow_utils import get_tracking_uri
 
 
@@ -13,6 +14,12 @@ def main():
 
     # Run the ML pipeline
     run = fake_news_detection_pipeline()
+
+    # Per-step cost recorded by src.instrumentation (cached steps do not run)
+    records = load_step_metrics(pipeline_run_id=str(run.id)) if run is not None else []
+    if records:
+        print("\nStep performance summary:")
+        print(format_summary(records))
     # Print the run ID
     print(
         "Now run \n "
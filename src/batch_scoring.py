@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_clean import TextCleaningEngine, resolve_n_jobs
+from src.data_ingest import PARQUET_EXTENSIONS, DataIngestorFactory, has_extension
+from src.prediction_cache import artifact_version
+from src.resources import load_artifact
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Receives rows written so far, total rows (None when unknown) and elapsed seconds
+ProgressCallback = Callable[[int, Optional[int], float], None]
+
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(model_path: str, vectorizer_path: str) -> None:
+    """Load the artifacts once per worker process."""
+    _worker["cleaner"] = TextCleaningEngine()
+    _worker["model"] = load_artifact(model_path)
+    _worker["vectorizer"] = load_artifact(vectorizer_path)
+
+
+def _score_texts(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Clean, vectorize and score one chunk; return predictions and class probabilities."""
+    model, vectorizer = _worker["model"], _worker["vectorizer"]
+    cleaned = _worker["cleaner"].clean_batch(texts)
+    probabilities = model.predict_proba(vectorizer.transform(cleaned))
+    return model.classes_[probabilities.argmax(axis=1)], probabilities
+
+
+def count_rows(file_path: str) -> Optional[int]:
+    """Number of rows of a Parquet file from its metadata, None for other formats."""
+    if not has_extension(file_path, PARQUET_EXTENSIONS):
+        return None
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(file_path).metadata.num_rows
+
+
+class BatchScorer:
+    """
+    Scores a large file of articles without the HTTP service.
+
+    The input (CSV, Parquet or Arrow) is streamed in chunks. Each chunk is
+    cleaned, vectorized and scored in a process pool, with the model and
+    vectorizer loaded once per worker. Results are appended to a CSV file in
+    input order: row number, optional id column, prediction and one
+    probability column per class. After every chunk the number of rows and
+    bytes written is recorded in `<output>.progress.json`, with the input's
+    size and modification time, so an interrupted run resumes from that
+    offset only while the input is unchanged.
+    """
+
+    def __init__(self, model_path: str = "model.pkl", vectorizer_path: str = "vectorizer.pkl",
+                 text_column: str = "text", id_column: Optional[str] = None,
+                 chunk_size: int = 10000, n_jobs: int = 1):
+        """
+        :param model_path: Pickled classifier from model_serializer_step.
+        :param vectorizer_path: Pickled vectorizer from model_serializer_step.
+        :param text_column: Column holding the article text.
+        :param id_column: Optional column copied to the output to join results.
+        :param chunk_size: Articles read and scored per task.
+        :param n_jobs: Worker processes; 1 scores in this process, -1 uses every core.
+        """
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.text_column = text_column
+        self.id_column = id_column
+        self.chunk_size = chunk_size
+        self.n_jobs = resolve_n_jobs(n_jobs)
+
+    @staticmethod
+    def progress_path(output_path: str) -> str:
+        """Path of the progress file kept next to the output."""
+        return f"{output_path}.progress.json"
+
+    @staticmethod
+    def _input_state(input_path: str) -> Dict[str, object]:
+        """Path, size and modification time identifying the input of a run."""
+        stat = os.stat(input_path)
+        return {"input_path": os.path.abspath(input_path), "input_size": stat.st_size,
+                "input_mtime_ns": stat.st_mtime_ns}
+
+    def _resume_offset(self, input_state: Dict[str, object], output_path: str,
+                       model_version: str, resume: bool) -> Tuple[int, int]:
+        """
+        Rows and bytes already written by a previous run, or (0, 0) to start over.
+        When resuming, an existing non-empty output is only continued from its
+        progress file, and only if it was written for the same, unchanged
+        input and the same model.
+        """
+        if not resume:
+            return 0, 0
+        progress_path = self.progress_path(output_path)
+        if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+            return 0, 0
+        if not os.path.exists(progress_path):
+            raise ValueError(f"{output_path} exists without a progress file; "
+                             "start over without resume (--no-resume) to overwrite it.")
+        with open(progress_path, encoding="utf-8") as f:
+            progress = json.load(f)
+        if progress["input_path"] != input_state["input_path"]:
+            raise ValueError(f"{output_path} was written for {progress['input_path']}; "
+                             "use another output path or start over without resume.")
+        if (progress.get("input_size"), progress.get("input_mtime_ns")) != (
+                input_state["input_size"], input_state["input_mtime_ns"]):
+            raise ValueError(f"{progress['input_path']} changed since the interrupted run; "
+                             "start over without resume to avoid mixing inputs.")
+        if progress["model_version"] != model_version:
+            raise ValueError("The model artifacts changed since the interrupted run; "
+                             "start over without resume to avoid mixing predictions.")
+        return progress["rows"], progress["bytes"]
+
+    def _write_progress(self, input_state: Dict[str, object], output_path: str,
+                        model_version: str, rows: int, size: int) -> None:
+        """Atomically record how far the output is complete."""
+        progress_path = self.progress_path(output_path)
+        tmp_path = f"{progress_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**input_state, "model_version": model_version,
+                       "rows": rows, "bytes": size}, f)
+        os.replace(tmp_path, progress_path)
+
+    def _results_frame(self, chunk: pd.DataFrame, start_row: int, predictions: np.ndarray,
+                       probabilities: np.ndarray, classes: np.ndarray) -> pd.DataFrame:
+        result = {"row": np.arange(start_row, start_row + len(chunk))}
+        if self.id_column:
+            result[self.id_column] = chunk[self.id_column].to_numpy()
+        result["prediction"] = predictions
+        for index, label in enumerate(classes):
+            result[f"probability_{label}"] = probabilities[:, index]
+        return pd.DataFrame(result)
+
+    def score_file(self, input_path: str, output_path: str, resume: bool = True,
+                   progress: Optional[ProgressCallback] = None) -> Dict[str, float]:
+        """
+        Score every article of `input_path` into the CSV file `output_path`.
+        :param input_path: CSV, Parquet or Arrow file with the text column.
+        :param output_path: CSV file the results are appended to.
+        :param resume: Continue after the rows recorded by an interrupted run
+            instead of starting over. An existing output without a progress
+            file, or written for a since modified input, is refused rather
+            than overwritten; pass False to start over.
+        :param progress: Called after every written chunk.
+        :return: Rows scored in this run, rows skipped by resuming, total rows
+            in the output, elapsed seconds and rows per second.
+        """
+        model_version = artifact_version(self.model_path, self.vectorizer_path)
+        input_state = self._input_state(input_path)
+        start_row, size = self._resume_offset(input_state, output_path, model_version, resume)
+        if start_row:
+            logging.info(f"Resuming {output_path} at row {start_row}.")
+        columns = [self.text_column] + ([self.id_column] if self.id_column else [])
+        ingestor = DataIngestorFactory.get_data_ingestor(
+            input_path, chunk_size=self.chunk_size, columns=columns, dtype={self.text_column: "str"})
+        total = count_rows(input_path)
+        classes = load_artifact(self.model_path).classes_
+
+        # Drop anything written after the last recorded chunk
+        with open(output_path, "a+b") as f:
+            f.truncate(size)
+        rows, started = start_row, time.perf_counter()
+
+        def write(chunk: pd.DataFrame, predictions: np.ndarray, probabilities: np.ndarray,
+                  out) -> None:
+            nonlocal rows
+            frame = self._results_frame(chunk, rows, predictions, probabilities, classes)
+            frame.to_csv(out, header=out.tell() == 0, index=False)
+            out.flush()
+            rows += len(chunk)
+            self._write_progress(input_state, output_path, model_version, rows, out.tell())
+            if progress:
+                progress(rows, total, time.perf_counter() - started)
+
+        chunks = (chunk for chunk in ingestor.ingest_chunks(input_path, start_row) if len(chunk))
+        with open(output_path, "a", encoding="utf-8", newline="") as out:
+            if self.n_jobs == 1:
+                _init_worker(self.model_path, self.vectorizer_path)
+                for chunk in chunks:
+                    write(chunk, *_score_texts(chunk[self.text_column].fillna("").tolist()), out)
+            else:
+                with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                         initargs=(self.model_path, self.vectorizer_path)) as executor:
+                    # A bounded window of chunks in flight keeps memory flat and
+                    # results are written in input order
+                    pending = deque()
+                    for chunk in chunks:
+                        pending.append((chunk, executor.submit(
+                            _score_texts, chunk[self.text_column].fillna("").tolist())))
+                        if len(pending) >= 2 * self.n_jobs:
+                            chunk, future = pending.popleft()
+                            write(chunk, *future.result(), out)
+                    while pending:
+                        chunk, future = pending.popleft()
+                        write(chunk, *future.result(), out)
+
+        elapsed = time.perf_counter() - started
+        scored = rows - start_row
+        logging.info(f"Scored {scored} articles in {elapsed:.1f}s into {output_path}.")
+        return {"rows_scored": scored, "rows_skipped": start_row, "rows_total": rows,
+                "seconds": elapsed, "rows_per_second": scored / elapsed if elapsed > 0 else 0.0}
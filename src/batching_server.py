@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.data_clean import TextCleaningEngine
+from src.model_artifacts import load_mmap_scorer
+from src.prediction_cache import PredictionCache
+from src.resources import load_artifact
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Scores a batch of raw texts and returns one result dict per text
+BatchPredictor = Callable[[List[str]], List[Dict]]
+
+
+def load_batch_predictor(model_path: str = "model.pkl", vectorizer_path: str = "vectorizer.pkl",
+                         mmap_artifacts_dir: Optional[str] = None,
+                         cache: Optional[PredictionCache] = None) -> BatchPredictor:
+    """
+    Load the artifacts written by model_serializer_step and return a function
+    that cleans, vectorizes and scores a whole batch with one call each.
+    :param model_path: Path of the joblib-pickled classifier.
+    :param vectorizer_path: Path of the joblib-pickled vectorizer.
+    :param mmap_artifacts_dir: Directory of memory-mappable artifacts, used
+        instead of the pickles when it exists.
+    :param cache: Optional prediction cache; only cache misses are scored.
+    :return: Batch predictor.
+    """
+    cleaner = TextCleaningEngine()
+    if mmap_artifacts_dir and os.path.isdir(mmap_artifacts_dir):
+        logging.info(f"Loading memory-mapped artifacts from {mmap_artifacts_dir}.")
+        scorer = load_mmap_scorer(mmap_artifacts_dir)
+        classes = scorer.classes_
+
+        def score(texts: List[str]):
+            return scorer.predict_proba(texts)
+    else:
+        logging.info(f"Loading {model_path} and {vectorizer_path}.")
+        model = load_artifact(model_path)
+        vectorizer = load_artifact(vectorizer_path)
+        classes = model.classes_
+
+        def score(texts: List[str]):
+            return model.predict_proba(vectorizer.transform(texts))
+
+    def predict_cleaned(texts: List[str]) -> List[Dict]:
+        probabilities = score(texts)
+        best = probabilities.argmax(axis=1)
+        return [{"prediction": classes[index].item(), "probability": float(row[index])}
+                for row, index in zip(probabilities, best)]
+
+    def predict_batch(texts: List[str]) -> List[Dict]:
+        cleaned = cleaner.clean_batch(texts)
+        if cache is None:
+            return predict_cleaned(cleaned)
+        return cache.get_or_compute_many(cleaned, predict_cleaned)
+
+    return predict_batch
+
+
+class MicroBatcher:
+    """
+    Collects single-text requests into micro-batches.
+    A batch is scored when it reaches `max_batch_size` or when the oldest
+    request has waited `max_wait_ms`, whichever comes first. The batch is
+    scored in a worker thread, so the event loop keeps accepting requests.
+    """
+
+    def __init__(self, predict_batch: BatchPredictor, max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0):
+        """
+        :param predict_batch: Function scoring a list of texts.
+        :param max_batch_size: Upper bound on the number of texts per batch.
+        :param max_wait_ms: Longest time a request waits for the batch to fill.
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: Optional[asyncio.Queue] = None
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, text: str) -> Dict:
+        """
+        Queue one text and wait for its result.
+        :param text: Raw article text.
+        :return: Result dict for this text.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def run(self) -> None:
+        """Batching loop; run it as a background task."""
+        self.queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            texts = [text for text, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.predict_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class InferenceServer:
+    """
+    Minimal HTTP/1.1 JSON server in front of a MicroBatcher.
+
+    Endpoints:
+    - POST /predict with {"text": "..."} returns {"prediction": ..., "probability": ...}
+    - GET /health returns batching statistics
+    """
+
+    def __init__(self, batcher: MicroBatcher, host: str = "127.0.0.1", port: int = 8080):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, payload: Dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # Keep-alive: serve requests on this connection until it closes
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                if method == "GET" and path == "/health":
+                    await self._respond(writer, "200 OK", {
+                        "status": "ok", "requests": self.batcher.requests,
+                        "batches": self.batcher.batches})
+                elif method == "POST" and path == "/predict":
+                    try:
+                        text = json.loads(body)["text"]
+                    except (ValueError, KeyError, TypeError):
+                        await self._respond(writer, "400 Bad Request",
+                                            {"error": "Body must be JSON with a 'text' field."})
+                        continue
+                    try:
+                        result = await self.batcher.submit(str(text))
+                    except Exception as e:
+                        await self._respond(writer, "500 Internal Server Error", {"error": str(e)})
+                        continue
+                    await self._respond(writer, "200 OK", result)
+                else:
+                    await self._respond(writer, "404 Not Found", {"error": f"No route for {method} {path}"})
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_forever(self) -> None:
+        """Start the batching loop and serve until cancelled."""
+        batch_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        logging.info(f"Inference server listening on http://{self.host}:{self.port} "
+                     f"(max_batch_size={self.batcher.max_batch_size}, "
+                     f"max_wait_ms={self.batcher.max_wait * 1000:g}).")
+        started = time.perf_counter()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+            elapsed = time.perf_counter() - started
+            logging.info(f"Served {self.batcher.requests} requests in {self.batcher.batches} "
+                         f"batches over {elapsed:.1f}s.")
@@ -1,6 +1,28 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+import os
 import re
 import string
+from typing import Iterable, List
+
+import pandas as pd
+
+
+# Bump whenever the cleaning rules change, so stored cleaned text is recomputed.
+CLEANER_VERSION = "1"
+
+# Patterns are compiled once at import time and shared by every cleaner.
+MATCHED_TEXT_PATTERN = re.compile(r'\[.*?\]')
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+HTML_TAG_PATTERN = re.compile(r'<.*?>')
+# `\w*\d\w*` only ever matches whole word runs, so anchoring at a word
+# boundary gives the same result without retrying at every offset.
+WORDS_WITH_DIGITS_PATTERN = re.compile(r'\b\w*\d\w*')
+
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+NEWLINE_TABLE = str.maketrans('\n', ' ')
+# Punctuation and newlines never overlap, so both fit in one translate pass.
+PUNCTUATION_AND_NEWLINE_TABLE = str.maketrans('\n', ' ', string.punctuation)
 
 
 class DataCleaner(ABC):
@@ -56,26 +78,105 @@ class TextCleaner(DataCleaner):
         self.text = self.text.lower()
 
     def remove_matched_text(self):
-        self.text = re.sub(r'\[.*?\]', "", self.text)
+        self.text = MATCHED_TEXT_PATTERN.sub('', self.text)
 
     def remove_urls(self):
-        self.text = re.sub(r'https?://\S+|www\.\S+', '', self.text)
+        self.text = URL_PATTERN.sub('', self.text)
 
     def remove_html_tags(self):
-        self.text = re.sub(r'<.*?>', '', self.text)
+        self.text = HTML_TAG_PATTERN.sub('', self.text)
 
     def remove_punctuation(self):
-        self.text = re.sub(r'[%s]' % re.escape(
-            string.punctuation), '', self.text)
+        self.text = self.text.translate(PUNCTUATION_TABLE)
 
     def remove_newlines(self):
-        self.text = re.sub(r'\n', ' ', self.text)
+        self.text = self.text.translate(NEWLINE_TABLE)
 
     def remove_words_with_digits(self):
-        self.text = re.sub(r'\w*\d\w*', '', self.text)
+        self.text = WORDS_WITH_DIGITS_PATTERN.sub('', self.text)
 
     def normalize_spaces(self):
-        self.text = re.sub(r'\s+', ' ', self.text).strip()
+        self.text = ' '.join(self.text.split())
 
     def get_cleaned_text(self):
         return self.text
+
+
+class TextCleaningEngine:
+    """
+    Stateless cleaner that applies the `DataCleaner.clean_text` order of
+    operations in as few passes as possible.
+    The output is identical to `TextCleaner(text).clean_text().get_cleaned_text()`.
+    """
+
+    def clean(self, text: str) -> str:
+        """
+        Clean a single document.
+        :param text: Raw document text.
+        :return: Cleaned document text.
+        """
+        text = text.lower()
+        # The substring checks skip a regex scan when it cannot match.
+        if '[' in text:
+            text = MATCHED_TEXT_PATTERN.sub('', text)
+        if 'http' in text or 'www.' in text:
+            text = URL_PATTERN.sub('', text)
+        if '<' in text:
+            text = HTML_TAG_PATTERN.sub('', text)
+        text = text.translate(PUNCTUATION_AND_NEWLINE_TABLE)
+        text = WORDS_WITH_DIGITS_PATTERN.sub('', text)
+        return ' '.join(text.split())
+
+    def clean_batch(self, texts: Iterable[str]) -> List[str]:
+        """
+        Clean a batch of documents.
+        :param texts: Iterable of raw document texts.
+        :return: List of cleaned texts in the same order.
+        """
+        clean = self.clean
+        return [clean(text) for text in texts]
+
+    def clean_series(self, series: pd.Series, n_jobs: int = 1,
+                     chunk_size: int = 10000) -> pd.Series:
+        """
+        Clean a whole text column, optionally across several processes.
+        :param series: Series of raw document texts.
+        :param n_jobs: Number of worker processes. 1 cleans serially in the
+            current process, -1 uses every available core.
+        :param chunk_size: Number of documents sent to a worker at a time.
+        :return: Series of cleaned texts with the original index and name.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        texts = series.tolist()
+        n_jobs = resolve_n_jobs(n_jobs)
+        if n_jobs == 1 or len(texts) <= chunk_size:
+            cleaned = self.clean_batch(texts)
+        else:
+            chunks = [texts[start:start + chunk_size]
+                      for start in range(0, len(texts), chunk_size)]
+            cleaned = []
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as executor:
+                # `map` yields results in submission order, which keeps rows aligned.
+                for cleaned_chunk in executor.map(_clean_chunk, chunks):
+                    cleaned.extend(cleaned_chunk)
+        return pd.Series(cleaned, index=series.index, name=series.name, dtype=object)
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """
+    Translate an `n_jobs` setting into a concrete worker count.
+    :param n_jobs: Positive worker count, or a negative value counting back from
+        the number of cores (-1 means all cores).
+    :return: Number of workers to use, at least 1.
+    """
+    if n_jobs == 0:
+        raise ValueError("n_jobs must be a positive integer or negative, not 0")
+    if n_jobs < 0:
+        n_jobs = (os.cpu_count() or 1) + 1 + n_jobs
+    return max(1, n_jobs)
+
+
+def _clean_chunk(texts: List[str]) -> List[str]:
+    """Worker entry point: clean one chunk of documents."""
+    return TextCleaningEngine().clean_batch(texts)
@@ -1,8 +1,23 @@
+import hashlib
+import logging
 import os
 from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
 
 import pandas as pd
 
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+CSV_EXTENSIONS = ('.csv',)
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather')
+
+
+def has_extension(file_path: str, extensions) -> bool:
+    """Whether `file_path` ends with one of `extensions`, ignoring case."""
+    return file_path.lower().endswith(extensions)
+
 
 class DataIngestor(ABC):
     @abstractmethod
@@ -10,22 +25,260 @@ class DataIngestor(ABC):
         """Ingest data from a file path and return a DataFrame."""
         pass
 
+    def ingest_chunks(self, file_path: str, start_row: int = 0) -> Iterator[pd.DataFrame]:
+        """
+        Yield the data in chunks. By default the whole file is one chunk.
+        Rows before `start_row` are skipped, e.g. to resume an interrupted job.
+        """
+        yield self.ingest(file_path).iloc[start_row:]
+
 
 class CSVDataIngestor(DataIngestor):
+    def __init__(self, columns: Optional[List[str]] = None,
+                 dtype: Optional[Dict[str, str]] = None):
+        """
+        Initializes the CSV ingestor.
+
+        Parameters:
+        columns (list, optional): Columns to read. All columns are read when None.
+        dtype (dict, optional): Explicit dtypes per column, skipping type inference.
+        """
+        self.columns = columns
+        self.dtype = dtype
+
     def ingest(self, file_path: str) -> pd.DataFrame:
         """Ingest data from a CSV file."""
-        if not file_path.endswith('.csv'):
+        if not has_extension(file_path, CSV_EXTENSIONS):
+            raise ValueError("File path must end with .csv")
+        df = pd.read_csv(file_path, usecols=self.columns, dtype=self.dtype)
+        return df
+
+
+class ChunkedCSVDataIngestor(CSVDataIngestor):
+    def __init__(self, chunk_size: int = 50000, columns: Optional[List[str]] = None,
+                 dtype: Optional[Dict[str, str]] = None):
+        """
+        Initializes the streaming CSV ingestor. `ingest_chunks` parses the
+        file `chunk_size` rows at a time for consumers that process chunks
+        independently (e.g. batch scoring); `ingest` is a single column-pruned
+        read, since concatenating chunks would hold the data twice.
+
+        Parameters:
+        chunk_size (int): Number of rows parsed and yielded at a time.
+        columns (list, optional): Columns to read. All columns are read when None.
+        dtype (dict, optional): Explicit dtypes per column, skipping type inference.
+        """
+        super().__init__(columns=columns, dtype=dtype)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        self.chunk_size = chunk_size
+
+    def ingest_chunks(self, file_path: str, start_row: int = 0) -> Iterator[pd.DataFrame]:
+        """
+        Stream a CSV file as DataFrames of at most `chunk_size` rows, starting
+        at data row `start_row`. Skipped lines are not parsed.
+        """
+        if not has_extension(file_path, CSV_EXTENSIONS):
             raise ValueError("File path must end with .csv")
-        df = pd.read_csv(file_path)
+        # Line 0 is the header
+        skiprows = range(1, start_row + 1) if start_row else None
+        with pd.read_csv(file_path, usecols=self.columns, dtype=self.dtype,
+                         chunksize=self.chunk_size, skiprows=skiprows) as reader:
+            for chunk in reader:
+                yield chunk
+
+
+class ParquetDataIngestor(DataIngestor):
+    def __init__(self, chunk_size: Optional[int] = None, columns: Optional[List[str]] = None,
+                 dtype: Optional[Dict[str, str]] = None):
+        """
+        Initializes the Parquet ingestor. Requires pyarrow.
+
+        Parameters:
+        chunk_size (int, optional): Rows per record batch in `ingest_chunks`.
+        columns (list, optional): Columns to read. All columns are read when None.
+        dtype (dict, optional): Dtypes to cast columns to after reading.
+        """
+        self.chunk_size = chunk_size
+        self.columns = columns
+        self.dtype = dtype
+
+    def _cast(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply `dtype` like read_csv does: missing values stay missing, where
+        astype(str) would turn them into the string "nan".
+        """
+        if not self.dtype:
+            return df
+        for column, dtype in self.dtype.items():
+            if column not in df.columns:
+                continue
+            values = df[column]
+            if dtype in (str, "str"):
+                df[column] = values.where(values.isna(), values.astype(str))
+            else:
+                df[column] = values.astype(dtype)
         return df
 
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """Ingest data from a Parquet file, reading only the requested columns."""
+        if not has_extension(file_path, PARQUET_EXTENSIONS):
+            raise ValueError(f"File path must end with one of {PARQUET_EXTENSIONS}")
+        return self._cast(pd.read_parquet(file_path, columns=self.columns))
+
+    def ingest_chunks(self, file_path: str, start_row: int = 0) -> Iterator[pd.DataFrame]:
+        """
+        Stream a Parquet file record batch by record batch, starting at row
+        `start_row`. Row groups before it are not read.
+        """
+        if not self.chunk_size:
+            yield self.ingest(file_path).iloc[start_row:]
+            return
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        row_groups, skip = [], start_row
+        for index in range(parquet_file.num_row_groups):
+            rows = parquet_file.metadata.row_group(index).num_rows
+            if skip >= rows and not row_groups:
+                skip -= rows
+            else:
+                row_groups.append(index)
+        if not row_groups:
+            return
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size, row_groups=row_groups,
+                                               columns=self.columns):
+            if skip >= batch.num_rows:
+                skip -= batch.num_rows
+                continue
+            yield self._cast(batch.slice(skip).to_pandas())
+            skip = 0
+
+
+class ArrowDataIngestor(ParquetDataIngestor):
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """Ingest data from an Arrow IPC (Feather v2) file."""
+        if not has_extension(file_path, ARROW_EXTENSIONS):
+            raise ValueError(f"File path must end with one of {ARROW_EXTENSIONS}")
+        return self._cast(pd.read_feather(file_path, columns=self.columns))
+
+    def ingest_chunks(self, file_path: str, start_row: int = 0) -> Iterator[pd.DataFrame]:
+        """Arrow files are memory-mapped, so the whole table is yielded at once."""
+        yield self.ingest(file_path).iloc[start_row:]
+
+
+class CachedCSVDataIngestor(DataIngestor):
+    def __init__(self, cache_dir: str, chunk_size: Optional[int] = None,
+                 columns: Optional[List[str]] = None, dtype: Optional[Dict[str, str]] = None):
+        """
+        CSV ingestor that converts each file to Parquet on first read and
+        serves later reads from the converted copy.
+
+        Parameters:
+        cache_dir (str): Directory holding the converted Parquet files.
+        chunk_size (int, optional): Rows per chunk in `ingest_chunks`.
+        columns (list, optional): Columns to read. All columns are read when None.
+        dtype (dict, optional): Explicit dtypes per column.
+        """
+        self.cache_dir = cache_dir
+        self.chunk_size = chunk_size
+        self.columns = columns
+        self.dtype = dtype
+
+    def cache_path(self, file_path: str) -> str:
+        """
+        Path of the cached Parquet copy of `file_path`. The key covers the
+        absolute path, size and modification time, so any change to the
+        source file produces a new entry.
+        """
+        stat = os.stat(file_path)
+        fingerprint = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        key = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{key}.parquet")
+
+    def _convert(self, file_path: str, cache_path: str) -> None:
+        """
+        Write the Parquet copy of `file_path`. Every column is parsed, so the
+        first read of a file is not column-pruned; later reads are.
+        """
+        logging.info(f"Converting {file_path} to columnar cache {cache_path}.")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Cache every column so that later reads can prune differently
+        df = CSVDataIngestor(dtype=self.dtype).ingest(file_path)
+        # read_csv can leave mixed Python types in an object column, which
+        # Arrow refuses; store those columns as strings, keeping missing values
+        for column in df.columns[df.dtypes == object]:
+            values = df[column]
+            df[column] = values.where(values.isna(), values.astype(str))
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, index=False)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, cache_path)
+
+    def _cached_ingestor(self, file_path: str):
+        try:
+            import pyarrow
+        except ImportError:
+            logging.warning("pyarrow is not installed; reading CSV without the columnar cache.")
+            return self._csv_ingestor(), file_path
+
+        cache_path = self.cache_path(file_path)
+        if os.path.exists(cache_path):
+            logging.info(f"Columnar cache hit for {file_path}.")
+        else:
+            try:
+                self._convert(file_path, cache_path)
+            except (pyarrow.ArrowException, ValueError, TypeError) as e:
+                logging.warning(f"Could not cache {file_path} as Parquet ({e}); reading the CSV directly.")
+                return self._csv_ingestor(), file_path
+        return ParquetDataIngestor(self.chunk_size, self.columns, self.dtype), cache_path
+
+    def _csv_ingestor(self) -> DataIngestor:
+        if self.chunk_size:
+            return ChunkedCSVDataIngestor(self.chunk_size, self.columns, self.dtype)
+        return CSVDataIngestor(self.columns, self.dtype)
+
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        """Ingest a CSV file through its cached Parquet copy."""
+        if not has_extension(file_path, CSV_EXTENSIONS):
+            raise ValueError("File path must end with .csv")
+        ingestor, path = self._cached_ingestor(file_path)
+        return ingestor.ingest(path)
+
+    def ingest_chunks(self, file_path: str, start_row: int = 0) -> Iterator[pd.DataFrame]:
+        """Stream a CSV file through its cached Parquet copy."""
+        if not has_extension(file_path, CSV_EXTENSIONS):
+            raise ValueError("File path must end with .csv")
+        ingestor, path = self._cached_ingestor(file_path)
+        yield from ingestor.ingest_chunks(path, start_row)
+
 
 class DataIngestorFactory:
     @staticmethod
-    def get_data_ingestor(file_path: str) -> DataIngestor:
-        """Factory method to get the appropriate data ingestor based on file type."""
-        if file_path.endswith('.csv'):
-            return CSVDataIngestor()
+    def get_data_ingestor(file_path: str, chunk_size: Optional[int] = None,
+                          columns: Optional[List[str]] = None,
+                          dtype: Optional[Dict[str, str]] = None,
+                          cache_dir: Optional[str] = None) -> DataIngestor:
+        """
+        Factory method to get the appropriate data ingestor based on file type.
+        A streaming ingestor is returned when `chunk_size` is set, and CSV files
+        go through a columnar conversion cache when `cache_dir` is set.
+        """
+        if has_extension(file_path, CSV_EXTENSIONS):
+            if cache_dir:
+                return CachedCSVDataIngestor(cache_dir, chunk_size=chunk_size, columns=columns, dtype=dtype)
+            if chunk_size:
+                return ChunkedCSVDataIngestor(chunk_size=chunk_size, columns=columns, dtype=dtype)
+            return CSVDataIngestor(columns=columns, dtype=dtype)
+        elif has_extension(file_path, PARQUET_EXTENSIONS):
+            return ParquetDataIngestor(chunk_size=chunk_size, columns=columns, dtype=dtype)
+        elif has_extension(file_path, ARROW_EXTENSIONS):
+            return ArrowDataIngestor(chunk_size=chunk_size, columns=columns, dtype=dtype)
         else:
             raise ValueError(
-                "Unsupported file type. Only .csv files are supported.")
+                "Unsupported file type. Supported types are .csv, .parquet and .arrow/.feather.")
@@ -1,6 +1,11 @@
 import logging
 from abc import ABC, abstractmethod
+from itertools import chain
+from typing import Dict
+import numpy as np
 import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 # setup logging
 logging.basicConfig(level=logging.INFO,
@@ -74,12 +79,15 @@ class DropColumns(DataPreparationStrategy):
     Concrete strategy to drop specified columns from the DataFrame.
     """
 
-    def __init__(self, columns_to_drop: list):
+    def __init__(self, columns_to_drop: list, errors: str = "raise"):
         """
         Initialize the strategy with the columns to be dropped.
         :param columns_to_drop: List of column names to be dropped.
+        :param errors: "raise" to fail on missing columns, "ignore" to skip them
+            (e.g. when ingestion already pruned them).
         """
         self.columns_to_drop = columns_to_drop
+        self.errors = errors
 
     def handle(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -88,7 +96,7 @@ class DropColumns(DataPreparationStrategy):
         :return: DataFrame with specified columns dropped.
         """
         logging.info(f"Dropping columns: {self.columns_to_drop}.")
-        return data.drop(columns=self.columns_to_drop)
+        return data.drop(columns=self.columns_to_drop, errors=self.errors)
 
 
 class ResetIndex(DataPreparationStrategy):
@@ -104,6 +112,171 @@ class ResetIndex(DataPreparationStrategy):
         return data.reset_index(drop=True)
 
 
+class RemoveDuplicateDocuments(DataPreparationStrategy):
+    """
+    Concrete strategy to remove exact and near-duplicate documents.
+
+    Exact duplicates are found by hashing the case- and whitespace-normalised
+    text. Near-duplicates are found with MinHash signatures over word
+    shingles and locality-sensitive hashing: signatures are split into bands,
+    documents sharing a band land in the same bucket, and only those candidate
+    pairs are compared. Work grows linearly with the corpus rather than with
+    the number of document pairs. The first document of every duplicate group
+    is kept.
+
+    Each member of a bucket is compared with the bucket's first row only, not
+    with every other member. Two documents that are similar to each other but
+    not to that first row are therefore only grouped if another band links
+    them, so some near-duplicates can be missed.
+
+    When a duplicate group (exact or near) carries more than one label, no
+    copy can be trusted; by default the whole group is dropped.
+    """
+
+    def __init__(self, text_column: str = "text", threshold: float = 0.8,
+                 num_perm: int = 128, bands: int = 16, shingle_size: int = 3,
+                 batch_size: int = 10000, seed: int = 1,
+                 label_column: str = "class", conflicting_labels: str = "drop"):
+        """
+        Initialize the strategy.
+        :param text_column: Column holding the document text.
+        :param threshold: Estimated Jaccard similarity of word shingles above
+            which two documents are near-duplicates.
+        :param num_perm: Number of MinHash permutations (signature length).
+        :param bands: Number of LSH bands; num_perm must be divisible by it.
+            More bands find more candidates at lower similarity.
+        :param shingle_size: Number of consecutive words per shingle.
+        :param batch_size: Documents whose signatures are computed together.
+        :param seed: Seed of the MinHash permutations.
+        :param label_column: Column holding the class label, if present.
+        :param conflicting_labels: "drop" removes every row of a duplicate
+            group whose rows have different labels; "keep_first" keeps its
+            first row like any other group.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+        if conflicting_labels not in ("drop", "keep_first"):
+            raise ValueError(f"Unknown conflicting_labels '{conflicting_labels}'. Use 'drop' or 'keep_first'.")
+        self.text_column = text_column
+        self.label_column = label_column
+        self.conflicting_labels = conflicting_labels
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.batch_size = batch_size
+        rng = np.random.default_rng(seed)
+        # Multiply-add-shift hashing: odd 64-bit multipliers, top 32 bits kept
+        self._a = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self.report: Dict[str, int] = {}
+
+    def _shingles(self, texts: pd.Series):
+        """Hash every word shingle; return shingle hashes and per-document counts."""
+        tokens = texts.fillna("").astype(str).str.lower().str.split()
+        lengths = tokens.str.len().to_numpy()
+        token_hashes = pd.util.hash_array(np.array(list(chain.from_iterable(tokens)), dtype=object))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        # Documents shorter than a shingle contribute one shorter shingle
+        size = np.minimum(lengths, self.shingle_size)
+        counts = np.where(lengths > 0, lengths - size + 1, 0)
+        doc = np.repeat(np.arange(len(lengths)), counts)
+        position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + starts[doc]
+        shingles = np.zeros(len(position), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for offset in range(self.shingle_size):
+                inside = offset < size[doc]
+                shingles[inside] = (shingles[inside] * np.uint64(1099511628211)
+                                    ^ token_hashes[position[inside] + offset])
+        return shingles, counts
+
+    def _signatures(self, texts: pd.Series) -> np.ndarray:
+        """MinHash signatures, one row of num_perm uint32 values per document."""
+        signatures = np.full((len(texts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        for start in range(0, len(texts), self.batch_size):
+            shingles, counts = self._shingles(texts.iloc[start:start + self.batch_size])
+            has_shingles = counts > 0
+            if not has_shingles.any():
+                continue
+            offsets = (np.cumsum(counts) - counts)[has_shingles]
+            rows = np.flatnonzero(has_shingles) + start
+            with np.errstate(over="ignore"):
+                for index in range(self.num_perm):
+                    values = (shingles * self._a[index] + self._b[index]) >> np.uint64(32)
+                    signatures[rows, index] = np.minimum.reduceat(values, offsets)
+        return signatures
+
+    def _candidate_pairs(self, signatures: np.ndarray) -> np.ndarray:
+        """Pairs of rows sharing at least one LSH band, linked to the first row of each bucket."""
+        rows_per_band = self.num_perm // self.bands
+        pairs = []
+        if len(signatures) < 2:
+            return np.empty((0, 2), dtype=np.int64)
+        for band in range(self.bands):
+            block = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+            keys = pd.util.hash_pandas_object(pd.DataFrame(block), index=False).to_numpy()
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            new_bucket = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+            first = order[np.maximum.accumulate(np.where(new_bucket, np.arange(len(order)), 0))]
+            members = ~new_bucket
+            pairs.append(np.column_stack((first[members], order[members])))
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.unique(np.concatenate(pairs), axis=0)
+
+    def handle(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop exact and near-duplicate documents, keeping the first of each
+        group, and resolve groups with conflicting labels per
+        `conflicting_labels`. The counts of dropped rows are logged and kept
+        in `self.report`.
+        :param data: Input DataFrame to be processed.
+        :return: DataFrame without duplicate documents.
+        """
+        logging.info("Removing exact and near-duplicate documents.")
+        texts = data[self.text_column].fillna("").astype(str)
+        normalised = texts.str.lower().str.split().str.join(" ")
+        # Exact-duplicate group of every row, numbered in order of first appearance
+        exact_groups, _ = pd.factorize(pd.util.hash_pandas_object(normalised, index=False))
+        _, first_rows = np.unique(exact_groups, return_index=True)
+        unique = data.iloc[first_rows]
+
+        signatures = self._signatures(unique[self.text_column])
+        pairs = self._candidate_pairs(signatures)
+        if len(pairs):
+            similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+            pairs = pairs[similarity >= self.threshold]
+        n = len(unique)
+        graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+        n_groups, near_groups = connected_components(graph, directed=False)
+        # Duplicate group of every input row, exact or near
+        groups = near_groups[exact_groups]
+        _, keep = np.unique(groups, return_index=True)
+
+        self.report = {
+            "input_rows": len(data),
+            "exact_duplicates": len(data) - n,
+            "near_duplicates": n - n_groups,
+        }
+        if self.label_column in data.columns:
+            # Groups whose members carry different labels
+            conflicting = (data[self.label_column].groupby(groups).nunique() > 1).to_numpy()
+            self.report["conflicting_label_groups"] = int(conflicting.sum())
+            if self.conflicting_labels == "drop":
+                self.report["conflicting_label_rows"] = int(conflicting[groups].sum())
+                keep = keep[~conflicting[groups[keep]]]
+        result = data.iloc[np.sort(keep)]
+        self.report["output_rows"] = len(result)
+        logging.info(f"Removed {self.report['exact_duplicates']} exact and "
+                     f"{self.report['near_duplicates']} near-duplicate documents "
+                     f"({len(data)} -> {len(result)} rows).")
+        if self.report.get("conflicting_label_groups"):
+            logging.info(f"{self.report['conflicting_label_groups']} duplicate groups had conflicting "
+                         f"labels ({self.conflicting_labels}).")
+        return result
+
+
 class DataPreparationContext:
     """
     Context class to manage the data preparation strategies.
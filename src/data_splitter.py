@@ -1,25 +1,54 @@
 import logging
 from abc import ABC, abstractmethod
+from typing import List, Tuple
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import KFold, ShuffleSplit, StratifiedKFold, StratifiedShuffleSplit
 
 logging.basicConfig(level=logging.INFO,
                     format="%(asctime)s - %(levelname)s - %(message)s")
 
+# One (train_indices, test_indices) pair of positional row indices per split
+IndexSplits = List[Tuple[np.ndarray, np.ndarray]]
+
 
 class DataSplitterStrategy(ABC):
     @abstractmethod
+    def split_indices(self, df: pd.DataFrame, target_column: str) -> IndexSplits:
+        """Abstract method to split data into positional train and test indices.
+
+        No rows are copied; callers slice the frame, the labels or a feature
+        matrix built once over all rows with the returned index arrays.
+
+        Parameters:
+        - df (pd.DataFrame): The input DataFrame containing the data.
+        - target_column (str): The name of the target column.
+
+        Returns:
+        List of (train_indices, test_indices) pairs, one per split or fold.
+        """
+        pass
+
     def split_data(self, df: pd.DataFrame, text_column: str, target_column: str):
-        """Abstract method to split data into training and testing sets.
+        """Splits the data into training and testing sets using the first split.
 
         Parameters:
         - df (pd.DataFrame): The input DataFrame containing the data.
+        - text_column (str): The name of the text column.
         - target_column (str): The name of the target column.
 
         Returns:
         X_train,X_test, y_train, y_test: The training and testing sets for features and target variable.
         """
-        pass
+        train_indices, test_indices = self.split_indices(df, target_column)[0]
+        X = df[[text_column]]
+        y = df[target_column]
+        return X.iloc[train_indices], X.iloc[test_indices], y.iloc[train_indices], y.iloc[test_indices]
+
+
+def _placeholder(df: pd.DataFrame) -> np.ndarray:
+    """One byte per row: sklearn splitters only need the number of samples."""
+    return np.zeros(len(df), dtype=np.int8)
 
 
 class SimpleTrainTestSplitStrategy(DataSplitterStrategy):
@@ -34,23 +63,79 @@ class SimpleTrainTestSplitStrategy(DataSplitterStrategy):
         self.test_size = test_size
         self.random_state = random_state
 
-    def split_data(self, df: pd.DataFrame, text_column: str, target_column: str):
+    def split_indices(self, df: pd.DataFrame, target_column: str) -> IndexSplits:
         """
-        Splits the data into training and testing sets using a simple train-test split.
+        Shuffles the rows and splits them into training and testing indices.
+        This is the split `train_test_split` makes with the same arguments.
+        Parameters:
+        df (pd.DataFrame): The input DataFrame containing the data.
+        target_column (str): The name of the target column (unused).
+        Returns:
+        A single (train_indices, test_indices) pair.
+        """
+        logging.info("Splitting data into training and testing indices.")
+        splitter = ShuffleSplit(n_splits=1, test_size=self.test_size, random_state=self.random_state)
+        return list(splitter.split(_placeholder(df)))
+
+
+class StratifiedTrainTestSplitStrategy(DataSplitterStrategy):
+    def __init__(self, test_size: float, random_state: int):
+        """
+        Initializes the StratifiedTrainTestSplitStrategy with specific parameters.
+
+        Parameters:
+        test_size (float): The proportion of the dataset to include in the test split.
+        random_state (int): The seed used by the random number generator.
+        """
+        self.test_size = test_size
+        self.random_state = random_state
+
+    def split_indices(self, df: pd.DataFrame, target_column: str) -> IndexSplits:
+        """
+        Splits rows into training and testing indices that keep the class
+        proportions of the target column.
         Parameters:
         df (pd.DataFrame): The input DataFrame containing the data.
         target_column (str): The name of the target column.
         Returns:
-        X_train, X_test, y_train, y_test: The training and testing sets for features and target variable.
+        A single (train_indices, test_indices) pair.
         """
-        logging.info("Splitting data into training and testing sets.")
-        X = df[[text_column]]  # Changed to return DataFrame
-        y = df[target_column]
+        logging.info("Splitting data into stratified training and testing indices.")
+        splitter = StratifiedShuffleSplit(
+            n_splits=1, test_size=self.test_size, random_state=self.random_state)
+        return list(splitter.split(_placeholder(df), df[target_column].to_numpy()))
 
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=self.test_size, random_state=self.random_state)
-        logging.info("Training and testing sets created successfully.")
-        return X_train, X_test, y_train, y_test
+
+class KFoldSplitStrategy(DataSplitterStrategy):
+    def __init__(self, n_splits: int = 5, random_state: int = 42, stratified: bool = True):
+        """
+        Initializes the KFoldSplitStrategy with specific parameters.
+
+        Parameters:
+        n_splits (int): The number of folds.
+        random_state (int): The seed used to shuffle rows before folding.
+        stratified (bool): Whether every fold keeps the class proportions.
+        """
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.stratified = stratified
+
+    def split_indices(self, df: pd.DataFrame, target_column: str) -> IndexSplits:
+        """
+        Splits rows into `n_splits` folds; each fold is the test set once.
+        Parameters:
+        df (pd.DataFrame): The input DataFrame containing the data.
+        target_column (str): The name of the target column.
+        Returns:
+        One (train_indices, test_indices) pair per fold.
+        """
+        logging.info(f"Splitting data into {self.n_splits} folds.")
+        if self.stratified:
+            splitter = StratifiedKFold(n_splits=self.n_splits, shuffle=True,
+                                       random_state=self.random_state)
+            return list(splitter.split(_placeholder(df), df[target_column].to_numpy()))
+        splitter = KFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+        return list(splitter.split(_placeholder(df)))
 
 
 class DataSplitter:
@@ -82,3 +167,15 @@ class DataSplitter:
         """
         logging.info("Starting data split.")
         return self.strategy.split_data(df, text_column, target_column)
+
+    def split_indices(self, df: pd.DataFrame, target_column: str) -> IndexSplits:
+        """
+        Splits the data into positional index arrays using the current strategy.
+        Parameters:
+        df (pd.DataFrame): The input DataFrame containing the data.
+        target_column (str): The name of the target column.
+        Returns:
+        List of (train_indices, test_indices) pairs.
+        """
+        logging.info("Starting index split.")
+        return self.strategy.split_indices(df, target_column)
@@ -1,12 +1,69 @@
 import logging
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Optional, Tuple
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from joblib import Parallel, delayed
+from scipy.sparse import csr_matrix, vstack
+from sklearn.base import BaseEstimator
+from sklearn.feature_extraction.text import (
+    CountVectorizer,
+    HashingVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+from sklearn.feature_selection import chi2
+from sklearn.pipeline import Pipeline
+
+from src.feature_store import CountEntry, FeatureStore, row_hashes
 
 # Setup logging configuration
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Value type of the feature matrices. float32 halves their memory and
+# artifact size; TF-IDF weights need no more precision.
+DEFAULT_DTYPE = np.float32
+
+
+def compact_csr(matrix, dtype=DEFAULT_DTYPE) -> csr_matrix:
+    """
+    Cast a sparse matrix to CSR with `dtype` values and int32 index arrays
+    whenever the number of stored entries and columns allow it.
+    :param matrix: Sparse matrix.
+    :param dtype: Value type.
+    :return: The matrix itself when it already matches, otherwise a converted copy.
+    """
+    if not isinstance(matrix, csr_matrix):
+        matrix = csr_matrix(matrix)
+    if matrix.dtype != dtype:
+        matrix = matrix.astype(dtype)
+    if matrix.indices.dtype != np.int32 and max(matrix.nnz, matrix.shape[1]) <= np.iinfo(np.int32).max:
+        # A new matrix around the converted indices (sharing the values), so
+        # the caller's matrix is never modified
+        matrix = csr_matrix((matrix.data, matrix.indices.astype(np.int32),
+                             matrix.indptr.astype(np.int32)), shape=matrix.shape, copy=False)
+    return matrix
+
+
+def document_frequency_columns(counts: csr_matrix, min_df=1, max_df=1.0) -> np.ndarray:
+    """
+    Columns of a term-count matrix whose document frequency is within
+    [min_df, max_df], with CountVectorizer semantics: integers are document
+    counts, floats are proportions of the rows. Terms absent from every row
+    are never kept.
+    :param counts: Term counts, one row per document.
+    :param min_df: Lowest accepted document frequency.
+    :param max_df: Highest accepted document frequency.
+    :return: Sorted indices of the kept columns.
+    """
+    n_documents = counts.shape[0]
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    low = min_df if isinstance(min_df, (int, np.integer)) else min_df * n_documents
+    high = max_df if isinstance(max_df, (int, np.integer)) else max_df * n_documents
+    keep = (document_frequency > 0) & (document_frequency >= low) & (document_frequency <= high)
+    return np.flatnonzero(keep)
+
 
 class FeatureEngineeringStrategy(ABC):
     """
@@ -20,14 +77,31 @@ class FeatureEngineeringStrategy(ABC):
         """
         pass
 
+    def fit_transform_split(self, data: pd.DataFrame, train_indices: np.ndarray,
+                            test_indices: np.ndarray) -> Tuple[csr_matrix, csr_matrix]:
+        """
+        Fit on the training rows of `data` and transform both splits.
+        Strategies that can featurize every row once override this and slice
+        the resulting matrix instead.
+        :param data: All rows, with a 'text' column.
+        :param train_indices: Positional indices of the training rows.
+        :param test_indices: Positional indices of the test rows.
+        :return: Training and test feature matrices, rows in index order.
+        """
+        xv_train = self.fit_transform(data.iloc[train_indices])
+        return xv_train, self.transform(data.iloc[test_indices])
+
 
 class TfidfFeatureEngineeringStrategy(FeatureEngineeringStrategy):
     """
     Concrete strategy for TF-IDF feature engineering.
     """
 
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer()
+    def __init__(self, dtype=DEFAULT_DTYPE):
+        """
+        :param dtype: Value type of the TF-IDF matrices.
+        """
+        self.vectorizer = TfidfVectorizer(dtype=dtype)
 
     def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -52,3 +126,278 @@ class TfidfFeatureEngineeringStrategy(FeatureEngineeringStrategy):
         Get the fitted TF-IDF vectorizer.
         """
         return self.vectorizer
+
+
+class StoredTfidfFeatureEngineeringStrategy(FeatureEngineeringStrategy):
+    """
+    TF-IDF strategy that tokenizes the whole corpus once.
+
+    Raw term counts of the whole corpus (train and test together) are computed
+    once, and kept in the feature store per corpus and vectorizer
+    configuration when a store is given. Fitting on a split then only selects
+    rows, keeps the terms that occur in the training rows and recomputes IDF,
+    which reproduces TfidfVectorizer().fit_transform exactly, so changing
+    test_size or random_state no longer re-tokenizes the corpus.
+    """
+
+    def __init__(self, store: Optional[FeatureStore], corpus: pd.DataFrame,
+                 dtype=DEFAULT_DTYPE):
+        """
+        :param store: Feature store holding the term counts, or None to keep
+            them in memory only.
+        :param corpus: All documents that will be fitted or transformed, with a
+            'text' column. Counts are loaded from the store or computed once.
+        :param dtype: Value type of the TF-IDF matrices.
+        """
+        self.store = store
+        self.dtype = dtype
+        self.vectorizer = TfidfVectorizer(dtype=dtype)
+        params = self.vectorizer.get_params()
+        if params["min_df"] != 1 or params["max_df"] != 1.0 or params["max_features"] is not None:
+            # Document-frequency limits depend on the split, not only on the corpus
+            raise ValueError("Stored counts support vocabularies without min_df, max_df or max_features.")
+        count_params = {name: value for name, value in params.items()
+                        if name in CountVectorizer().get_params() and name != "dtype"}
+        self.entry = store.get_counts(corpus['text'], count_params) if store else None
+        if self.entry is None:
+            logging.info("Counting terms for the feature store.")
+            counter = CountVectorizer(**count_params)
+            counts = counter.fit_transform(corpus['text']).tocsr()
+            self.entry = CountEntry(counts, counter.get_feature_names_out().tolist(),
+                                    row_hashes(corpus['text']))
+            if store:
+                store.put_counts(corpus['text'], count_params, self.entry)
+        self._columns = None
+        self._transformer = None
+
+    def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fit vocabulary and IDF weights on `data` from the stored counts.
+        """
+        rows = self.entry.rows(data['text'])
+        if rows is None:
+            raise ValueError("Training texts are not part of the corpus given to the strategy.")
+        return self._fit_rows(rows)
+
+    def _labels_at(self, positions: np.ndarray) -> Optional[np.ndarray]:
+        """Class labels of corpus positions, or None when terms are not selected by label."""
+        return None
+
+    def _vocabulary_columns(self, counts: csr_matrix, labels: Optional[np.ndarray]) -> np.ndarray:
+        """Columns of the count matrix kept as vocabulary when fitting on `counts`."""
+        # The vocabulary fitted on the training rows is every term they contain
+        return document_frequency_columns(counts)
+
+    def _fit_rows(self, rows: np.ndarray, labels: Optional[np.ndarray] = None) -> csr_matrix:
+        """
+        Fit vocabulary and IDF weights on rows of the count matrix.
+        :param rows: Stored rows of the training documents.
+        :param labels: Class labels of the training documents, in `rows` order.
+        """
+        logging.info("Fitting TF-IDF weights from stored term counts.")
+        counts = self.entry.counts[rows]
+        self._columns = self._vocabulary_columns(counts, labels)
+        counts = counts[:, self._columns].astype(self.dtype)
+        self._transformer = TfidfTransformer(
+            norm=self.vectorizer.norm, use_idf=self.vectorizer.use_idf,
+            smooth_idf=self.vectorizer.smooth_idf, sublinear_tf=self.vectorizer.sublinear_tf)
+        tfidf_matrix = self._transformer.fit_transform(counts)
+
+        # Rebuild an equivalent fitted TfidfVectorizer for serving. The
+        # vocabulary is set as the fitted attribute only, not also as the
+        # `vocabulary` parameter, so the pickle holds it once.
+        terms = self.entry.terms
+        self.vectorizer = TfidfVectorizer(dtype=self.dtype)
+        self.vectorizer.vocabulary_ = {terms[column]: index for index, column in enumerate(self._columns)}
+        self.vectorizer.idf_ = self._transformer.idf_
+        return tfidf_matrix
+
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:  # Return type will be sparse matrix
+        """
+        Transform `data` from the stored counts, or with the rebuilt vectorizer
+        for texts outside the corpus.
+        """
+        rows = self.entry.rows(data['text'])
+        if rows is None:
+            logging.info("Transforming data using TF-IDF vectorization.")
+            return self.vectorizer.transform(data['text'])
+        logging.info("Transforming data from stored term counts.")
+        return self._transformer.transform(self._counts(rows))
+
+    def fit_transform_split(self, data: pd.DataFrame, train_indices: np.ndarray,
+                            test_indices: np.ndarray) -> Tuple[csr_matrix, csr_matrix]:
+        """
+        Fit and transform both splits by slicing the count matrix. The stored
+        rows may be in any order (entries are shared by every ordering of a
+        corpus), so positions in `data` are mapped to stored rows by text.
+        """
+        rows = self.entry.rows(data['text'])
+        if rows is None:
+            return super().fit_transform_split(data, train_indices, test_indices)
+        xv_train = self._fit_rows(rows[train_indices], self._labels_at(train_indices))
+        logging.info("Transforming data from stored term counts.")
+        return xv_train, self._transformer.transform(self._counts(rows[test_indices]))
+
+    def _counts(self, rows: np.ndarray) -> csr_matrix:
+        """Stored counts of `rows` restricted to the fitted vocabulary."""
+        return self.entry.counts[rows][:, self._columns].astype(self.dtype)
+
+    def get_vectorizer(self) -> TfidfVectorizer:
+        """
+        Get the fitted TF-IDF vectorizer.
+        """
+        return self.vectorizer
+
+
+class BudgetedTfidfFeatureEngineeringStrategy(StoredTfidfFeatureEngineeringStrategy):
+    """
+    TF-IDF strategy with a bounded vocabulary.
+
+    Terms are first pruned by document frequency in the training rows
+    (min_df drops typos and one-off tokens, max_df near-universal words).
+    When more than `max_features` terms remain, the vocabulary is cut to
+    that budget by corpus frequency or by chi² association with the labels.
+    The fitted vectorizer is rebuilt with only the kept terms, so its pickle,
+    the model's coef_ vector and transform time all shrink with the budget.
+    """
+
+    def __init__(self, store: Optional[FeatureStore], corpus: pd.DataFrame,
+                 min_df=2, max_df=0.95, max_features: Optional[int] = None,
+                 selection: str = "frequency", labels: Optional[np.ndarray] = None,
+                 dtype=DEFAULT_DTYPE):
+        """
+        :param store: Feature store holding the term counts, or None to keep
+            them in memory only.
+        :param corpus: All documents that will be fitted or transformed, with a
+            'text' column.
+        :param min_df: Lowest document frequency kept (count, or proportion if float).
+        :param max_df: Highest document frequency kept (count, or proportion if float).
+        :param max_features: Vocabulary budget after pruning, or None for no limit.
+        :param selection: "frequency" keeps the most frequent terms, "chi2"
+            the terms most associated with the labels.
+        :param labels: Class label of every corpus row, in `corpus` order;
+            required for "chi2".
+        :param dtype: Value type of the TF-IDF matrices.
+        """
+        if selection not in ("frequency", "chi2"):
+            raise ValueError(f"Unknown feature selection '{selection}'. Use 'frequency' or 'chi2'.")
+        if selection == "chi2" and max_features is not None and labels is None:
+            raise ValueError("chi2 feature selection needs the labels of the corpus.")
+        super().__init__(store, corpus, dtype=dtype)
+        self.min_df = min_df
+        self.max_df = max_df
+        self.max_features = max_features
+        self.selection = selection
+        # Labels stay in corpus order: identical texts share a stored row but
+        # may carry different labels
+        self.labels = None if labels is None else np.asarray(labels)
+
+    def _labels_at(self, positions: np.ndarray) -> Optional[np.ndarray]:
+        """Class labels of corpus positions."""
+        return None if self.labels is None else self.labels[positions]
+
+    def _vocabulary_columns(self, counts: csr_matrix, labels: Optional[np.ndarray]) -> np.ndarray:
+        """Prune by document frequency, then cut to the budget."""
+        columns = document_frequency_columns(counts, self.min_df, self.max_df)
+        if self.max_features is None or len(columns) <= self.max_features:
+            return columns
+        counts = counts[:, columns]
+        if self.selection == "chi2":
+            if labels is None:
+                raise ValueError("chi2 feature selection needs the training labels; "
+                                 "fit with fit_transform_split.")
+            scores, _ = chi2(TfidfTransformer().fit_transform(counts), labels)
+            scores = np.nan_to_num(scores)
+        else:
+            scores = np.asarray(counts.sum(axis=0)).ravel()
+        logging.info(f"Selecting {self.max_features} of {len(columns)} terms by {self.selection}.")
+        return np.sort(columns[np.argsort(-scores, kind="stable")[:self.max_features]])
+
+
+class HashingFeatureEngineeringStrategy(FeatureEngineeringStrategy):
+    """
+    Concrete strategy for stateless feature hashing with optional IDF reweighting.
+    The number of features is fixed by configuration rather than by the corpus,
+    and hashing needs no fit pass, so chunks can be transformed in parallel or
+    streamed.
+    """
+
+    def __init__(self, n_features: int = 2 ** 20, use_idf: bool = True,
+                 sublinear_tf: bool = False, n_jobs: int = 1, chunk_size: int = 10000,
+                 dtype=DEFAULT_DTYPE):
+        """
+        :param n_features: Number of hashed feature columns.
+        :param use_idf: Fit an IDF reweighting pass on the training data.
+        :param sublinear_tf: Replace term frequencies with 1 + log(tf).
+        :param n_jobs: Number of parallel workers for hashing chunks.
+        :param chunk_size: Number of documents hashed per worker task.
+        :param dtype: Value type of the feature matrices.
+        """
+        # Raw counts are produced when IDF follows, which then L2-normalises
+        self.hasher = HashingVectorizer(
+            n_features=n_features, alternate_sign=False,
+            norm=None if use_idf else "l2",
+            dtype=dtype)
+        self.idf = TfidfTransformer(sublinear_tf=sublinear_tf) if use_idf else None
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+
+    def _hash(self, texts: pd.Series) -> csr_matrix:
+        """Hash texts, splitting them into chunks across workers when n_jobs != 1."""
+        if self.n_jobs == 1 or len(texts) <= self.chunk_size:
+            return self.hasher.transform(texts)
+        chunks = [texts[start:start + self.chunk_size]
+                  for start in range(0, len(texts), self.chunk_size)]
+        matrices = Parallel(n_jobs=self.n_jobs)(
+            delayed(self.hasher.transform)(chunk) for chunk in chunks)
+        return vstack(matrices, format="csr")
+
+    def fit_transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Hash the data and fit the IDF weights, if enabled.
+        """
+        logging.info("Hashing data and fitting IDF weights.")
+        counts = self._hash(data['text'])
+        if self.idf is None:
+            return counts
+        return self.idf.fit_transform(counts)
+
+    def transform(self, data: pd.DataFrame) -> pd.DataFrame:  # Return type will be sparse matrix
+        """
+        Transform the data using feature hashing and the fitted IDF weights.
+        """
+        logging.info("Transforming data using feature hashing.")
+        counts = self._hash(data['text'])
+        if self.idf is None:
+            return counts
+        return self.idf.transform(counts)
+
+    def fit_transform_split(self, data: pd.DataFrame, train_indices: np.ndarray,
+                            test_indices: np.ndarray) -> Tuple[csr_matrix, csr_matrix]:
+        """
+        Hash every row once, then slice the hashed matrix and fit the IDF
+        weights on the training rows only.
+        """
+        logging.info("Hashing all rows once and slicing the training and test splits.")
+        counts = self._hash(data['text'])
+        train_counts, test_counts = counts[train_indices], counts[test_indices]
+        if self.idf is None:
+            return train_counts, test_counts
+        return self.idf.fit_transform(train_counts), self.idf.transform(test_counts)
+
+    def transform_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[csr_matrix]:
+        """
+        Lazily transform a stream of DataFrame chunks. Without IDF this needs
+        no fit pass at all.
+        """
+        for chunk in chunks:
+            yield self.transform(chunk)
+
+    def get_vectorizer(self) -> BaseEstimator:
+        """
+        Get the hashing vectorizer, followed by the fitted IDF transformer if
+        enabled, as a single estimator with a `transform(texts)` method.
+        """
+        if self.idf is None:
+            return self.hasher
+        return Pipeline([("hashing", self.hasher), ("tfidf", self.idf)])
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy.sparse import csr_matrix, load_npz, save_npz
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def row_hashes(texts: pd.Series) -> np.ndarray:
+    """
+    64-bit hash of every text, computed in vectorised pandas code.
+    :param texts: Text column.
+    :return: uint64 array aligned with `texts`.
+    """
+    return pd.util.hash_pandas_object(texts.astype(str), index=False).to_numpy()
+
+
+def data_fingerprint(texts: pd.Series) -> str:
+    """Hash of a text column's contents in order, independent of its index."""
+    return hashlib.sha256(row_hashes(texts).tobytes()).hexdigest()
+
+
+def corpus_fingerprint(texts: pd.Series) -> str:
+    """
+    Hash of a text column's contents regardless of row order, so every
+    train/test split of one corpus maps to the same entry.
+    """
+    return hashlib.sha256(np.sort(row_hashes(texts)).tobytes()).hexdigest()
+
+
+def params_fingerprint(params: Dict[str, Any]) -> str:
+    """Hash of estimator parameters and the scikit-learn version that applies them."""
+    payload = json.dumps({"params": params, "sklearn": sklearn.__version__},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CountEntry:
+    """
+    Raw term counts of a whole corpus under a sorted vocabulary, with the
+    hash of every row so that any subset of documents can be located.
+    """
+
+    def __init__(self, counts: csr_matrix, terms: List[str], hashes: np.ndarray):
+        """
+        :param counts: Documents x terms count matrix.
+        :param terms: Vocabulary in column order (sorted, as CountVectorizer fits it).
+        :param hashes: row_hashes of the documents, aligned with the rows of `counts`.
+        """
+        self.counts = counts
+        self.terms = terms
+        self.hashes = hashes
+        self._order = np.argsort(hashes, kind="stable")
+        self._sorted = hashes[self._order]
+
+    def rows(self, texts: pd.Series) -> Optional[np.ndarray]:
+        """
+        Row numbers of `texts` in the count matrix.
+        :param texts: Text column whose documents should all be in the entry.
+        :return: Row index array, or None if some text is not in the entry.
+        """
+        query = row_hashes(texts)
+        positions = np.searchsorted(self._sorted, query)
+        positions[positions == len(self._sorted)] = 0
+        if len(query) and not np.array_equal(self._sorted[positions], query):
+            return None
+        return self._order[positions]
+
+
+class FeatureStore:
+    """
+    Content-addressed on-disk store for expensive text features:
+
+    - cleaned/<key>.parquet: a cleaned text column, keyed by the input data
+      hash and the cleaner version.
+    - counts/<key>/: raw term counts, vocabulary and row hashes, keyed by the
+      corpus hash and the vectorizer parameters.
+
+    Entries never change once written (a new key is used instead), and they
+    are written to a temporary path and moved into place so readers never see
+    partial entries.
+    """
+
+    def __init__(self, root: str = ".cache/features"):
+        """
+        :param root: Store directory.
+        """
+        self.root = root
+
+    @staticmethod
+    def _key(*parts: str) -> str:
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:24]
+
+    def _tmp_path(self, path: str) -> str:
+        return f"{path}.{uuid.uuid4().hex}.tmp"
+
+    def get_cleaned(self, texts: pd.Series, cleaner_version: str) -> Optional[pd.Series]:
+        """
+        Look up the cleaned version of a text column.
+        :param texts: Raw text column.
+        :param cleaner_version: Version of the cleaning rules.
+        :return: Cleaned texts with the index of `texts`, or None on a miss.
+        """
+        path = os.path.join(self.root, "cleaned",
+                            f"{self._key(data_fingerprint(texts), cleaner_version)}.parquet")
+        if not os.path.exists(path):
+            return None
+        logging.info(f"Feature store hit for cleaned text: {path}")
+        cleaned = pd.read_parquet(path)["text"]
+        cleaned.index = texts.index
+        return cleaned
+
+    def put_cleaned(self, texts: pd.Series, cleaner_version: str, cleaned: pd.Series) -> None:
+        """
+        Store the cleaned version of a text column.
+        :param texts: Raw text column.
+        :param cleaner_version: Version of the cleaning rules.
+        :param cleaned: Cleaned texts, aligned with `texts`.
+        """
+        directory = os.path.join(self.root, "cleaned")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self._key(data_fingerprint(texts), cleaner_version)}.parquet")
+        tmp_path = self._tmp_path(path)
+        pd.DataFrame({"text": cleaned.to_numpy()}).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        logging.info(f"Stored cleaned text in the feature store: {path}")
+
+    def _counts_dir(self, texts: pd.Series, params: Dict[str, Any]) -> str:
+        return os.path.join(self.root, "counts",
+                            self._key(corpus_fingerprint(texts), params_fingerprint(params)))
+
+    def get_counts(self, texts: pd.Series, params: Dict[str, Any]) -> Optional[CountEntry]:
+        """
+        Look up the term counts of a corpus.
+        :param texts: Corpus text column, in any row order.
+        :param params: Parameters of the counting vectorizer.
+        :return: CountEntry, or None on a miss.
+        """
+        directory = self._counts_dir(texts, params)
+        if not os.path.isdir(directory):
+            return None
+        logging.info(f"Feature store hit for term counts: {directory}")
+        with open(os.path.join(directory, "vocabulary.json")) as f:
+            terms = json.load(f)
+        return CountEntry(load_npz(os.path.join(directory, "counts.npz")), terms,
+                          np.load(os.path.join(directory, "hashes.npy")))
+
+    def put_counts(self, texts: pd.Series, params: Dict[str, Any], entry: CountEntry) -> None:
+        """
+        Store the term counts of a corpus.
+        :param texts: Corpus text column the counts were computed from.
+        :param params: Parameters of the counting vectorizer.
+        :param entry: Counts, vocabulary and row hashes.
+        """
+        directory = self._counts_dir(texts, params)
+        tmp_dir = self._tmp_path(directory)
+        os.makedirs(tmp_dir)
+        save_npz(os.path.join(tmp_dir, "counts.npz"), entry.counts, compressed=False)
+        np.save(os.path.join(tmp_dir, "hashes.npy"), entry.hashes)
+        with open(os.path.join(tmp_dir, "vocabulary.json"), "w") as f:
+            json.dump(entry.terms, f)
+        with open(os.path.join(tmp_dir, "params.json"), "w") as f:
+            json.dump(params, f, sort_keys=True, default=str)
+        try:
+            os.replace(tmp_dir, directory)
+        except OSError:
+            # Another run stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        logging.info(f"Stored term counts in the feature store: {directory}")
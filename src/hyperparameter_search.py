@@ -0,0 +1,237 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+from src.data_clean import resolve_n_jobs
+from src.data_splitter import IndexSplits
+from src.feature_engineering import DEFAULT_DTYPE, compact_csr, document_frequency_columns
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+CSR_META_FILE = "csr.json"
+# Parameters applied to the TF-IDF features; every other parameter is passed
+# to LogisticRegression.
+VECTORIZER_PARAMS = ("min_df", "max_df", "sublinear_tf")
+DEFAULT_PARAM_GRID = {
+    "C": [0.1, 1.0, 10.0],
+    "sublinear_tf": [False, True],
+    "min_df": [1, 2, 5],
+    "solver": ["lbfgs", "liblinear"],
+}
+
+
+def save_mmap_csr(matrix: csr_matrix, directory: str) -> None:
+    """
+    Write a CSR matrix as flat .npy arrays (data, indices, indptr) that can be
+    memory-mapped by `load_mmap_csr`. The shape is written last, so a
+    directory without it is incomplete.
+    :param matrix: Matrix to write.
+    :param directory: Output directory, created if missing.
+    """
+    matrix = csr_matrix(matrix)
+    os.makedirs(directory, exist_ok=True)
+    for name in ("data", "indices", "indptr"):
+        np.save(os.path.join(directory, f"{name}.npy"), getattr(matrix, name))
+    with open(os.path.join(directory, CSR_META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"shape": list(matrix.shape)}, f)
+
+
+def load_mmap_csr(directory: str) -> csr_matrix:
+    """
+    Open a CSR matrix written by `save_mmap_csr` without reading it: the
+    arrays are read-only memory maps, so every process opening the same
+    directory shares the pages of the operating system's file cache.
+    :param directory: Directory written by `save_mmap_csr`.
+    :return: CSR matrix backed by the mapped arrays.
+    """
+    with open(os.path.join(directory, CSR_META_FILE), encoding="utf-8") as f:
+        shape = tuple(json.load(f)["shape"])
+    data, indices, indptr = (np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                             for name in ("data", "indices", "indptr"))
+    return csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+# Data shared by the trials of one worker process, set by `_init_worker`
+_shared: Dict[str, Any] = {}
+
+
+def _init_worker(directory: str) -> None:
+    """Map the term counts, labels and splits written by `HyperparameterSearch`."""
+    _shared["counts"] = load_mmap_csr(os.path.join(directory, "counts"))
+    _shared["labels"] = np.load(os.path.join(directory, "labels.npy"), mmap_mode="r")
+    with np.load(os.path.join(directory, "splits.npz")) as splits:
+        _shared["splits"] = [(splits[f"train_{index}"], splits[f"test_{index}"])
+                             for index in range(len(splits.files) // 2)]
+
+
+def _evaluate_trial(trial: int, params: Dict[str, Any], max_iter: int) -> Dict[str, Any]:
+    """
+    Fit and score one parameter setting on every split of the shared data.
+    A setting the estimator rejects (e.g. an unsupported solver/penalty pair)
+    is reported as a failed trial instead of aborting the search.
+    :return: Trial number, parameters, mean and standard deviation of the
+        test accuracy, total fit seconds, mean number of features and the
+        error message of a failed trial (None otherwise).
+    """
+    counts, labels, splits = _shared["counts"], _shared["labels"], _shared["splits"]
+    vectorizer_params = {name: params[name] for name in VECTORIZER_PARAMS if name in params}
+    model_params = {name: value for name, value in params.items() if name not in VECTORIZER_PARAMS}
+
+    accuracies, n_features = [], []
+    started = time.perf_counter()
+    try:
+        for train_indices, test_indices in splits:
+            train_counts = counts[train_indices]
+            columns = document_frequency_columns(
+                train_counts, vectorizer_params.get("min_df", 1), vectorizer_params.get("max_df", 1.0))
+            transformer = TfidfTransformer(sublinear_tf=vectorizer_params.get("sublinear_tf", False))
+            xv_train = transformer.fit_transform(train_counts[:, columns])
+            xv_test = transformer.transform(counts[test_indices][:, columns])
+            model = LogisticRegression(max_iter=max_iter, **model_params)
+            model.fit(xv_train, labels[train_indices])
+            accuracies.append(accuracy_score(labels[test_indices], model.predict(xv_test)))
+            n_features.append(len(columns))
+    except (ValueError, TypeError) as e:
+        logging.warning(f"Trial {trial} failed with {params}: {e}")
+        return {
+            "trial": trial,
+            "params": params,
+            "accuracy": float("nan"),
+            "accuracy_std": float("nan"),
+            "fit_seconds": time.perf_counter() - started,
+            "n_features": float("nan"),
+            "error": str(e),
+        }
+    return {
+        "trial": trial,
+        "params": params,
+        "accuracy": float(np.mean(accuracies)),
+        "accuracy_std": float(np.std(accuracies)),
+        "fit_seconds": time.perf_counter() - started,
+        "n_features": float(np.mean(n_features)),
+        "error": None,
+    }
+
+
+class HyperparameterSearch:
+    """
+    Grid or random search over TF-IDF weighting and LogisticRegression
+    parameters on a term-count matrix computed once.
+
+    The counts, labels and splits are written once as memory-mappable arrays
+    and every worker process maps the same files, so adding workers does not
+    add copies of the corpus. Each trial only selects rows and columns of the
+    counts (document-frequency limits are applied to the training rows of
+    each split) and refits the IDF weights and the model.
+    """
+
+    def __init__(self, param_grid: Optional[Dict[str, List[Any]]] = None,
+                 n_iter: Optional[int] = None, n_jobs: int = 1,
+                 random_state: int = 42, max_iter: int = 1000, dtype=DEFAULT_DTYPE):
+        """
+        :param param_grid: Candidate values per parameter. `min_df`, `max_df`
+            and `sublinear_tf` apply to the features; the other names are
+            LogisticRegression parameters (`C`, `solver`, `penalty`, ...).
+        :param n_iter: Number of random settings to sample from the grid, or
+            None to try every combination.
+        :param n_jobs: Number of worker processes; -1 uses every core.
+        :param random_state: Seed of the random sampling.
+        :param max_iter: Iteration limit of every LogisticRegression fit.
+        :param dtype: Value type of the shared counts and of the TF-IDF
+            features (small integer counts are exact in float32).
+        """
+        self.param_grid = param_grid or DEFAULT_PARAM_GRID
+        self.n_iter = n_iter
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.max_iter = max_iter
+        self.dtype = dtype
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        """The parameter settings that will be tried."""
+        grid = ParameterGrid(self.param_grid)
+        if self.n_iter is None or self.n_iter >= len(grid):
+            return list(grid)
+        return list(ParameterSampler(self.param_grid, n_iter=self.n_iter,
+                                     random_state=self.random_state))
+
+    def iter_results(self, counts: csr_matrix, labels: np.ndarray, splits: IndexSplits,
+                     work_dir: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run the search, yielding each trial result as soon as it finishes.
+        :param counts: Raw term counts of every document (rows aligned with labels).
+        :param labels: Class label of every document.
+        :param splits: (train_indices, test_indices) pairs, e.g. from a
+            DataSplitter; trial accuracy is averaged over them.
+        :param work_dir: Directory for the shared memory-mapped arrays; a
+            temporary directory inside it is removed after the search.
+        :return: Iterator over trial results, in completion order.
+        """
+        candidates = self.candidates()
+        if work_dir:
+            os.makedirs(work_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="search-", dir=work_dir) as directory:
+            save_mmap_csr(compact_csr(counts, self.dtype), os.path.join(directory, "counts"))
+            np.save(os.path.join(directory, "labels.npy"), np.asarray(labels))
+            np.savez(os.path.join(directory, "splits.npz"),
+                     **{f"{part}_{index}": indices
+                        for index, split in enumerate(splits)
+                        for part, indices in zip(("train", "test"), split)})
+
+            n_jobs = min(resolve_n_jobs(self.n_jobs), len(candidates))
+            logging.info(f"Searching {len(candidates)} parameter settings over {len(splits)} "
+                         f"split(s) with {n_jobs} worker(s).")
+            if n_jobs <= 1:
+                _init_worker(directory)
+                try:
+                    for trial, params in enumerate(candidates):
+                        yield _evaluate_trial(trial, params, self.max_iter)
+                finally:
+                    _shared.clear()
+                return
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                     initargs=(directory,)) as executor:
+                futures = [executor.submit(_evaluate_trial, trial, params, self.max_iter)
+                           for trial, params in enumerate(candidates)]
+                for future in as_completed(futures):
+                    yield future.result()
+
+    def run(self, counts: csr_matrix, labels: np.ndarray, splits: IndexSplits,
+            work_dir: Optional[str] = None) -> pd.DataFrame:
+        """
+        Run the search.
+        :return: One row per trial, best accuracy first, with one column per
+            searched parameter.
+        """
+        results = list(self.iter_results(counts, labels, splits, work_dir))
+        return results_frame(results)
+
+
+def results_frame(results: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Tabulate trial results, best mean accuracy first (faster fits break ties)
+    and failed trials last.
+    :param results: Trial results from `HyperparameterSearch.iter_results`.
+    :return: DataFrame with one row per trial and one column per parameter.
+    """
+    rows = [{**{key: value for key, value in result.items() if key != "params"},
+             **result["params"]} for result in results]
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        return frame
+    return frame.sort_values(["accuracy", "fit_seconds"], ascending=[False, True],
+                             ignore_index=True)
+
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.base import BaseEstimator
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import log_loss
+
+from src.data_clean import CLEANER_VERSION, TextCleaningEngine
+from src.data_ingest import DataIngestorFactory
+from src.feature_engineering import HashingFeatureEngineeringStrategy
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# A chunk factory is called once per epoch and returns that epoch's (X, y) chunks
+ChunkFactory = Callable[[int], Iterable[Tuple[csr_matrix, np.ndarray]]]
+
+
+class IncrementalLogisticTrainer:
+    """
+    Trains a logistic-loss SGDClassifier with `partial_fit` over feature
+    chunks, so the training set never has to be held as a single matrix.
+    Progress is checkpointed after every `checkpoint_every` chunks, and an
+    interrupted run resumes from the last checkpoint written for the same data
+    and hyperparameters.
+
+    Memory stays bounded only when the chunks are produced lazily, as in
+    `train_from_file`. The training pipeline's step passes
+    `iter_matrix_chunks` over the in-memory training matrix, which bounds the
+    work per update but not the matrix itself.
+    """
+
+    def __init__(self, classes: np.ndarray, epochs: int = 5, alpha: float = 1e-5,
+                 random_state: int = 42, checkpoint_path: Optional[str] = None,
+                 checkpoint_every: int = 10, fingerprint: Optional[str] = None,
+                 metrics_callback: Optional[Callable[[Dict[str, float], int], None]] = None):
+        """
+        :param classes: All class labels, required by the first partial_fit call.
+        :param epochs: Number of passes over the chunk stream.
+        :param alpha: L2 regularisation strength.
+        :param random_state: Seed for the SGD optimiser.
+        :param checkpoint_path: File used to save and resume training state.
+        :param checkpoint_every: Number of chunks between checkpoints.
+        :param fingerprint: Identifier of the training data and chunking. A
+            checkpoint written for different data, or with different epochs,
+            alpha, random_state or classes, is ignored.
+        :param metrics_callback: Called as callback(metrics, step) after each chunk.
+        """
+        self.classes = np.asarray(classes)
+        self.epochs = epochs
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.fingerprint = fingerprint
+        self.checkpoint_key = self._checkpoint_key(fingerprint, epochs, alpha, random_state)
+        self.metrics_callback = metrics_callback
+        self.model = SGDClassifier(loss="log_loss", alpha=alpha, random_state=random_state)
+        self.epoch = 0
+        self.chunk = 0
+        self.global_step = 0
+
+    def _checkpoint_key(self, fingerprint: Optional[str], epochs: int, alpha: float,
+                        random_state: int) -> str:
+        """Identity of a training run: the data fingerprint and every hyperparameter."""
+        payload = json.dumps({"fingerprint": fingerprint, "epochs": epochs, "alpha": alpha,
+                              "random_state": random_state, "classes": self.classes.tolist()},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {
+            "model": self.model,
+            "epoch": self.epoch,
+            "chunk": self.chunk,
+            "global_step": self.global_step,
+            "fingerprint": self.checkpoint_key,
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _load_checkpoint(self) -> None:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        state = joblib.load(self.checkpoint_path)
+        if state.get("fingerprint") != self.checkpoint_key:
+            logging.warning("Ignoring checkpoint written for different training data or hyperparameters.")
+            return
+        self.model = state["model"]
+        self.epoch = state["epoch"]
+        self.chunk = state["chunk"]
+        self.global_step = state["global_step"]
+        logging.info(f"Resuming incremental training at epoch {self.epoch}, chunk {self.chunk}.")
+
+    def fit(self, chunk_factory: ChunkFactory) -> SGDClassifier:
+        """
+        Train over `epochs` passes of the chunk stream.
+        :param chunk_factory: Callable taking the epoch number and returning an
+            iterable of (X, y) chunks.
+        :return: Trained SGDClassifier.
+        """
+        self._load_checkpoint()
+        while self.epoch < self.epochs:
+            epoch_loss, epoch_rows = 0.0, 0
+            for index, (X_chunk, y_chunk) in enumerate(chunk_factory(self.epoch)):
+                if index < self.chunk:
+                    # Already trained on before the checkpoint
+                    continue
+                y_chunk = np.asarray(y_chunk)
+                self.model.partial_fit(X_chunk, y_chunk, classes=self.classes)
+                chunk_loss = log_loss(y_chunk, self.model.predict_proba(X_chunk), labels=self.classes)
+                epoch_loss += chunk_loss * len(y_chunk)
+                epoch_rows += len(y_chunk)
+                self.chunk = index + 1
+                self.global_step += 1
+                if self.metrics_callback is not None:
+                    self.metrics_callback(
+                        {"chunk_loss": chunk_loss, "epoch": float(self.epoch),
+                         "chunk_rows": float(len(y_chunk))},
+                        self.global_step)
+                if self.global_step % self.checkpoint_every == 0:
+                    self._save_checkpoint()
+            if epoch_rows:
+                logging.info(f"Epoch {self.epoch + 1}/{self.epochs}: mean chunk loss "
+                             f"{epoch_loss / epoch_rows:.4f} over {epoch_rows} rows.")
+            self.epoch += 1
+            self.chunk = 0
+            self._save_checkpoint()
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            # Training finished; a leftover checkpoint would only be stale
+            os.remove(self.checkpoint_path)
+        return self.model
+
+
+def iter_matrix_chunks(X: csr_matrix, y: np.ndarray, chunk_size: int,
+                       epoch: int = 0, shuffle: bool = True) -> Iterator[Tuple[csr_matrix, np.ndarray]]:
+    """
+    Yield row chunks of an in-memory sparse matrix. The chunk order is shuffled
+    deterministically per epoch, so resuming reproduces the same order.
+    :param X: Sparse feature matrix.
+    :param y: Labels aligned with the rows of X.
+    :param chunk_size: Rows per chunk.
+    :param epoch: Epoch number, used to seed the chunk order.
+    :param shuffle: Whether to shuffle the chunk order.
+    """
+    y = np.asarray(y)
+    starts = np.arange(0, X.shape[0], chunk_size)
+    if shuffle:
+        starts = np.random.default_rng(epoch).permutation(starts)
+    for start in starts:
+        yield X[start:start + chunk_size], y[start:start + chunk_size]
+
+
+def matrix_fingerprint(X: csr_matrix, y: np.ndarray, chunk_size: int) -> str:
+    """
+    Fingerprint of an in-memory training set and its chunking, for
+    `IncrementalLogisticTrainer`. The values, column indices and row pointers
+    of X are hashed, so any change to the features (dtype, weighting, IDF
+    fit) gives a new fingerprint even when the sparsity pattern is unchanged.
+    """
+    X = csr_matrix(X)
+    digest = hashlib.sha256(f"{X.shape}|{X.dtype}|{chunk_size}".encode("utf-8"))
+    for array in (X.data, X.indices, X.indptr, np.asarray(y)):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def iter_frame_chunks(chunks: Iterable[pd.DataFrame], strategy, text_column: str = "text",
+                      target_column: str = "class") -> Iterator[Tuple[csr_matrix, np.ndarray]]:
+    """
+    Turn a stream of DataFrame chunks (e.g. `DataIngestor.ingest_chunks`) into
+    feature chunks with a stateless strategy such as
+    HashingFeatureEngineeringStrategy(use_idf=False), for training on corpora
+    larger than memory.
+    """
+    for chunk in chunks:
+        features = strategy.transform(chunk.rename(columns={text_column: "text"}))
+        yield features, chunk[target_column].to_numpy()
+
+
+def _cleaned_chunks(chunks: Iterable[pd.DataFrame], text_column: str) -> Iterator[pd.DataFrame]:
+    """Clean the text column of each chunk as the training pipeline does."""
+    cleaner = TextCleaningEngine()
+    for chunk in chunks:
+        chunk[text_column] = cleaner.clean_batch(chunk[text_column].fillna(""))
+        yield chunk
+
+
+def train_from_file(file_path: str, classes: np.ndarray, text_column: str = "text",
+                    target_column: str = "class", chunk_size: int = 50000,
+                    n_features: int = 2 ** 20, epochs: int = 5, alpha: float = 1e-5,
+                    random_state: int = 42, checkpoint_path: Optional[str] = None,
+                    checkpoint_every: int = 10,
+                    metrics_callback: Optional[Callable[[Dict[str, float], int], None]] = None
+                    ) -> Tuple[SGDClassifier, BaseEstimator]:
+    """
+    Train on a CSV, Parquet or Arrow file larger than memory. Each epoch
+    streams the file `chunk_size` rows at a time; every chunk is cleaned,
+    hashed by a stateless HashingFeatureEngineeringStrategy (no IDF, so no
+    fit pass over the corpus) and used for one partial_fit update. Only one
+    chunk is held in memory at a time.
+    :param file_path: Labelled articles.
+    :param classes: All class labels in the file.
+    :param text_column: Column holding the article text.
+    :param target_column: Column holding the labels.
+    :param chunk_size: Rows read, hashed and trained on at a time.
+    :param n_features: Number of hashed feature columns.
+    :param epochs: Number of passes over the file.
+    :param alpha: L2 regularisation strength.
+    :param random_state: Seed for the SGD optimiser.
+    :param checkpoint_path: File used to save and resume training state. A
+        checkpoint is only resumed for the same file contents (size and
+        modification time) and settings.
+    :param checkpoint_every: Number of chunks between checkpoints.
+    :param metrics_callback: Called as callback(metrics, step) after each chunk.
+    :return: The trained classifier and the vectorizer that turns cleaned
+        text into its features.
+    """
+    strategy = HashingFeatureEngineeringStrategy(n_features=n_features, use_idf=False)
+    ingestor = DataIngestorFactory.get_data_ingestor(
+        file_path, chunk_size=chunk_size, columns=[text_column, target_column],
+        dtype={text_column: str})
+    stat = os.stat(file_path)
+    fingerprint = hashlib.sha256(json.dumps({
+        "path": os.path.abspath(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+        "columns": [text_column, target_column], "chunk_size": chunk_size,
+        "n_features": n_features, "cleaner": CLEANER_VERSION,
+    }, sort_keys=True).encode("utf-8")).hexdigest()
+
+    trainer = IncrementalLogisticTrainer(
+        classes=classes, epochs=epochs, alpha=alpha, random_state=random_state,
+        checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
+        fingerprint=fingerprint, metrics_callback=metrics_callback)
+    model = trainer.fit(lambda epoch: iter_frame_chunks(
+        _cleaned_chunks(ingestor.ingest_chunks(file_path), text_column),
+        strategy, text_column, target_column))
+    return model, strategy.get_vectorizer()
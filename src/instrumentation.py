@@ -0,0 +1,263 @@
+import functools
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import issparse
+
+try:  # POSIX only; peak RSS is skipped elsewhere
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+STEP_METRICS_PATH = os.environ.get("STEP_METRICS_PATH", ".cache/step_metrics.jsonl")
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """High-water mark of resident memory of this process and its reaped children."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / scale
+
+
+def _cpu_seconds() -> float:
+    """User plus system CPU time, including worker processes that have exited."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _values(obj: Any) -> Iterable[Any]:
+    """Flatten the tuple outputs of multi-output steps."""
+    if isinstance(obj, (tuple, list)) and not isinstance(obj, str):
+        return obj
+    return (obj,)
+
+
+def _rows(obj: Any) -> Optional[int]:
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)) or issparse(obj):
+        return int(obj.shape[0])
+    return None
+
+
+def _size_bytes(obj: Any) -> Optional[int]:
+    """
+    In-memory size of tabular data and size of files named by path outputs.
+    Other objects (fitted models, vectorizers) are not measured: serializing
+    them after every step would cost more than the metric is worth.
+    """
+    if issparse(obj):
+        obj = obj.tocsr()
+        return int(obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, str) and os.path.isfile(obj):
+        return os.path.getsize(obj)
+    return None
+
+
+def describe_data(values: Iterable[Any], prefix: str) -> Dict[str, float]:
+    """
+    Row counts, sparse nnz and sizes of step inputs or outputs.
+    :param values: Objects to describe.
+    :param prefix: 'input' or 'output', used in the metric names.
+    :return: Metrics such as output_rows, output_nnz and output_bytes.
+    """
+    rows = nnz = size = 0
+    has_rows = has_nnz = has_size = False
+    for value in values:
+        value_rows = _rows(value)
+        if value_rows is not None:
+            # Outputs such as train/test splits are parts of one table: report the largest
+            rows = max(rows, value_rows)
+            has_rows = True
+        if issparse(value):
+            nnz += int(value.nnz)
+            has_nnz = True
+        if prefix == "output":
+            value_size = _size_bytes(value)
+            if value_size is not None:
+                size += value_size
+                has_size = True
+    metrics = {}
+    if has_rows:
+        metrics[f"{prefix}_rows"] = float(rows)
+    if has_nnz:
+        metrics[f"{prefix}_nnz"] = float(nnz)
+    if has_size:
+        metrics[f"{prefix}_bytes"] = float(size)
+    return metrics
+
+
+def _pipeline_run_tags() -> Dict[str, str]:
+    """ZenML pipeline run identifiers, or nothing when called outside a run."""
+    try:
+        from zenml import get_step_context
+
+        context = get_step_context()
+        return {
+            "pipeline_name": context.pipeline.name,
+            "pipeline_run_id": str(context.pipeline_run.id),
+            "pipeline_run_name": context.pipeline_run.name,
+        }
+    except Exception:
+        return {}
+
+
+def _log_to_mlflow(step_name: str, metrics: Dict[str, float], tags: Dict[str, str]) -> None:
+    """
+    Log step metrics to one MLflow run per pipeline run, found or created
+    through its `zenml.pipeline_run_id` tag, as `<step>/<metric>`.
+    """
+    from mlflow.entities import Metric
+    from mlflow.tracking import MlflowClient
+
+    from src.resources import mlflow_tracking_uri
+
+    client = MlflowClient(tracking_uri=mlflow_tracking_uri())
+    experiment_name = tags.get("pipeline_name", "pipeline_instrumentation")
+    experiment = client.get_experiment_by_name(experiment_name)
+    experiment_id = experiment.experiment_id if experiment else client.create_experiment(experiment_name)
+
+    run_id = None
+    run_tag = tags.get("pipeline_run_id")
+    if run_tag:
+        runs = client.search_runs(
+            [experiment_id],
+            filter_string=f"tags.`zenml.pipeline_run_id` = '{run_tag}' "
+                          f"and tags.`zenml.instrumentation` = 'true'",
+            max_results=1)
+        run_id = runs[0].info.run_id if runs else None
+    if run_id is None:
+        run_tags = {f"zenml.{key}": value for key, value in tags.items()}
+        run_tags["zenml.instrumentation"] = "true"
+        run = client.create_run(experiment_id, tags=run_tags,
+                                run_name=f"{tags.get('pipeline_run_name', 'local')}-performance")
+        run_id = run.info.run_id
+
+    timestamp = int(time.time() * 1000)
+    client.log_batch(run_id, metrics=[
+        Metric(f"{step_name}/{name}", value, timestamp, 0)
+        for name, value in metrics.items()])
+
+
+def _append_jsonl(record: Dict[str, Any], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def instrument_step(func: Callable) -> Callable:
+    """
+    Decorator recording the cost of a step: wall time, CPU time (including
+    worker processes), peak RSS, input and output rows, sparse nnz and
+    output sizes. Apply it below `@step`, so ZenML still sees the original
+    signature:
+
+        @step
+        @instrument_step
+        def my_step(...): ...
+
+    Metrics are logged to MLflow under the pipeline run and appended to
+    STEP_METRICS_PATH. Reporting failures are logged and never fail the step.
+    """
+    step_name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = describe_data(list(args) + list(kwargs.values()), "input")
+        rss_before = _peak_rss_mb()
+        cpu_started = _cpu_seconds()
+        started = time.perf_counter()
+        status = "completed"
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            status = "failed"
+            raise
+        finally:
+            metrics["wall_time_s"] = time.perf_counter() - started
+            metrics["cpu_time_s"] = _cpu_seconds() - cpu_started
+            rss_after = _peak_rss_mb()
+            if rss_after is not None:
+                metrics["peak_rss_mb"] = rss_after
+                metrics["peak_rss_growth_mb"] = rss_after - rss_before
+            if status == "failed":
+                _report(step_name, metrics, status)
+        metrics.update(describe_data(_values(result), "output"))
+        _report(step_name, metrics, status)
+        return result
+
+    return wrapper
+
+
+def _report(step_name: str, metrics: Dict[str, float], status: str) -> None:
+    tags = _pipeline_run_tags()
+    logging.info(f"Step '{step_name}' {status} in {metrics['wall_time_s']:.2f}s "
+                 f"(CPU {metrics['cpu_time_s']:.2f}s).")
+    record = {"step": step_name, "status": status, "timestamp": time.time(), **tags,
+              "metrics": metrics}
+    try:
+        _append_jsonl(record, STEP_METRICS_PATH)
+    except OSError as e:
+        logging.warning(f"Could not write step metrics to {STEP_METRICS_PATH}: {e}")
+    try:
+        _log_to_mlflow(step_name, metrics, tags)
+    except Exception as e:
+        logging.warning(f"Could not log step metrics to MLflow: {e}")
+
+
+def load_step_metrics(pipeline_run_id: Optional[str] = None,
+                      path: str = STEP_METRICS_PATH) -> List[Dict[str, Any]]:
+    """
+    Read step metric records, optionally only those of one pipeline run.
+    :param pipeline_run_id: ZenML pipeline run id to filter on.
+    :param path: JSONL file written by instrument_step.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if pipeline_run_id is not None:
+        records = [r for r in records if r.get("pipeline_run_id") == str(pipeline_run_id)]
+    return records
+
+
+def format_summary(records: List[Dict[str, Any]]) -> str:
+    """Render step metric records as a fixed-width table, in execution order."""
+    columns = [("wall_time_s", "wall s", "{:.2f}"), ("cpu_time_s", "cpu s", "{:.2f}"),
+               ("peak_rss_mb", "peak MB", "{:.0f}"), ("input_rows", "rows in", "{:.0f}"),
+               ("output_rows", "rows out", "{:.0f}"), ("output_nnz", "nnz out", "{:.0f}"),
+               ("output_bytes", "out MB", "{:.1f}")]
+    lines = [f"{'step':32s} " + " ".join(f"{title:>10s}" for _, title, _ in columns)]
+    total_wall = 0.0
+    for record in records:
+        metrics = record["metrics"]
+        total_wall += metrics.get("wall_time_s", 0.0)
+        cells = []
+        for key, _, fmt in columns:
+            value = metrics.get(key)
+            if value is not None and key == "output_bytes":
+                value /= 2 ** 20
+            cells.append(f"{fmt.format(value) if value is not None else '-':>10s}")
+        name = record["step"] + (" (failed)" if record.get("status") == "failed" else "")
+        lines.append(f"{name:32s} " + " ".join(cells))
+    lines.append(f"{'total':32s} {total_wall:10.2f}")
+    return "\n".join(lines)
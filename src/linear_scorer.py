@@ -0,0 +1,125 @@
+import logging
+import math
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class FusedLinearScorer:
+    """
+    Scores documents for a binary LogisticRegression trained on TfidfVectorizer
+    output without building a sparse matrix.
+
+    For each vocabulary term t the scorer keeps (idf_t, idf_t * coef_t). A
+    document's decision value is then
+        intercept + sum(tf_t * idf_t * coef_t) / norm(tf * idf)
+    which is computed with a tokenize -> lookup -> accumulate loop.
+    """
+
+    def __init__(self, weights: Dict[str, Tuple[float, float]], intercept: float,
+                 classes: np.ndarray, analyzer, binary: bool = False,
+                 sublinear_tf: bool = False, norm: str = "l2"):
+        """
+        :param weights: Mapping of term -> (idf, idf * coef).
+        :param intercept: Model intercept.
+        :param classes: Class labels, negative class first.
+        :param analyzer: Callable turning a document into a list of terms.
+        :param binary: Whether term frequencies are clipped to 1.
+        :param sublinear_tf: Whether term frequencies are replaced by 1 + log(tf).
+        :param norm: 'l2', 'l1' or None, as in TfidfVectorizer.
+        """
+        self.weights = weights
+        self.intercept = intercept
+        self.classes_ = np.asarray(classes)
+        self.analyzer = analyzer
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+    @classmethod
+    def from_fitted(cls, vectorizer: TfidfVectorizer, model: LogisticRegression) -> "FusedLinearScorer":
+        """
+        Precompute the weight table from a fitted vectorizer and binary model.
+        :param vectorizer: Fitted TfidfVectorizer.
+        :param model: Fitted binary LogisticRegression trained on `vectorizer` output.
+        :return: FusedLinearScorer.
+        """
+        if model.coef_.shape[0] != 1:
+            raise ValueError("Only binary classifiers with a single coefficient row are supported.")
+        coef = np.asarray(model.coef_[0], dtype=np.float64)
+        n_features = len(vectorizer.vocabulary_)
+        idf = (np.asarray(vectorizer.idf_, dtype=np.float64) if vectorizer.use_idf
+               else np.ones(n_features))
+        fused = (idf * coef).tolist()
+        idf = idf.tolist()
+        weights = {term: (idf[column], fused[column])
+                   for term, column in vectorizer.vocabulary_.items()}
+        logging.info(f"Built fused scoring table with {len(weights)} terms.")
+        return cls(weights, float(model.intercept_[0]), model.classes_,
+                   vectorizer.build_analyzer(), binary=vectorizer.binary,
+                   sublinear_tf=vectorizer.sublinear_tf, norm=vectorizer.norm)
+
+    def decision_value(self, text: str) -> float:
+        """Decision value of a single document."""
+        lookup = self.weights.get
+        binary, sublinear_tf, l2 = self.binary, self.sublinear_tf, self.norm == "l2"
+        log = math.log
+        dot = 0.0
+        length = 0.0
+        for term, count in Counter(self.analyzer(text)).items():
+            entry = lookup(term)
+            if entry is None:
+                continue
+            idf, weight = entry
+            if binary:
+                tf = 1.0
+            elif sublinear_tf:
+                tf = log(count) + 1.0
+            else:
+                tf = float(count)
+            dot += tf * weight
+            if l2:
+                length += (tf * idf) ** 2
+            else:
+                length += abs(tf * idf)
+        if self.norm == "l2":
+            length = math.sqrt(length)
+        elif self.norm is None:
+            length = 0.0
+        if length > 0:
+            dot /= length
+        return dot + self.intercept
+
+    def decision_function(self, texts: Iterable[str]) -> np.ndarray:
+        """Decision values for a batch of documents."""
+        return np.fromiter((self.decision_value(text) for text in texts), dtype=np.float64)
+
+    def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
+        """Class probabilities, matching LogisticRegression.predict_proba."""
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(texts)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, texts: Iterable[str]) -> np.ndarray:
+        """Predicted class label for each document."""
+        return self.classes_[(self.decision_function(texts) > 0).astype(int)]
+
+
+def build_fused_scorer(vectorizer, model) -> Optional[FusedLinearScorer]:
+    """
+    Build a FusedLinearScorer when the vectorizer/model pair supports it.
+    :param vectorizer: Fitted vectorizer.
+    :param model: Fitted classifier.
+    :return: FusedLinearScorer, or None for unsupported pairs (e.g. a non-TF-IDF
+        vectorizer or a multi-class model), in which case callers should fall
+        back to `model.predict(vectorizer.transform(...))`.
+    """
+    coef = getattr(model, "coef_", None)
+    if not isinstance(vectorizer, TfidfVectorizer) or coef is None or coef.shape[0] != 1:
+        return None
+    return FusedLinearScorer.from_fitted(vectorizer, model)
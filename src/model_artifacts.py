@@ -0,0 +1,451 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+ARTIFACT_FORMAT_VERSION = 1
+META_FILE = "meta.json"
+FIDELITY_FILE = "fidelity.json"
+# Vectorizer parameters that affect tokenization and weighting and can be
+# stored as JSON. Callables (custom tokenizers, preprocessors) are not supported.
+ANALYZER_PARAMS = (
+    "analyzer", "lowercase", "token_pattern", "ngram_range", "stop_words",
+    "strip_accents", "encoding", "decode_error",
+)
+WEIGHTING_PARAMS = ("binary", "norm", "use_idf", "sublinear_tf")
+# Integer types weights can be quantized to, and the default number of
+# consecutive sorted terms sharing one scale
+QUANTIZED_DTYPES = {"int8": np.int8, "int16": np.int16}
+DEFAULT_BLOCK_SIZE = 256
+
+
+def save_mmap_artifacts(model: LogisticRegression, vectorizer: TfidfVectorizer, directory: str) -> None:
+    """
+    Write a fitted binary LogisticRegression and TfidfVectorizer as flat .npy
+    arrays that can be memory-mapped by `load_mmap_scorer`.
+
+    Layout of `directory`:
+    - terms.npy: vocabulary as a sorted fixed-width UTF-8 byte array
+    - columns.npy: feature column of each sorted term (int32)
+    - idf.npy, coef.npy: per-term IDF and coefficient, in sorted-term order
+    - intercept.npy, classes.npy: model intercept and class labels
+    - meta.json: tokenization and weighting parameters
+
+    The files are written to a temporary directory that then replaces
+    `directory`, so readers never see a partial or mixed export.
+
+    :param model: Fitted binary LogisticRegression.
+    :param vectorizer: Fitted TfidfVectorizer the model was trained on.
+    :param directory: Output directory, replaced if it exists.
+    """
+    params = _check_exportable(model, vectorizer)
+    vocabulary = vectorizer.vocabulary_
+    terms = np.array([term.encode("utf-8") for term in vocabulary], dtype=np.bytes_)
+    columns = np.fromiter(vocabulary.values(), dtype=np.int32, count=len(vocabulary))
+    order = np.argsort(terms, kind="stable")
+    terms, columns = terms[order], columns[order]
+
+    n_features = len(vocabulary)
+    idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(n_features)
+
+    staging = _staging_directory(directory)
+    try:
+        np.save(os.path.join(staging, "terms.npy"), terms)
+        np.save(os.path.join(staging, "columns.npy"), columns)
+        np.save(os.path.join(staging, "idf.npy"), np.asarray(idf, dtype=np.float64)[columns])
+        np.save(os.path.join(staging, "coef.npy"), np.asarray(model.coef_[0], dtype=np.float64)[columns])
+        np.save(os.path.join(staging, "intercept.npy"), np.asarray(model.intercept_, dtype=np.float64))
+        np.save(os.path.join(staging, "classes.npy"), np.asarray(model.classes_))
+        _write_meta(staging, params, n_features)
+        _publish(staging, directory)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    logging.info(f"Saved memory-mappable model artifacts to {directory} ({n_features} terms).")
+
+
+def _staging_directory(directory: str) -> str:
+    """Create an empty temporary directory next to `directory` to write an export into."""
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(os.path.abspath(directory))}.", dir=parent)
+    # mkdtemp is private to the owner; exports are read by serving processes
+    os.chmod(staging, 0o755)
+    return staging
+
+
+def _publish(staging: str, directory: str) -> None:
+    """
+    Move a complete export from `staging` to `directory`. A directory cannot
+    be renamed over a non-empty one, so the previous export is first moved
+    aside; readers see the old export, briefly none, or the new one, never
+    a mix of files from both.
+    """
+    previous = None
+    if os.path.exists(directory):
+        previous = f"{staging}.previous"
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    if previous:
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def remove_artifacts(directory: str) -> None:
+    """
+    Delete an export, e.g. one left by an earlier run when the current model
+    cannot be exported, so that servers do not load a stale model from it.
+    """
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+        logging.info(f"Removed stale model artifacts in {directory}.")
+
+
+def _check_exportable(model: LogisticRegression, vectorizer: TfidfVectorizer) -> Dict:
+    """Reject models and vectorizers the artifact formats cannot represent; return the vectorizer params."""
+    if model.coef_.shape[0] != 1:
+        raise ValueError("Only binary classifiers with a single coefficient row are supported.")
+    params = vectorizer.get_params()
+    for name in ("preprocessor", "tokenizer"):
+        if params.get(name) is not None:
+            raise ValueError(f"Vectorizers with a custom {name} cannot be exported.")
+    if callable(params["analyzer"]):
+        raise ValueError("Vectorizers with a custom analyzer cannot be exported.")
+    return params
+
+
+def _write_meta(directory: str, params: Dict, n_features: int, **extra) -> None:
+    """Write meta.json with the tokenization and weighting parameters."""
+    meta = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "n_features": n_features,
+        "analyzer_params": {name: params[name] for name in ANALYZER_PARAMS},
+        "weighting_params": {name: params[name] for name in WEIGHTING_PARAMS},
+        **extra,
+    }
+    if isinstance(meta["analyzer_params"]["stop_words"], (set, frozenset)):
+        meta["analyzer_params"]["stop_words"] = sorted(meta["analyzer_params"]["stop_words"])
+    with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def term_hash(term: str) -> int:
+    """Stable 64-bit hash of a term (BLAKE2b), used as the compact vocabulary index."""
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def quantize_blocks(values: np.ndarray, dtype: str = "int8",
+                    block_size: int = DEFAULT_BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric quantization with one scale per block of `block_size` values:
+    each block is divided by its largest magnitude over the integer range, so
+    a single large weight only costs precision within its own block.
+    :param values: 1-d float array.
+    :param dtype: "int8" or "int16".
+    :param block_size: Number of consecutive values sharing a scale.
+    :return: (quantized values, float32 scale per block); value i is
+        approximately quantized[i] * scales[i // block_size].
+    """
+    if dtype not in QUANTIZED_DTYPES:
+        raise ValueError(f"Unsupported quantization type {dtype!r}; use one of {sorted(QUANTIZED_DTYPES)}.")
+    if block_size < 1:
+        raise ValueError("block_size must be positive.")
+    integer_type = QUANTIZED_DTYPES[dtype]
+    values = np.asarray(values, dtype=np.float64)
+    n_blocks = -(-len(values) // block_size)
+    blocks = np.zeros(n_blocks * block_size)
+    blocks[:len(values)] = values
+    blocks = blocks.reshape(n_blocks, block_size)
+
+    scales = (np.abs(blocks).max(axis=1) / np.iinfo(integer_type).max).astype(np.float32)
+    scales[scales == 0] = 1.0
+    quantized = np.rint(blocks / scales[:, None].astype(np.float64))
+    limit = np.iinfo(integer_type).max
+    quantized = np.clip(quantized, -limit, limit).astype(integer_type).ravel()[:len(values)]
+    return quantized, scales
+
+
+def save_quantized_artifacts(model: LogisticRegression, vectorizer: TfidfVectorizer, directory: str,
+                             dtype: str = "int8", block_size: int = DEFAULT_BLOCK_SIZE,
+                             fidelity_texts: Optional[Iterable[str]] = None,
+                             report: Optional[Dict] = None) -> Dict:
+    """
+    Write a compact, memory-mappable export of a binary LogisticRegression and
+    its TfidfVectorizer for low-memory serving, loaded by `load_mmap_scorer`.
+
+    Compared with `save_mmap_artifacts`, terms are stored as sorted 64-bit
+    hashes instead of fixed-width strings (whose width is that of the longest
+    term), and the IDF weights and coefficients as int8/int16 with a float32
+    scale per block of sorted terms. Use `quantization_fidelity` to check the
+    export against the float model before serving it.
+
+    Layout of `directory`:
+    - term_hashes.npy: sorted `term_hash` of every term (uint64)
+    - columns.npy: feature column of each sorted term (int32)
+    - idf_q.npy, coef_q.npy: quantized per-term IDF and coefficient
+    - idf_scale.npy, coef_scale.npy: float32 scale per block of terms
+    - intercept.npy, classes.npy: model intercept and class labels
+    - meta.json: tokenization, weighting and quantization parameters
+    - fidelity.json: the export report (see below)
+
+    As in `save_mmap_artifacts`, everything, including the fidelity report,
+    is written to a temporary directory that then replaces `directory`.
+
+    :param model: Fitted binary LogisticRegression.
+    :param vectorizer: Fitted TfidfVectorizer the model was trained on.
+    :param directory: Output directory, replaced if it exists.
+    :param dtype: "int8" (smallest) or "int16" (closest to the float model).
+    :param block_size: Number of consecutive sorted terms sharing a scale.
+    :param fidelity_texts: Documents to run `quantization_fidelity` on, e.g.
+        held-out articles. The check is skipped when None or empty.
+    :param report: Extra fields to record in fidelity.json.
+    :return: The report written to fidelity.json: dtype, block_size,
+        artifact_bytes, the fidelity metrics and the fields of `report`.
+    """
+    params = _check_exportable(model, vectorizer)
+    vocabulary = vectorizer.vocabulary_
+    hashes = np.fromiter((term_hash(term) for term in vocabulary), dtype=np.uint64, count=len(vocabulary))
+    columns = np.fromiter(vocabulary.values(), dtype=np.int32, count=len(vocabulary))
+    order = np.argsort(hashes, kind="stable")
+    hashes, columns = hashes[order], columns[order]
+    if np.any(hashes[1:] == hashes[:-1]):
+        raise ValueError("Two vocabulary terms share a hash; export with save_mmap_artifacts instead.")
+
+    n_features = len(vocabulary)
+    idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(n_features)
+    idf_q, idf_scale = quantize_blocks(np.asarray(idf)[columns], dtype, block_size)
+    coef_q, coef_scale = quantize_blocks(np.asarray(model.coef_[0])[columns], dtype, block_size)
+
+    staging = _staging_directory(directory)
+    try:
+        for name, array in (("term_hashes", hashes), ("columns", columns), ("idf_q", idf_q),
+                            ("idf_scale", idf_scale), ("coef_q", coef_q), ("coef_scale", coef_scale)):
+            np.save(os.path.join(staging, f"{name}.npy"), array)
+        np.save(os.path.join(staging, "intercept.npy"), np.asarray(model.intercept_, dtype=np.float64))
+        np.save(os.path.join(staging, "classes.npy"), np.asarray(model.classes_))
+        _write_meta(staging, params, n_features,
+                    quantization={"dtype": dtype, "block_size": block_size, "term_index": "blake2b-64"})
+
+        report = {"dtype": dtype, "block_size": block_size,
+                  "artifact_bytes": artifact_bytes(staging), **(report or {})}
+        fidelity_texts = list(fidelity_texts) if fidelity_texts is not None else []
+        if fidelity_texts:
+            report.update(quantization_fidelity(model, vectorizer, load_mmap_scorer(staging), fidelity_texts))
+        with open(os.path.join(staging, FIDELITY_FILE), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        _publish(staging, directory)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    logging.info(f"Saved {dtype} quantized model artifacts to {directory} ({n_features} terms).")
+    return report
+
+
+class MmapLinearScorer:
+    """
+    TF-IDF + logistic regression scorer backed by memory-mapped arrays.
+    Vocabulary lookups use a binary search over the sorted term array, so no
+    per-process vocabulary dict is built and processes share the mapped pages.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open the artifacts written by `save_mmap_artifacts`.
+        :param directory: Artifact directory.
+        """
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["format_version"] != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact format version {meta['format_version']}.")
+
+        self._load_weights(directory, meta)
+        self.columns = self._load(directory, "columns")
+        self.intercept = float(np.load(os.path.join(directory, "intercept.npy"))[0])
+        self.classes_ = np.load(os.path.join(directory, "classes.npy"))
+        self.n_features = meta["n_features"]
+
+        analyzer_params = dict(meta["analyzer_params"])
+        analyzer_params["ngram_range"] = tuple(analyzer_params["ngram_range"])
+        self.analyzer = TfidfVectorizer(**analyzer_params).build_analyzer()
+        weighting = meta["weighting_params"]
+        self.binary = weighting["binary"]
+        self.sublinear_tf = weighting["sublinear_tf"]
+        self.norm = weighting["norm"]
+
+    @staticmethod
+    def _load(directory: str, name: str) -> np.ndarray:
+        return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+    def _load_weights(self, directory: str, meta: Dict) -> None:
+        """Map the term index, IDF weights and coefficients."""
+        self.terms = self._load(directory, "terms")
+        self.idf = self._load(directory, "idf")
+        self.coef = self._load(directory, "coef")
+
+    def _match(self, tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted-term positions and counts of the distinct in-vocabulary tokens."""
+        encoded = np.array([token.encode("utf-8") for token in tokens], dtype=np.bytes_)
+        unique, counts = np.unique(encoded, return_counts=True)
+        positions = np.minimum(np.searchsorted(self.terms, unique), len(self.terms) - 1)
+        found = self.terms[positions] == unique
+        return positions[found], counts[found]
+
+    def _idf_at(self, positions: np.ndarray) -> np.ndarray:
+        return self.idf[positions]
+
+    def _coef_at(self, positions: np.ndarray) -> np.ndarray:
+        return self.coef[positions]
+
+    def _lookup(self, text: str):
+        """Return (sorted-term positions, TF-IDF weights) for one document."""
+        tokens = self.analyzer(text)
+        if not tokens or len(self.columns) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        positions, counts = self._match(tokens)
+        tf = counts.astype(np.float64)
+        if self.binary:
+            tf[:] = 1.0
+        elif self.sublinear_tf:
+            tf = np.log(tf) + 1.0
+        weights = tf * self._idf_at(positions)
+        if self.norm == "l2":
+            length = np.sqrt(np.dot(weights, weights))
+        elif self.norm == "l1":
+            length = np.abs(weights).sum()
+        else:
+            length = 0.0
+        if length > 0:
+            weights /= length
+        return positions, weights
+
+    def transform(self, texts: Iterable[str]) -> csr_matrix:
+        """
+        Vectorize texts exactly like the original TfidfVectorizer.transform.
+        :param texts: Iterable of documents.
+        :return: CSR matrix of shape (n_documents, n_features).
+        """
+        indptr: List[int] = [0]
+        indices, data = [], []
+        for text in texts:
+            positions, weights = self._lookup(text)
+            indices.append(np.asarray(self.columns[positions]))
+            data.append(weights)
+            indptr.append(indptr[-1] + len(positions))
+        matrix = csr_matrix(
+            (np.concatenate(data) if data else np.empty(0),
+             np.concatenate(indices) if indices else np.empty(0, dtype=np.int32),
+             np.asarray(indptr)),
+            shape=(len(indptr) - 1, self.n_features))
+        matrix.sort_indices()
+        return matrix
+
+    def decision_function(self, texts: Iterable[str]) -> np.ndarray:
+        """Signed distance to the decision boundary for each document."""
+        scores = []
+        for text in texts:
+            positions, weights = self._lookup(text)
+            scores.append(np.dot(weights, self._coef_at(positions)) + self.intercept)
+        return np.asarray(scores, dtype=np.float64)
+
+    def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
+        """Class probabilities, matching LogisticRegression.predict_proba."""
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(texts)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, texts: Iterable[str]) -> np.ndarray:
+        """Predicted class label for each document."""
+        return self.classes_[(self.decision_function(texts) > 0).astype(int)]
+
+
+class QuantizedLinearScorer(MmapLinearScorer):
+    """
+    Scorer over the artifacts of `save_quantized_artifacts`. Tokens are
+    matched by binary search over the sorted term hashes, and only the
+    weights of the matched terms are dequantized, per document; the full
+    float weight vectors are never materialized.
+    """
+
+    def _load_weights(self, directory: str, meta: Dict) -> None:
+        """Map the term hashes and the quantized weights with their block scales."""
+        quantization = meta["quantization"]
+        if quantization["dtype"] not in QUANTIZED_DTYPES:
+            raise ValueError(f"Unsupported quantization type {quantization['dtype']!r}.")
+        self.block_size = quantization["block_size"]
+        self.term_hashes = self._load(directory, "term_hashes")
+        self.idf_q = self._load(directory, "idf_q")
+        self.idf_scale = self._load(directory, "idf_scale")
+        self.coef_q = self._load(directory, "coef_q")
+        self.coef_scale = self._load(directory, "coef_scale")
+
+    def _match(self, tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        unique, counts = np.unique(np.array(tokens, dtype=object), return_counts=True)
+        hashes = np.fromiter((term_hash(token) for token in unique), dtype=np.uint64, count=len(unique))
+        positions = np.minimum(np.searchsorted(self.term_hashes, hashes), len(self.term_hashes) - 1)
+        found = self.term_hashes[positions] == hashes
+        return positions[found], counts[found]
+
+    def _idf_at(self, positions: np.ndarray) -> np.ndarray:
+        return self.idf_q[positions] * self.idf_scale[positions // self.block_size].astype(np.float64)
+
+    def _coef_at(self, positions: np.ndarray) -> np.ndarray:
+        return self.coef_q[positions] * self.coef_scale[positions // self.block_size].astype(np.float64)
+
+
+def load_mmap_scorer(directory: str) -> MmapLinearScorer:
+    """
+    Load a scorer from artifacts written by `save_mmap_artifacts` or
+    `save_quantized_artifacts`.
+    :param directory: Artifact directory.
+    :return: MmapLinearScorer (QuantizedLinearScorer for a quantized export)
+        over memory-mapped arrays.
+    """
+    with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+        quantized = "quantization" in json.load(f)
+    return QuantizedLinearScorer(directory) if quantized else MmapLinearScorer(directory)
+
+
+def artifact_bytes(*paths: str) -> int:
+    """Total size on disk of files and directories."""
+    total = 0
+    for path in paths:
+        if os.path.isdir(path):
+            total += sum(os.path.getsize(os.path.join(root, name))
+                         for root, _, names in os.walk(path) for name in names)
+        elif os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def quantization_fidelity(model: LogisticRegression, vectorizer: TfidfVectorizer,
+                          scorer: MmapLinearScorer, texts: Iterable[str]) -> Dict[str, float]:
+    """
+    Compare an exported scorer with the float model it was exported from.
+    :param model: The fitted float model.
+    :param vectorizer: The fitted vectorizer.
+    :param scorer: Scorer loaded from the export, e.g. by `load_mmap_scorer`.
+    :param texts: Sample documents, preprocessed as for serving.
+    :return: n_documents, agreement_rate (share of identical predictions),
+        max_probability_delta and mean_probability_delta (absolute difference
+        of the positive-class probability).
+    """
+    texts = list(texts)
+    if not texts:
+        raise ValueError("The fidelity check needs at least one document.")
+    expected = model.predict_proba(vectorizer.transform(texts))[:, 1]
+    actual = scorer.predict_proba(texts)[:, 1]
+    delta = np.abs(expected - actual)
+    agreement = (expected > 0.5) == (actual > 0.5)
+    return {
+        "n_documents": len(texts),
+        "agreement_rate": float(agreement.mean()),
+        "max_probability_delta": float(delta.max()),
+        "mean_probability_delta": float(delta.mean()),
+    }
@@ -1,9 +1,15 @@
 import logging
+import time
 from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Tuple
+import numpy as np
 import pandas as pd
+from scipy.sparse import csr_matrix
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, accuracy_score
 
+from src.incremental_training import iter_matrix_chunks
+
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -35,6 +41,196 @@ class RegressionModelEvaluatorStrategy(ModelEvaluatorStrategy):
         return metrics
 
 
+class StreamingMetrics:
+    """
+    Accumulates classification metrics chunk by chunk in memory independent
+    of the number of rows: a confusion matrix, the summed log-loss, and per
+    class histograms of predicted probabilities for positive and negative
+    rows, from which ROC-AUC and PR-AUC (average precision) are computed.
+    Scores falling in the same histogram bin count as tied, so the AUCs are
+    exact up to a resolution of 1 / n_bins.
+    """
+
+    def __init__(self, classes: np.ndarray, n_bins: int = 1000):
+        """
+        :param classes: Class labels, in the column order of predicted probabilities.
+        :param n_bins: Number of probability histogram bins per class.
+        """
+        self.classes = np.asarray(classes)
+        self.n_bins = n_bins
+        n_classes = len(self.classes)
+        self.confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+        self.positive_hist = np.zeros((n_classes, n_bins), dtype=np.int64)
+        self.negative_hist = np.zeros((n_classes, n_bins), dtype=np.int64)
+        self.log_loss_sum = 0.0
+        self.rows = 0
+        self.chunk_seconds: List[float] = []
+
+    def update(self, y_true: np.ndarray, probabilities: np.ndarray, seconds: float) -> None:
+        """
+        Add one scored chunk.
+        :param y_true: True labels of the chunk.
+        :param probabilities: Predicted probabilities, one column per class.
+        :param seconds: Time taken to score the chunk.
+        """
+        n_classes = len(self.classes)
+        true_index = np.searchsorted(self.classes, np.asarray(y_true))
+        predicted_index = probabilities.argmax(axis=1)
+        self.confusion += np.bincount(true_index * n_classes + predicted_index,
+                                      minlength=n_classes * n_classes).reshape(n_classes, n_classes)
+
+        eps = np.finfo(probabilities.dtype).eps
+        true_probability = probabilities[np.arange(len(true_index)), true_index]
+        self.log_loss_sum -= float(np.log(np.clip(true_probability, eps, 1.0)).sum())
+
+        bins = np.minimum((probabilities * self.n_bins).astype(np.int64), self.n_bins - 1)
+        for column in range(n_classes):
+            positive = true_index == column
+            self.positive_hist[column] += np.bincount(bins[positive, column], minlength=self.n_bins)
+            self.negative_hist[column] += np.bincount(bins[~positive, column], minlength=self.n_bins)
+
+        self.rows += len(true_index)
+        self.chunk_seconds.append(seconds)
+
+    def _curve_areas(self, column: int) -> Tuple[float, float]:
+        """ROC-AUC and average precision of one class against the rest."""
+        # Walk the thresholds from the highest probability bin down
+        true_positives = np.cumsum(self.positive_hist[column][::-1])
+        false_positives = np.cumsum(self.negative_hist[column][::-1])
+        positives, negatives = true_positives[-1], false_positives[-1]
+        if positives == 0 or negatives == 0:
+            return float("nan"), float("nan")
+        tpr = np.concatenate(([0.0], true_positives / positives))
+        fpr = np.concatenate(([0.0], false_positives / negatives))
+        roc_auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+        predicted = true_positives + false_positives
+        with np.errstate(invalid="ignore", divide="ignore"):
+            precision = np.where(predicted > 0, true_positives / predicted, 1.0)
+        average_precision = float(np.sum(np.diff(tpr) * precision))
+        return roc_auc, average_precision
+
+    def result(self) -> Dict[str, Any]:
+        """
+        :return: accuracy, log_loss, roc_auc and pr_auc (of the positive class
+            when binary, macro one-vs-rest otherwise), per-class precision,
+            recall, f1 and support, the confusion matrix (rows are true
+            classes), and scoring throughput and chunk latency percentiles.
+        """
+        confusion = self.confusion
+        support = confusion.sum(axis=1)
+        predicted = confusion.sum(axis=0)
+        correct = np.diag(confusion)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            precision = np.where(predicted > 0, correct / predicted, 0.0)
+            recall = np.where(support > 0, correct / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        areas = [self._curve_areas(column) for column in range(len(self.classes))]
+        if len(self.classes) == 2:
+            roc_auc, pr_auc = areas[1]
+        else:
+            roc_auc, pr_auc = (float(np.nanmean(values)) for values in zip(*areas))
+        seconds = np.asarray(self.chunk_seconds)
+        total_seconds = float(seconds.sum())
+        return {
+            "accuracy": float(correct.sum() / max(self.rows, 1)),
+            "log_loss": self.log_loss_sum / max(self.rows, 1),
+            "roc_auc": roc_auc,
+            "pr_auc": pr_auc,
+            "per_class": {str(label): {"precision": float(precision[index]),
+                                       "recall": float(recall[index]),
+                                       "f1": float(f1[index]),
+                                       "support": int(support[index])}
+                          for index, label in enumerate(self.classes)},
+            "confusion_matrix": confusion.tolist(),
+            "rows": self.rows,
+            "chunks": len(seconds),
+            "rows_per_second": self.rows / total_seconds if total_seconds > 0 else float("inf"),
+            "chunk_latency_ms_p50": float(np.percentile(seconds, 50) * 1000) if len(seconds) else 0.0,
+            "chunk_latency_ms_p95": float(np.percentile(seconds, 95) * 1000) if len(seconds) else 0.0,
+            "chunk_latency_ms_max": float(seconds.max() * 1000) if len(seconds) else 0.0,
+        }
+
+    def report(self) -> str:
+        """Text report in the layout of sklearn's classification_report."""
+        metrics = self.result()
+        lines = [f"{'':>12s} {'precision':>9s} {'recall':>9s} {'f1-score':>9s} {'support':>9s}", ""]
+        for label, values in metrics["per_class"].items():
+            lines.append(f"{label:>12s} {values['precision']:9.2f} {values['recall']:9.2f} "
+                         f"{values['f1']:9.2f} {values['support']:9d}")
+        lines.append("")
+        lines.append(f"{'accuracy':>12s} {'':9s} {'':9s} {metrics['accuracy']:9.2f} {self.rows:9d}")
+        per_class = list(metrics["per_class"].values())
+        support = np.array([values["support"] for values in per_class])
+        for name, weights in (("macro avg", np.ones(len(per_class))), ("weighted avg", support)):
+            averages = [np.average([values[key] for values in per_class], weights=weights)
+                        if weights.sum() > 0 else 0.0 for key in ("precision", "recall", "f1")]
+            lines.append(f"{name:>12s} {averages[0]:9.2f} {averages[1]:9.2f} {averages[2]:9.2f} "
+                         f"{self.rows:9d}")
+        return "\n".join(lines)
+
+
+def _probabilities(model, X) -> np.ndarray:
+    """Class probabilities, from decision values for models without predict_proba."""
+    if hasattr(model, "predict_proba"):
+        try:
+            return model.predict_proba(X)
+        except AttributeError:  # e.g. SGDClassifier with hinge loss
+            pass
+    decision = model.decision_function(X)
+    if decision.ndim == 1:
+        positive = 1 / (1 + np.exp(-decision))
+        return np.column_stack((1 - positive, positive))
+    decision = np.exp(decision - decision.max(axis=1, keepdims=True))
+    return decision / decision.sum(axis=1, keepdims=True)
+
+
+class StreamingModelEvaluatorStrategy(ModelEvaluatorStrategy):
+    """
+    Scores the test set in row chunks and accumulates the metrics with
+    StreamingMetrics, so the memory used beyond the features themselves
+    (probabilities, predictions, sorted scores) depends on the chunk size
+    rather than on the size of the held-out set. `evaluate` still takes the
+    whole test matrix; only `evaluate_chunks` fed from a lazy source bounds
+    the features too. Besides accuracy and the classification report
+    it returns log-loss, ROC-AUC, PR-AUC, the confusion matrix, rows per
+    second and per-chunk latency.
+    """
+
+    def __init__(self, chunk_size: int = 10000, n_bins: int = 1000):
+        """
+        :param chunk_size: Rows scored at a time.
+        :param n_bins: Probability histogram bins used for the AUCs.
+        """
+        self.chunk_size = chunk_size
+        self.n_bins = n_bins
+
+    def evaluate(self, model: LogisticRegression, X_test: csr_matrix, y_test: pd.Series) -> dict:
+        """
+        Evaluate the model on an in-memory test matrix, chunk by chunk.
+        """
+        chunks = iter_matrix_chunks(X_test, np.asarray(y_test), self.chunk_size, shuffle=False)
+        return self.evaluate_chunks(model, chunks)
+
+    def evaluate_chunks(self, model: LogisticRegression,
+                        chunks: Iterable[Tuple[csr_matrix, np.ndarray]]) -> dict:
+        """
+        Evaluate the model on a stream of (features, labels) chunks, e.g. from
+        `iter_frame_chunks` for test sets larger than memory.
+        """
+        logging.info(f"Scoring the test set in chunks of {self.chunk_size} rows.")
+        metrics = StreamingMetrics(model.classes_, n_bins=self.n_bins)
+        for X_chunk, y_chunk in chunks:
+            started = time.perf_counter()
+            probabilities = _probabilities(model, X_chunk)
+            metrics.update(y_chunk, probabilities, time.perf_counter() - started)
+        result = metrics.result()
+        result["classification_report"] = metrics.report()
+        logging.info(f"Evaluation metrics: accuracy={result['accuracy']:.4f} "
+                     f"log_loss={result['log_loss']:.4f} roc_auc={result['roc_auc']:.4f} "
+                     f"pr_auc={result['pr_auc']:.4f} rows/s={result['rows_per_second']:.0f}")
+        return result
+
+
 class ModelEvaluator:
     def __init__(self, strategy: ModelEvaluatorStrategy):
         """ Initializes the ModelEvaluator with a specific model evaluation strategy.
@@ -0,0 +1,257 @@
+import logging
+import re
+import string
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_clean import TextCleaningEngine
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+TOKEN_PATTERN = re.compile(r'\S+')
+ASCII_LETTERS_TABLE = str.maketrans('', '', string.ascii_letters)
+# Bytes per stored TF-IDF entry: float32 value plus int32 column index
+BYTES_PER_NNZ = 8
+# Documents timed to estimate the cleaning throughput of the corpus
+CLEANING_SAMPLE_SIZE = 200
+
+
+def _text_stats(text: str):
+    """Token count, distinct tokens, visible characters and non-letter characters of one text."""
+    tokens = text.lower().split()
+    visible = "".join(tokens)
+    # Deleting ASCII letters leaves the few characters that need a closer look
+    rest = visible.translate(ASCII_LETTERS_TABLE)
+    non_alpha = len(rest) if rest.isascii() else sum(not char.isalpha() for char in rest)
+    return len(tokens), len(set(tokens)), len(visible), non_alpha
+
+
+def compute_document_stats(texts: pd.Series) -> pd.DataFrame:
+    """
+    Per-document statistics, computed in a single pass over each text with
+    C-level string methods (regex counting is several times slower).
+    :param texts: Text column.
+    :return: DataFrame aligned with `texts` with columns char_length,
+        token_count, unique_tokens, non_alpha_ratio and repetition_ratio.
+    """
+    texts = texts.fillna("").astype(str)
+    values = np.array([_text_stats(text) for text in texts], dtype=np.int64).reshape(-1, 4)
+    token_count, unique_tokens, visible, non_alpha = values.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        non_alpha_ratio = np.where(visible > 0, non_alpha / visible, 0.0)
+        repetition_ratio = np.where(token_count > 0, 1 - unique_tokens / token_count, 0.0)
+    return pd.DataFrame({
+        "char_length": texts.str.len().to_numpy(),
+        "token_count": token_count,
+        "unique_tokens": unique_tokens,
+        "non_alpha_ratio": non_alpha_ratio,
+        "repetition_ratio": repetition_ratio,
+    }, index=texts.index)
+
+
+class OutlierBounds:
+    """
+    Configurable limits on document statistics. A bound of None is not checked.
+    """
+
+    def __init__(self, max_chars: Optional[int] = 100000, min_tokens: Optional[int] = 5,
+                 max_tokens: Optional[int] = 15000, max_non_alpha_ratio: Optional[float] = 0.5,
+                 max_repetition_ratio: Optional[float] = 0.9):
+        """
+        :param max_chars: Longest accepted document, in characters.
+        :param min_tokens: Fewest accepted whitespace-separated tokens.
+        :param max_tokens: Most accepted tokens.
+        :param max_non_alpha_ratio: Highest accepted share of non-letter,
+            non-whitespace characters (markup, numbers, symbols).
+        :param max_repetition_ratio: Highest accepted share of repeated tokens
+            (boilerplate repeated over and over).
+        """
+        self.max_chars = max_chars
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.max_non_alpha_ratio = max_non_alpha_ratio
+        self.max_repetition_ratio = max_repetition_ratio
+
+    def violations(self, stats: pd.DataFrame) -> pd.DataFrame:
+        """
+        Check every bound.
+        :param stats: Output of compute_document_stats.
+        :return: Boolean DataFrame with one column per violated-bound reason.
+        """
+        checks = {
+            "too_long": (stats["char_length"] > self.max_chars if self.max_chars is not None else None),
+            "too_few_tokens": (stats["token_count"] < self.min_tokens
+                               if self.min_tokens is not None else None),
+            "too_many_tokens": (stats["token_count"] > self.max_tokens
+                                if self.max_tokens is not None else None),
+            "non_alphabetic": (stats["non_alpha_ratio"] > self.max_non_alpha_ratio
+                               if self.max_non_alpha_ratio is not None else None),
+            "repetitive": (stats["repetition_ratio"] > self.max_repetition_ratio
+                           if self.max_repetition_ratio is not None else None),
+        }
+        return pd.DataFrame({reason: (check if check is not None else False)
+                             for reason, check in checks.items()}, index=stats.index)
+
+
+# Reasons that truncation can repair
+LENGTH_REASONS = ["too_long", "too_many_tokens"]
+
+
+class OutlierHandlingStrategy(ABC):
+    """
+    Abstract base class for handling documents outside the bounds.
+    """
+
+    @abstractmethod
+    def handle(self, data: pd.DataFrame, column: str, violations: pd.DataFrame,
+               bounds: OutlierBounds) -> pd.DataFrame:
+        """
+        Handle outlier documents.
+        :param data: Input DataFrame.
+        :param column: Text column.
+        :param violations: Output of OutlierBounds.violations.
+        :param bounds: Bounds that were checked.
+        :return: Processed DataFrame.
+        """
+        pass
+
+
+class DropOutliers(OutlierHandlingStrategy):
+    """
+    Concrete strategy that drops every document violating a bound.
+    """
+
+    def handle(self, data: pd.DataFrame, column: str, violations: pd.DataFrame,
+               bounds: OutlierBounds) -> pd.DataFrame:
+        logging.info("Dropping outlier documents.")
+        return data[~violations.any(axis=1)]
+
+
+class TruncateOutliers(OutlierHandlingStrategy):
+    """
+    Concrete strategy that truncates over-long documents to the length bounds
+    at a token boundary, keeping their original whitespace. Documents
+    violating other bounds cannot be repaired by truncation and are dropped.
+    """
+
+    @staticmethod
+    def _truncate(text: str, max_chars: Optional[int], max_tokens: Optional[int]) -> str:
+        if max_chars is not None and len(text) > max_chars:
+            cut = text[:max_chars]
+            # Do not keep the partial word at the cut
+            boundary = max(cut.rfind(" "), cut.rfind("\n"))
+            text = cut[:boundary] if boundary > 0 and not text[max_chars].isspace() else cut
+        if max_tokens is not None:
+            for index, match in enumerate(TOKEN_PATTERN.finditer(text), start=1):
+                if index == max_tokens:
+                    text = text[:match.end()]
+                    break
+        return text
+
+    def handle(self, data: pd.DataFrame, column: str, violations: pd.DataFrame,
+               bounds: OutlierBounds) -> pd.DataFrame:
+        logging.info("Truncating over-long documents and dropping other outliers.")
+        other = violations.drop(columns=LENGTH_REASONS).any(axis=1)
+        result = data[~other].copy()
+        too_long = violations.loc[~other, LENGTH_REASONS].any(axis=1)
+        result.loc[too_long, column] = [
+            self._truncate(text, bounds.max_chars, bounds.max_tokens)
+            for text in result.loc[too_long, column].astype(str)]
+        return result
+
+
+class FlagOutliers(OutlierHandlingStrategy):
+    """
+    Concrete strategy that keeps every document unchanged and adds an
+    `is_outlier` flag and a comma-separated `outlier_reasons` column.
+    """
+
+    def handle(self, data: pd.DataFrame, column: str, violations: pd.DataFrame,
+               bounds: OutlierBounds) -> pd.DataFrame:
+        logging.info("Flagging outlier documents.")
+        result = data.copy()
+        result["is_outlier"] = violations.any(axis=1)
+        reasons = pd.Series("", index=data.index)
+        for reason in violations.columns:
+            reasons = reasons.where(~violations[reason], reasons + reason + ",")
+        result["outlier_reasons"] = reasons.str.rstrip(",")
+        return result
+
+
+class OutlierDetector:
+    """
+    Context class: computes document statistics, checks them against the
+    bounds and applies the handling strategy. After `handle`, `report` holds
+    the outlier counts per reason and the estimated savings in later steps.
+    """
+
+    def __init__(self, strategy: OutlierHandlingStrategy, bounds: Optional[OutlierBounds] = None):
+        """
+        :param strategy: How outliers are handled.
+        :param bounds: Limits to check; the OutlierBounds defaults when None.
+        """
+        self.strategy = strategy
+        self.bounds = bounds or OutlierBounds()
+        self.report: Dict[str, float] = {}
+
+    def set_strategy(self, strategy: OutlierHandlingStrategy):
+        """
+        Set a new outlier handling strategy.
+        :param strategy: New strategy.
+        """
+        self.strategy = strategy
+
+    @staticmethod
+    def _cleaning_chars_per_second(texts: pd.Series) -> float:
+        """Cleaning throughput measured on a sample of the corpus."""
+        sample = texts.head(CLEANING_SAMPLE_SIZE).fillna("").astype(str).tolist()
+        characters = sum(len(text) for text in sample)
+        started = time.perf_counter()
+        TextCleaningEngine().clean_batch(sample)
+        elapsed = time.perf_counter() - started
+        return characters / elapsed if elapsed > 0 else float("inf")
+
+    def handle(self, data: pd.DataFrame, column: str) -> pd.DataFrame:
+        """
+        Detect and handle outliers in a text column.
+        :param data: Input DataFrame.
+        :param column: Text column.
+        :return: Processed DataFrame.
+        """
+        stats = compute_document_stats(data[column])
+        violations = self.bounds.violations(stats)
+        result = self.strategy.handle(data, column, violations, self.bounds)
+
+        # Recompute statistics only for the documents the strategy rewrote
+        after = stats.loc[result.index].copy()
+        original = data.loc[result.index, column]
+        changed = np.fromiter((new is not old for new, old in zip(result[column], original)),
+                              dtype=bool, count=len(result))
+        if changed.any():
+            after.loc[changed] = compute_document_stats(result.loc[changed, column]).to_numpy()
+        chars_removed = int(stats["char_length"].sum() - after["char_length"].sum())
+        # Each distinct token of a document becomes one stored TF-IDF entry
+        nnz_removed = int(stats["unique_tokens"].sum() - after["unique_tokens"].sum())
+        self.report = {
+            "input_rows": len(data),
+            "output_rows": len(result),
+            "outliers": int(violations.any(axis=1).sum()),
+            **{reason: int(violations[reason].sum()) for reason in violations.columns},
+            "chars_removed": chars_removed,
+            "estimated_nnz_saved": nnz_removed,
+            "estimated_tfidf_mb_saved": nnz_removed * BYTES_PER_NNZ / 2 ** 20,
+            "estimated_text_mb_saved": chars_removed / 2 ** 20,
+        }
+        if chars_removed:
+            rate = self._cleaning_chars_per_second(result[column])
+            self.report["estimated_cleaning_seconds_saved"] = chars_removed / rate
+        logging.info(f"Outlier detection: {self.report['outliers']} of {len(data)} documents outside "
+                     f"bounds; removed {chars_removed} characters, about "
+                     f"{self.report['estimated_tfidf_mb_saved']:.1f} MB of TF-IDF entries and "
+                     f"{self.report.get('estimated_cleaning_seconds_saved', 0.0):.2f}s of cleaning.")
+        return result
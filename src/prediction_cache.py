@@ -0,0 +1,249 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+# URI of the text model last logged for deployment, written by
+# text_model_logger_step; clients of the deployed service version their caches on it
+DEPLOYED_MODEL_URI_PATH = ".cache/deployed_model_uri"
+# Rows kept in the SQLite tier by default; the oldest are pruned beyond it
+DEFAULT_MAX_DISK_ENTRIES = 100000
+# Puts between two prunes of the SQLite tier
+_DISK_PRUNE_INTERVAL = 1000
+
+
+def deployed_model_version(path: str = DEPLOYED_MODEL_URI_PATH) -> str:
+    """
+    Version of the model behind the deployed prediction service, from the
+    model URI recorded when it was logged for deployment.
+    :param path: File holding the model URI.
+    :return: Short hex digest of the URI, or "unknown" when none was recorded.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            uri = f.read().strip()
+    except FileNotFoundError:
+        return "unknown"
+    return hashlib.sha256(uri.encode("utf-8")).hexdigest()[:16]
+
+
+def record_deployed_model(model_uri: str, path: str = DEPLOYED_MODEL_URI_PATH) -> None:
+    """Record the URI of the model logged for deployment (see `deployed_model_version`)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(model_uri)
+    os.replace(tmp_path, path)
+
+
+def artifact_version(*paths: str) -> str:
+    """
+    Version string for a set of model artifact files, derived from their path,
+    size and modification time. It changes whenever a new model is written.
+    :param paths: Artifact file or directory paths. Missing paths are skipped.
+    :return: Short hex digest.
+    """
+    parts = []
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            parts.append(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class PredictionCache:
+    """
+    LRU cache of predictions keyed by a hash of the cleaned text and the model
+    version.
+
+    Entries are evicted by count, by estimated memory use and, optionally, by
+    age. An optional SQLite tier keeps entries across restarts, bounded by
+    `max_disk_entries` (oldest rows are pruned) and by `ttl_seconds`. When the
+    model version changes, all entries for older versions are dropped, so
+    each SQLite file should belong to a single model source.
+    Values must be JSON-serialisable.
+    """
+
+    def __init__(self, model_version: Union[str, Callable[[], str]], max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024, ttl_seconds: Optional[float] = None,
+                 disk_path: Optional[str] = None,
+                 max_disk_entries: Optional[int] = DEFAULT_MAX_DISK_ENTRIES):
+        """
+        :param model_version: Version string, or a callable returning the current
+            version that is checked on every access.
+        :param max_entries: Maximum number of in-memory entries.
+        :param max_bytes: Approximate upper bound on in-memory size.
+        :param ttl_seconds: Entries older than this are treated as misses.
+        :param disk_path: SQLite file for the persistent tier, disabled when None.
+        :param max_disk_entries: Maximum number of rows in the persistent tier,
+            unbounded when None.
+        """
+        self._version_provider = model_version if callable(model_version) else (lambda: model_version)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        # Pruning is amortised over puts, so the tier may briefly exceed its bound
+        self._prune_interval = min(_DISK_PRUNE_INTERVAL, max_disk_entries or _DISK_PRUNE_INTERVAL)
+        self._puts_since_prune = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = None
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, model_version TEXT, value TEXT, created REAL)")
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS predictions_created ON predictions (created)")
+        self.model_version = None
+        self._check_version()
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Drop expired rows and the oldest rows beyond `max_disk_entries`."""
+        self._puts_since_prune = 0
+        if self._db is None:
+            return
+        with self._db:
+            if self.ttl_seconds is not None:
+                self._db.execute("DELETE FROM predictions WHERE created < ?",
+                                 (time.time() - self.ttl_seconds,))
+            if self.max_disk_entries is not None:
+                self._db.execute(
+                    "DELETE FROM predictions WHERE key IN (SELECT key FROM predictions "
+                    "ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.max_disk_entries,))
+
+    def _check_version(self) -> str:
+        """Invalidate all entries if the model version changed."""
+        version = self._version_provider()
+        if version != self.model_version:
+            if self.model_version is not None:
+                logging.info(f"Model version changed to {version}; invalidating prediction cache.")
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM predictions WHERE model_version != ?", (version,))
+            self.model_version = version
+        return version
+
+    def _key(self, cleaned_text: str) -> str:
+        return hashlib.sha256(f"{self.model_version}\0{cleaned_text}".encode("utf-8")).hexdigest()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created > self.ttl_seconds
+
+    def _store(self, key: str, value: Any, created: float) -> None:
+        size = sys.getsizeof(key) + len(json.dumps(value)) + 64
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[2]
+        self._entries[key] = (value, created, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, cleaned_text: str) -> Optional[Any]:
+        """
+        Look up the cached prediction for a cleaned text.
+        :param cleaned_text: Output of the TextCleaningEngine.
+        :return: Cached value, or None on a miss.
+        """
+        with self._lock:
+            self._check_version()
+            key = self._key(cleaned_text)
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[1]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM predictions WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    value = json.loads(row[0])
+                    self._store(key, value, row[1])
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, cleaned_text: str, value: Any) -> None:
+        """
+        Cache the prediction for a cleaned text.
+        :param cleaned_text: Output of the TextCleaningEngine.
+        :param value: JSON-serialisable prediction.
+        """
+        with self._lock:
+            self._check_version()
+            key = self._key(cleaned_text)
+            created = time.time()
+            self._store(key, value, created)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                        (key, self.model_version, json.dumps(value), created))
+                self._puts_since_prune += 1
+                if self._puts_since_prune >= self._prune_interval:
+                    self._prune_disk()
+
+    def get_or_compute_many(self, cleaned_texts: Sequence[str],
+                            compute: Callable[[List[str]], Sequence[Any]]) -> List[Any]:
+        """
+        Return predictions for many cleaned texts. Misses are de-duplicated and
+        computed with a single `compute` call.
+        :param cleaned_texts: Outputs of the TextCleaningEngine.
+        :param compute: Function predicting a list of cleaned texts.
+        :return: Predictions in the order of `cleaned_texts`.
+        """
+        results: Dict[str, Any] = {}
+        missing: List[str] = []
+        seen = set()
+        for text in cleaned_texts:
+            if text in seen:
+                continue
+            seen.add(text)
+            value = self.get(text)
+            if value is None:
+                missing.append(text)
+            else:
+                results[text] = value
+        if missing:
+            for text, value in zip(missing, compute(missing)):
+                self.put(text, value)
+                results[text] = value
+        return [results[text] for text in cleaned_texts]
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
@@ -0,0 +1,115 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import joblib
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class ResourceRegistry:
+    """
+    Registry of expensive resources (stack lookups, model artifacts) that are
+    created on first use instead of at import time.
+    Each resource is loaded at most once per process and then shared.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """
+        Register a loader. Nothing is loaded until `get` is called.
+        :param name: Resource name.
+        :param loader: Zero-argument callable creating the resource.
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._values.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        Return a resource, loading it on first access.
+        :param name: Resource name.
+        :return: The loaded resource.
+        """
+        with self._lock:
+            if name not in self._values:
+                if name not in self._loaders:
+                    raise KeyError(f"No resource registered under '{name}'.")
+                logging.info(f"Loading resource '{name}'.")
+                self._values[name] = self._loaders[name]()
+            return self._values[name]
+
+    def is_registered(self, name: str) -> bool:
+        """Whether a loader is registered under `name`."""
+        return name in self._loaders
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether a resource has already been loaded."""
+        return name in self._values
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """
+        Drop loaded values so they are reloaded on next access.
+        :param name: Resource to drop, or None to drop all of them.
+        """
+        with self._lock:
+            if name is None:
+                self._values.clear()
+            else:
+                self._values.pop(name, None)
+
+
+def _experiment_tracker_name() -> str:
+    # Imported here so that importing this module never connects to ZenML
+    from zenml.client import Client
+
+    experiment_tracker = Client().active_stack.experiment_tracker
+    if experiment_tracker is None:
+        raise RuntimeError("The active ZenML stack has no experiment tracker.")
+    return experiment_tracker.name
+
+
+def _mlflow_tracking_uri() -> str:
+    # The active stack's tracker decides where runs go; outside a ZenML
+    # environment fall back to MLflow's own default
+    try:
+        from zenml.integrations.mlflow.mlflow_utils import get_tracking_uri
+
+        return get_tracking_uri()
+    except Exception:
+        import mlflow
+
+        return mlflow.get_tracking_uri()
+
+
+registry = ResourceRegistry()
+registry.register("experiment_tracker_name", _experiment_tracker_name)
+registry.register("mlflow_tracking_uri", _mlflow_tracking_uri)
+
+
+def experiment_tracker_name() -> str:
+    """Name of the active stack's experiment tracker, looked up on first use."""
+    return registry.get("experiment_tracker_name")
+
+
+def mlflow_tracking_uri() -> str:
+    """MLflow tracking URI of the active stack, looked up on first use."""
+    return registry.get("mlflow_tracking_uri")
+
+
+def load_artifact(path: str) -> Any:
+    """
+    Load a joblib artifact such as model.pkl or vectorizer.pkl on first use
+    and share it afterwards.
+    :param path: Artifact path.
+    :return: The unpickled object.
+    """
+    name = f"artifact:{path}"
+    if not registry.is_registered(name):
+        registry.register(name, lambda: joblib.load(path))
+    return registry.get(name)
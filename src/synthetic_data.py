@@ -0,0 +1,230 @@
+import logging
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Vocabulary used for synthetic news articles
+COMMON_WORDS = [
+    "news", "report", "event", "update", "story", "article", "source", "information",
+    "government", "politics", "election", "policy", "world", "local", "breaking",
+    "economy", "business", "market", "finance", "company", "stock", "trade",
+    "technology", "science", "research", "discovery", "innovation", "future",
+    "health", "medicine", "virus", "pandemic", "vaccine", "care", "doctor",
+    "sports", "game", "team", "player", "match", "score", "champion",
+    "entertainment", "movie", "music", "celebrity", "show", "art", "culture",
+    "people", "community", "life", "style", "food", "travel", "education",
+    "climate", "environment", "nature", "energy", "weather", "disaster",
+    "social", "media", "internet", "online", "platform", "user", "data",
+    "analysis", "study", "expert", "opinion", "view", "comment", "discussion",
+    "important", "significant", "key", "major", "new", "latest", "recent",
+    "true", "false", "fact", "fiction", "claim", "evidence", "proof", "verify"
+]
+
+
+MIN_WORDS = 10
+LENGTH_SPREAD = 50
+
+
+class LengthProfile:
+    """
+    Empirical class and length distribution of a reference corpus.
+    Synthetic rows draw a class with the reference class frequencies and then
+    a word count from the reference texts of that class.
+    """
+
+    def __init__(self, lengths_by_class: Dict[int, np.ndarray]):
+        """
+        :param lengths_by_class: Word counts of the reference texts, per class label.
+        """
+        lengths_by_class = {label: np.asarray(lengths, dtype=np.int64)
+                            for label, lengths in lengths_by_class.items() if len(lengths)}
+        if not lengths_by_class:
+            raise ValueError("The reference corpus has no texts.")
+        self.lengths_by_class = lengths_by_class
+        self.labels = np.array(sorted(lengths_by_class))
+        counts = np.array([len(lengths_by_class[label]) for label in self.labels], dtype=float)
+        self.class_probabilities = counts / counts.sum()
+
+    @staticmethod
+    def _word_counts(csv_path: str, text_column: str, target_column: Optional[str],
+                     chunk_size: int) -> Dict[int, list]:
+        columns = [text_column] + ([target_column] if target_column else [])
+        counts: Dict[int, list] = {}
+        for chunk in pd.read_csv(csv_path, usecols=columns, dtype={text_column: "str"},
+                                 chunksize=chunk_size):
+            lengths = chunk[text_column].fillna("").str.split().str.len().to_numpy()
+            labels = chunk[target_column].to_numpy() if target_column else np.zeros(len(chunk), dtype=int)
+            for label in np.unique(labels):
+                counts.setdefault(int(label), []).append(lengths[labels == label])
+        return counts
+
+    @classmethod
+    def from_csv(cls, csv_path: str, text_column: str = "text", target_column: str = "class",
+                 chunk_size: int = 50000) -> "LengthProfile":
+        """
+        Build a profile from a labelled CSV, read in chunks.
+        :param csv_path: Reference CSV with text and class columns.
+        :param text_column: Column holding the article text.
+        :param target_column: Column holding the class label.
+        :param chunk_size: Rows read per chunk.
+        """
+        counts = cls._word_counts(csv_path, text_column, target_column, chunk_size)
+        logging.info(f"Built length profile from {csv_path}.")
+        return cls({label: np.concatenate(parts) for label, parts in counts.items()})
+
+    @classmethod
+    def from_labelled_csvs(cls, csv_paths: Dict[int, str], text_column: str = "text",
+                           chunk_size: int = 50000) -> "LengthProfile":
+        """
+        Build a profile from one unlabelled CSV per class, such as True.csv and Fake.csv.
+        :param csv_paths: Mapping of class label to CSV path.
+        :param text_column: Column holding the article text.
+        :param chunk_size: Rows read per chunk.
+        """
+        lengths = {}
+        for label, csv_path in csv_paths.items():
+            parts = cls._word_counts(csv_path, text_column, None, chunk_size).get(0, [])
+            lengths[label] = np.concatenate(parts) if parts else np.array([], dtype=np.int64)
+        logging.info(f"Built length profile from {', '.join(csv_paths.values())}.")
+        return cls(lengths)
+
+    def sample(self, rng: np.random.Generator, size: int):
+        """
+        Draw class labels and word counts.
+        :param rng: NumPy random generator.
+        :param size: Number of rows.
+        :return: Tuple of (labels, word counts) arrays.
+        """
+        labels = rng.choice(self.labels, size=size, p=self.class_probabilities)
+        lengths = np.empty(size, dtype=np.int64)
+        for label in self.labels:
+            mask = labels == label
+            reference = self.lengths_by_class[label]
+            lengths[mask] = reference[rng.integers(0, len(reference), size=int(mask.sum()))]
+        return labels, np.maximum(lengths, 1)
+
+
+class SyntheticNewsGenerator:
+    """
+    Vectorised generator of synthetic articles.
+
+    Lengths, classes and word indices are drawn as whole arrays. The words of
+    a chunk are joined into one string (two at a time, through a table
+    of all word pairs), and document boundaries come from a cumulative sum of
+    word lengths, so the only per-document Python work is one slice.
+    Each text is capitalised and ends with a full stop.
+    """
+
+    # Word-pair tables grow with the square of the vocabulary size
+    MAX_PAIR_VOCABULARY = 256
+
+    def __init__(self, vocabulary: Sequence[str] = COMMON_WORDS, text_word_count: int = 150,
+                 profile: Optional[LengthProfile] = None, seed: Optional[int] = None):
+        """
+        :param vocabulary: Lowercase ASCII words to draw from.
+        :param text_word_count: Mean words per text when no profile is given;
+            lengths are uniform in text_word_count +/- 50, at least 10.
+        :param profile: Reference distribution of classes and lengths. Without
+            it, classes 0 (fake) and 1 (real) are equally likely.
+        :param seed: Seed for reproducible output; None draws a fresh sample.
+        """
+        self.text_word_count = text_word_count
+        self.profile = profile
+        self.rng = np.random.default_rng(seed)
+        if not all(word.isascii() for word in vocabulary):
+            raise ValueError("The vocabulary must be ASCII.")
+        self._words = np.array(list(vocabulary), dtype=object)
+        # Length of each word plus its separating space
+        self._word_lengths = np.array([len(word) + 1 for word in vocabulary], dtype=np.int64)
+        self._pairs = None
+        if len(vocabulary) <= self.MAX_PAIR_VOCABULARY:
+            self._pairs = np.array([f"{first} {second}" for first in vocabulary for second in vocabulary],
+                                   dtype=object)
+
+    def _sample_shape(self, size: int):
+        if self.profile is not None:
+            return self.profile.sample(self.rng, size)
+        lengths = self.rng.integers(self.text_word_count - LENGTH_SPREAD,
+                                    self.text_word_count + LENGTH_SPREAD + 1, size=size)
+        labels = self.rng.integers(0, 2, size=size)
+        return labels, np.maximum(lengths, MIN_WORDS)
+
+    def _join(self, words: np.ndarray) -> str:
+        """Equivalent to " ".join(vocabulary[words]), joining half as many parts."""
+        if self._pairs is None:
+            return " ".join(self._words[words].tolist())
+        even = len(words) - len(words) % 2
+        pairs = words[:even:2] * len(self._words) + words[1:even:2]
+        parts = self._pairs[pairs].tolist()
+        if even < len(words):
+            parts.append(self._words[words[-1]])
+        return " ".join(parts)
+
+    def generate(self, num_samples: int) -> pd.DataFrame:
+        """
+        Generate one DataFrame with 'text' and 'class' columns.
+        :param num_samples: Number of rows.
+        """
+        if num_samples <= 0:
+            return pd.DataFrame({"text": pd.Series(dtype=object), "class": pd.Series(dtype=int)})
+        labels, lengths = self._sample_shape(num_samples)
+        words = self.rng.integers(0, len(self._words), size=int(lengths.sum()), dtype=np.int32)
+
+        # Byte offset of the space after each document's last word
+        word_ends = np.cumsum(self._word_lengths[words]) - 1
+        doc_ends = word_ends[np.cumsum(lengths) - 1]
+        doc_starts = np.concatenate(([0], doc_ends[:-1] + 1))
+
+        text_bytes = bytearray(self._join(words), "ascii")
+        text_bytes += b" "
+        view = np.frombuffer(text_bytes, dtype=np.uint8)
+        first = view[doc_starts]
+        view[doc_starts] = np.where((first >= ord("a")) & (first <= ord("z")), first - 32, first)
+        view[doc_ends] = ord(".")
+        del view  # release the buffer export before decoding
+
+        raw = text_bytes.decode("ascii")
+        texts = [raw[start:end] for start, end in zip(doc_starts.tolist(), (doc_ends + 1).tolist())]
+        return pd.DataFrame({"text": texts, "class": labels})
+
+    def iter_chunks(self, num_samples: int, chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Yield `num_samples` rows as DataFrames of at most `chunk_size` rows,
+        so million-row load tests never hold the whole corpus.
+        :param num_samples: Total number of rows.
+        :param chunk_size: Rows per chunk.
+        """
+        for start in range(0, num_samples, chunk_size):
+            yield self.generate(min(chunk_size, num_samples - start))
+
+
+def generate_synthetic_news(num_samples: int = 100, text_word_count: int = 150,
+                            seed: Optional[int] = None,
+                            profile: Optional[LengthProfile] = None) -> pd.DataFrame:
+    """
+    Generate synthetic articles with 'text' and 'class' columns.
+    Each text has text_word_count +/- 50 words (at least 10) drawn from
+    COMMON_WORDS, and 'class' is 0 (fake) or 1 (real).
+    :param num_samples: Number of rows.
+    :param text_word_count: Mean number of words per text.
+    :param seed: Seed for reproducible output; None draws a fresh sample.
+    :param profile: Reference class and length distribution, overriding text_word_count.
+    :return: DataFrame with 'text' and 'class' columns.
+    """
+    return SyntheticNewsGenerator(text_word_count=text_word_count, profile=profile,
+                                  seed=seed).generate(num_samples)
+
+
+def iter_synthetic_news(num_samples: int, chunk_size: int = 100000, text_word_count: int = 150,
+                        seed: Optional[int] = None,
+                        profile: Optional[LengthProfile] = None) -> Iterator[pd.DataFrame]:
+    """
+    Streaming counterpart of generate_synthetic_news, yielding chunks of at
+    most `chunk_size` rows. Output is reproducible for a given seed and chunk size.
+    """
+    generator = SyntheticNewsGenerator(text_word_count=text_word_count, profile=profile, seed=seed)
+    return generator.iter_chunks(num_samples, chunk_size)
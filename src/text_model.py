@@ -0,0 +1,92 @@
+import logging
+import os
+from typing import List
+
+import joblib
+import mlflow
+import numpy as np
+import pandas as pd
+
+from src.data_clean import TextCleaningEngine
+from src.linear_scorer import build_fused_scorer
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+TEXT_COLUMN = "text"
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeNewsTextModel(mlflow.pyfunc.PythonModel):
+    """
+    MLflow pyfunc model that accepts raw article text.
+    Cleaning, sparse TF-IDF vectorization and classification all run inside
+    the model server, so clients only send the text itself.
+    """
+
+    def load_context(self, context):
+        """
+        Load the pickled vectorizer and classifier bundled with the model.
+        :param context: MLflow context holding the `vectorizer` and `model` artifact paths.
+        """
+        self.cleaner = TextCleaningEngine()
+        self.vectorizer = joblib.load(context.artifacts["vectorizer"])
+        self.model = joblib.load(context.artifacts["model"])
+        self.scorer = build_fused_scorer(self.vectorizer, self.model)
+
+    def predict(self, context, model_input, params=None) -> np.ndarray:
+        """
+        Predict labels for raw texts.
+        :param context: MLflow context (unused).
+        :param model_input: DataFrame with a 'text' column, or a sequence of strings.
+        :param params: Optional inference parameters (unused).
+        :return: Array of predicted class labels.
+        """
+        texts = self.cleaner.clean_batch(_extract_texts(model_input))
+        if self.scorer is not None:
+            return self.scorer.predict(texts)
+        # transform returns a sparse matrix, which the classifier scores directly
+        return self.model.predict(self.vectorizer.transform(texts))
+
+
+def _extract_texts(model_input) -> List[str]:
+    """Normalise the accepted pyfunc input shapes into a list of strings."""
+    if isinstance(model_input, pd.DataFrame):
+        if TEXT_COLUMN in model_input.columns:
+            return model_input[TEXT_COLUMN].astype(str).tolist()
+        return model_input.iloc[:, 0].astype(str).tolist()
+    if isinstance(model_input, pd.Series):
+        return model_input.astype(str).tolist()
+    if isinstance(model_input, str):
+        return [model_input]
+    return [str(text) for text in np.asarray(model_input).ravel()]
+
+
+def log_text_model(model, vectorizer, artifact_path: str = "text_model") -> str:
+    """
+    Log a FakeNewsTextModel bundling `model` and `vectorizer` to the active MLflow run.
+    :param model: Fitted classifier.
+    :param vectorizer: Fitted vectorizer the classifier was trained on.
+    :param artifact_path: Artifact path of the pyfunc model within the run.
+    :return: URI of the logged model.
+    """
+    import tempfile
+    from mlflow.models import infer_signature
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, "model.pkl")
+        vectorizer_path = os.path.join(tmp_dir, "vectorizer.pkl")
+        joblib.dump(model, model_path)
+        joblib.dump(vectorizer, vectorizer_path)
+        signature = infer_signature(
+            pd.DataFrame({TEXT_COLUMN: ["example article text"]}),
+            np.asarray(model.classes_[:1]))
+        model_info = mlflow.pyfunc.log_model(
+            artifact_path=artifact_path,
+            python_model=FakeNewsTextModel(),
+            artifacts={"model": model_path, "vectorizer": vectorizer_path},
+            code_paths=[SRC_DIR],
+            signature=signature,
+        )
+    logging.info(f"Logged text-in pyfunc model to {model_info.model_uri}.")
+    return model_info.model_uri
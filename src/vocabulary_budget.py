@@ -0,0 +1,110 @@
+import logging
+import pickle
+import time
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from src.feature_engineering import BudgetedTfidfFeatureEngineeringStrategy
+from src.feature_store import FeatureStore
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Largest accuracy loss, in absolute accuracy, accepted for a smaller model
+DEFAULT_TOLERANCE = 0.005
+# Share of the training rows held out to compare the budgets
+DEFAULT_VALIDATION_SIZE = 0.2
+
+
+def vocabulary_budget_report(corpus: pd.DataFrame, labels: np.ndarray,
+                             train_indices: np.ndarray, budgets: List[Optional[int]],
+                             min_df=2, max_df=0.95, selection: str = "chi2",
+                             validation_size: float = DEFAULT_VALIDATION_SIZE,
+                             random_state: int = 42,
+                             store: Optional[FeatureStore] = None) -> pd.DataFrame:
+    """
+    Train and evaluate one model per vocabulary budget on a validation split
+    of the training rows.
+
+    The budget is chosen from this report, so it is compared on rows held
+    out of the training rows, never on the test rows that measure the final
+    model. The first row is the full vocabulary (no pruning, as a bare
+    TfidfVectorizer), followed by one row per budget with document-frequency
+    pruning applied; a budget of None prunes without a size limit. The corpus
+    is tokenized once; throughput is measured by transforming the raw
+    validation texts with each rebuilt vectorizer, as serving does.
+
+    :param corpus: All documents, with a 'text' column.
+    :param labels: Class label of every corpus row.
+    :param train_indices: Positional indices of the training rows.
+    :param budgets: Vocabulary sizes to evaluate.
+    :param min_df: Lowest document frequency kept in budgeted rows.
+    :param max_df: Highest document frequency kept in budgeted rows.
+    :param selection: "chi2" or "frequency" selection down to the budget.
+    :param validation_size: Share of the training rows held out for validation.
+    :param random_state: Seed of the (stratified) validation split.
+    :param store: Feature store for the term counts, or None.
+    :return: DataFrame with one row per setting: budget, the min_df, max_df
+        and max_features that reproduce it, n_features, vectorizer_bytes,
+        model_bytes, transform_docs_per_second, accuracy and accuracy_drop
+        relative to the full vocabulary.
+    """
+    labels = np.asarray(labels)
+    fit_indices, validation_indices = train_test_split(
+        np.asarray(train_indices), test_size=validation_size, random_state=random_state,
+        stratify=labels[train_indices])
+    strategy = BudgetedTfidfFeatureEngineeringStrategy(
+        store, corpus, min_df=1, max_df=1.0, selection=selection, labels=labels)
+    validation_texts = corpus['text'].iloc[validation_indices]
+    y_fit, y_validation = labels[fit_indices], labels[validation_indices]
+
+    rows = []
+    for budget in [None, *budgets]:
+        full = not rows
+        if not full:
+            strategy.min_df, strategy.max_df = min_df, max_df
+        strategy.max_features = budget
+        xv_fit, xv_validation = strategy.fit_transform_split(corpus, fit_indices, validation_indices)
+        model = LogisticRegression()
+        model.fit(xv_fit, y_fit)
+
+        # Serving transforms raw text with the rebuilt vectorizer
+        vectorizer = strategy.get_vectorizer()
+        started = time.perf_counter()
+        vectorizer.transform(validation_texts)
+        elapsed = time.perf_counter() - started
+        rows.append({
+            "budget": "full" if full else str(budget if budget is not None else "pruned"),
+            "min_df": strategy.min_df,
+            "max_df": strategy.max_df,
+            "max_features": budget,
+            "n_features": xv_fit.shape[1],
+            "vectorizer_bytes": len(pickle.dumps(vectorizer)),
+            "model_bytes": len(pickle.dumps(model)),
+            "transform_docs_per_second": (len(validation_texts) / elapsed
+                                          if elapsed > 0 else float("inf")),
+            "accuracy": accuracy_score(y_validation, model.predict(xv_validation)),
+        })
+        logging.info(f"Vocabulary budget {rows[-1]['budget']}: {rows[-1]['n_features']} terms, "
+                     f"accuracy {rows[-1]['accuracy']:.4f}.")
+    report = pd.DataFrame(rows)
+    report["accuracy_drop"] = report.loc[0, "accuracy"] - report["accuracy"]
+    return report
+
+
+def select_budget(report: pd.DataFrame, tolerance: float = DEFAULT_TOLERANCE) -> pd.Series:
+    """
+    Pick the smallest model (vectorizer plus classifier bytes) whose accuracy
+    is within `tolerance` of the full vocabulary.
+    :param report: Output of vocabulary_budget_report.
+    :param tolerance: Largest accepted accuracy drop, in absolute accuracy.
+    :return: The selected report row.
+    """
+    eligible = report[report["accuracy_drop"] <= tolerance]
+    size = eligible["vectorizer_bytes"] + eligible["model_bytes"]
+    return eligible.loc[size.idxmin()]
@@ -1,15 +1,31 @@
+import os
+from typing import Dict, List, Optional
+
 import pandas as pd
 from src.data_ingest import DataIngestorFactory
 from zenml import step
+from src.instrumentation import instrument_step
 
 
 @step
-def data_ingestion_step(file_path: str) -> pd.DataFrame:
-    """Ingest data from a file path and return a DataFrame."""
+@instrument_step
+def data_ingestion_step(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+    cache_dir: Optional[str] = None,
+) -> pd.DataFrame:
+    """Ingest data from a file path and return a DataFrame.
+
+    Only `columns` are read when given, with explicit `dtype`s instead of type
+    inference. When `cache_dir` is set, CSV files are converted to Parquet
+    once and later runs read the cached copy.
+    """
     # Determine the file extension
-    file_extension = ".csv"
+    file_extension = os.path.splitext(file_path)[1].lower()
     # Get the appropriate data ingestor
-    data_ingestor = DataIngestorFactory.get_data_ingestor(file_extension)
+    data_ingestor = DataIngestorFactory.get_data_ingestor(
+        file_extension, columns=columns, dtype=dtype, cache_dir=cache_dir)
     # Ingest the data
     df = data_ingestor.ingest(file_path)
     return df
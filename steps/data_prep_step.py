@@ -7,18 +7,28 @@ from src.data_prep import (
     AddClassColumn,
     ConcatenateDataFrames,
     DropColumns,
+    RemoveDuplicateDocuments,
     ResetIndex
 )
+from src.instrumentation import instrument_step
 
 
 @step
-def data_prep_step(true_raw_df: pd.DataFrame, fake_raw_df: pd.DataFrame) -> pd.DataFrame:
+@instrument_step
+def data_prep_step(true_raw_df: pd.DataFrame, fake_raw_df: pd.DataFrame,
+                   deduplicate: bool = True,
+                   near_duplicate_threshold: float = 0.8,
+                   conflicting_labels: str = "drop") -> pd.DataFrame:
     """
     Prepares the raw true and fake news DataFrames using strategies
     from src.data_prep.py.
     - Adds 'class' column (1 to true_raw_df, 0 to fake_raw_df).
     - Concatenates the DataFrames.
     - Drops 'title', 'subject', 'date' columns.
+    - Removes exact and near-duplicate articles (MinHash/LSH) if `deduplicate`,
+      so copies cannot leak between the train and test splits. Groups of
+      copies labelled both true and fake are dropped entirely, unless
+      `conflicting_labels` is "keep_first".
     - Resets the index.
     """
     print("Data preparation step (using src.data_prep): Starting...")
@@ -54,8 +64,16 @@ def data_prep_step(true_raw_df: pd.DataFrame, fake_raw_df: pd.DataFrame) -> pd.D
             data_frame_to_concatenate=processed_fake_df))
         # Strategy to drop columns
         columns_to_drop = ['title', 'subject', 'date']
+        # Columns may already have been pruned at ingestion
         main_preparation_context.add_strategy(
-            DropColumns(columns_to_drop=columns_to_drop))
+            DropColumns(columns_to_drop=columns_to_drop, errors="ignore"))
+        # Strategy to drop syndicated copies and re-posts
+        deduplication = None
+        if deduplicate:
+            deduplication = RemoveDuplicateDocuments(
+                text_column="text", threshold=near_duplicate_threshold,
+                conflicting_labels=conflicting_labels)
+            main_preparation_context.add_strategy(deduplication)
         # Strategy to reset index
         main_preparation_context.add_strategy(ResetIndex())
 
@@ -64,6 +82,8 @@ def data_prep_step(true_raw_df: pd.DataFrame, fake_raw_df: pd.DataFrame) -> pd.D
             processed_true_df)
 
         print("Data preparation strategies from src.data_prep applied successfully.")
+        if deduplication is not None:
+            print(f"Duplicate removal: {deduplication.report}")
         print(
             f"Shape after all data_prep_step strategies: {final_prepared_df.shape}")
         # print(final_prepared_df.head()) # Avoid for large data
@@ -1,21 +1,40 @@
 from zenml import step
+import numpy as np
 import pandas as pd
-from src.data_splitter import DataSplitter, SimpleTrainTestSplitStrategy
+from src.data_splitter import (
+    DataSplitter,
+    SimpleTrainTestSplitStrategy,
+    StratifiedTrainTestSplitStrategy,
+)
+from src.instrumentation import instrument_step
 
 
 @step
+@instrument_step
 def data_splitter_step(
     df: pd.DataFrame,
-    text_column: str = "text",
     target_column: str = "class",
     test_size: float = 0.25,
     random_state: int = 42,
-) -> tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:  # Updated return type
-    """Splits the data into training and testing sets."""
+    strategy: str = "random",
+) -> tuple[np.ndarray, np.ndarray, pd.Series, pd.Series]:
+    """
+    Splits the data into positional training and testing row indices.
 
-    splitter = DataSplitter(
-        strategy=SimpleTrainTestSplitStrategy(test_size=test_size, random_state=random_state))
+    No text is copied: later steps slice `df`, or a feature matrix built once
+    over all rows, with the returned indices. `strategy` selects "random"
+    (same split as train_test_split) or "stratified" (class proportions kept).
+    """
+    if strategy == "random":
+        split_strategy = SimpleTrainTestSplitStrategy(test_size=test_size, random_state=random_state)
+    elif strategy == "stratified":
+        split_strategy = StratifiedTrainTestSplitStrategy(test_size=test_size, random_state=random_state)
+    else:
+        raise ValueError(
+            f"Unknown split strategy '{strategy}'. Use 'random' or 'stratified'.")
 
-    X_train, X_test, y_train, y_test = splitter.split(
-        df, text_column, target_column)
-    return X_train, X_test, y_train, y_test
+    splitter = DataSplitter(strategy=split_strategy)
+    train_indices, test_indices = splitter.split_indices(df, target_column)[0]
+    y = df[target_column]
+    print(f"Data splitter step: {len(train_indices)} training and {len(test_indices)} test rows ({strategy}).")
+    return train_indices, test_indices, y.iloc[train_indices], y.iloc[test_indices]
@@ -1,68 +1,50 @@
 import pandas as pd
 from zenml import step
 import logging
-import random
-import string
+from typing import Optional
+from src.synthetic_data import LengthProfile, generate_synthetic_news
+from src.instrumentation import instrument_step
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
-def generate_random_text(length: int) -> str:
-    """Generates a random string of words."""
-    words = [''.join(random.choices(string.ascii_lowercase,
-                     k=random.randint(3, 10))) for _ in range(length)]
-    return " ".join(words).capitalize() + "."
-
-
 @step
-def dynamic_importer(num_samples: int = 100, text_word_count: int = 150) -> pd.DataFrame:
+@instrument_step
+def dynamic_importer(num_samples: int = 100, text_word_count: int = 150,
+                     seed: Optional[int] = None,
+                     reference_csv_path: Optional[str] = None,
+                     true_csv_path: Optional[str] = None,
+                     fake_csv_path: Optional[str] = None) -> pd.DataFrame:
     """
     Generates synthetic batch data for inference.
     The data will have 'text' and 'class' columns.
     'class' will be 0 (fake) or 1 (real).
+
+    Parameters:
+    num_samples (int): Number of rows to generate.
+    text_word_count (int): Mean words per text, used without a reference corpus.
+    seed (Optional[int]): Seed for reproducible batches.
+    reference_csv_path (Optional[str]): Labelled CSV ('text' and 'class' columns)
+        whose class balance and text lengths the batch should mimic.
+    true_csv_path, fake_csv_path (Optional[str]): Unlabelled per-class CSVs
+        with a 'text' column, such as data/True.csv and data/Fake.csv, used as
+        the reference corpus (class 1 and 0) when both are given.
     """
     logger.info(
         f"Starting synthetic data generation for {num_samples} samples...")
 
-    data = []
-
-    # More diverse vocabulary for text generation
-    common_words = [
-        "news", "report", "event", "update", "story", "article", "source", "information",
-        "government", "politics", "election", "policy", "world", "local", "breaking",
-        "economy", "business", "market", "finance", "company", "stock", "trade",
-        "technology", "science", "research", "discovery", "innovation", "future",
-        "health", "medicine", "virus", "pandemic", "vaccine", "care", "doctor",
-        "sports", "game", "team", "player", "match", "score", "champion",
-        "entertainment", "movie", "music", "celebrity", "show", "art", "culture",
-        "people", "community", "life", "style", "food", "travel", "education",
-        "climate", "environment", "nature", "energy", "weather", "disaster",
-        "social", "media", "internet", "online", "platform", "user", "data",
-        "analysis", "study", "expert", "opinion", "view", "comment", "discussion",
-        "important", "significant", "key", "major", "new", "latest", "recent",
-        "true", "false", "fact", "fiction", "claim", "evidence", "proof", "verify"
-    ]
-
-    for i in range(num_samples):
-        # Generate random text
-        current_text_word_count = random.randint(
-            text_word_count - 50, text_word_count + 50)
-        if current_text_word_count < 10:  # Ensure a minimum length
-            current_text_word_count = 10
-
-        text_words = random.choices(common_words, k=current_text_word_count)
-        text = " ".join(text_words).capitalize() + "."
-
-        # Assign a class label (0 for fake, 1 for real)
-        news_class = random.choice([0, 1])
-
-        data.append({
-            'text': text,
-            'class': news_class
-        })
-
-    batch_df = pd.DataFrame(data)
+    if reference_csv_path and (true_csv_path or fake_csv_path):
+        raise ValueError("Give either reference_csv_path or true_csv_path and fake_csv_path.")
+    if bool(true_csv_path) != bool(fake_csv_path):
+        raise ValueError("true_csv_path and fake_csv_path must be given together.")
+    profile = None
+    if reference_csv_path:
+        profile = LengthProfile.from_csv(reference_csv_path)
+    elif true_csv_path:
+        profile = LengthProfile.from_labelled_csvs({1: true_csv_path, 0: fake_csv_path})
+    batch_df = generate_synthetic_news(
+        num_samples=num_samples, text_word_count=text_word_count, seed=seed, profile=profile)
     logger.info(
         f"Successfully generated {len(batch_df)} synthetic data records with 'text' and 'class' columns.")
     logger.debug(
@@ -1,35 +1,87 @@
 from zenml import step
+import numpy as np
 import pandas as pd
-from typing import Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Optional, Tuple, Union
+from sklearn.base import BaseEstimator
 from scipy.sparse import csr_matrix  # Import csr_matrix
-from src.feature_engineering import TfidfFeatureEngineeringStrategy
+from src.feature_engineering import (
+    BudgetedTfidfFeatureEngineeringStrategy,
+    HashingFeatureEngineeringStrategy,
+    StoredTfidfFeatureEngineeringStrategy,
+    compact_csr,
+)
+from src.feature_store import FeatureStore
+from src.instrumentation import instrument_step
 
 
 @step
+@instrument_step
 def feature_engineering_step(
-    x_train: pd.DataFrame,  # This will be a Series after data cleaning
-    x_test: pd.DataFrame,  # This will be a Series after data cleaning
-) -> Tuple[TfidfVectorizer, csr_matrix, csr_matrix]:  # Adjusted return types for sparse matrices
+    data: pd.DataFrame,
+    train_indices: np.ndarray,
+    test_indices: np.ndarray,
+    text_column: str = "text",
+    target_column: str = "class",
+    strategy: str = "tfidf",
+    n_features: int = 2 ** 20,
+    use_idf: bool = True,
+    n_jobs: int = 1,
+    min_df: Union[int, float] = 2,
+    max_df: Union[int, float] = 0.95,
+    max_features: Optional[int] = None,
+    feature_selection: str = "frequency",
+    dtype: str = "float32",
+    feature_store_dir: Optional[str] = None,
+) -> Tuple[BaseEstimator, csr_matrix, csr_matrix]:  # Adjusted return types for sparse matrices
     """
-    Performs feature engineering on the training and test text data using a strategy pattern.
+    Performs feature engineering on the training and test rows of `data` using a strategy pattern.
+
+    Every row is tokenized or hashed once and the resulting matrix is sliced
+    with `train_indices` and `test_indices`; vocabulary and IDF weights are
+    fitted on the training rows only.
+
+    `strategy` selects "tfidf" (fitted vocabulary), "budgeted" (vocabulary
+    pruned to [`min_df`, `max_df`] and cut to `max_features` terms by
+    frequency or chi², see `feature_selection`) or "hashing" (stateless
+    hashing into `n_features` columns, optionally IDF-reweighted and hashed
+    across `n_jobs` workers).
+    Matrices hold `dtype` values ("float32" halves memory and artifact size
+    against "float64") with int32 index arrays where they fit; the returned
+    vectorizer produces the same dtype at serving time.
+    With `feature_store_dir`, TF-IDF term counts of the whole corpus are also
+    reused across runs, so a new split only recomputes the vocabulary and IDF weights.
     """
-    print("Feature engineering step: Performing Feature Engineering")
+    print(f"Feature engineering step: Performing Feature Engineering ({strategy})")
 
-    tfidf_strategy = TfidfFeatureEngineeringStrategy()
+    corpus = data[[text_column]].rename(columns={text_column: "text"})
+    store = FeatureStore(feature_store_dir) if feature_store_dir else None
+    value_type = np.dtype(dtype).type
+    if strategy == "tfidf":
+        feature_strategy = StoredTfidfFeatureEngineeringStrategy(store, corpus, dtype=value_type)
+    elif strategy == "budgeted":
+        feature_strategy = BudgetedTfidfFeatureEngineeringStrategy(
+            store, corpus, min_df=min_df, max_df=max_df, max_features=max_features,
+            selection=feature_selection, labels=data[target_column].to_numpy(),
+            dtype=value_type)
+    elif strategy == "hashing":
+        feature_strategy = HashingFeatureEngineeringStrategy(
+            n_features=n_features, use_idf=use_idf, n_jobs=n_jobs, dtype=value_type)
+    else:
+        raise ValueError(
+            f"Unknown feature strategy '{strategy}'. Use 'tfidf', 'budgeted' or 'hashing'.")
 
     try:
-       # Fit and transform the training data
-        xv_train = tfidf_strategy.fit_transform(x_train)
-        # Transform the test data
-        xv_test = tfidf_strategy.transform(x_test)
+        # Fit on the training rows and transform both splits
+        xv_train, xv_test = feature_strategy.fit_transform_split(
+            corpus, train_indices, test_indices)
+        xv_train, xv_test = compact_csr(xv_train, value_type), compact_csr(xv_test, value_type)
 
         # Get the fitted vectorizer
-        vectorizer = tfidf_strategy.get_vectorizer()
-        print("Feature engineering step: TF-IDF transformation complete.")
+        vectorizer = feature_strategy.get_vectorizer()
+        print("Feature engineering step: transformation complete.")
     except Exception as e:
         print(
-            f"Feature engineering step: Error during TF-IDF transformation: {e}")
+            f"Feature engineering step: Error during feature transformation: {e}")
 
         raise
     return vectorizer, xv_train, xv_test
@@ -0,0 +1,88 @@
+from typing import Any, Dict, List, Optional
+
+import mlflow
+import pandas as pd
+from zenml import step
+from src.data_splitter import KFoldSplitStrategy, StratifiedTrainTestSplitStrategy
+from src.feature_engineering import StoredTfidfFeatureEngineeringStrategy
+from src.feature_store import FeatureStore
+from src.hyperparameter_search import HyperparameterSearch, results_frame
+from src.instrumentation import instrument_step
+
+
+# The experiment tracker is attached at pipeline composition time
+@step(enable_cache=False)
+@instrument_step
+def hyperparameter_search_step(
+    data: pd.DataFrame,
+    text_column: str = "text",
+    target_column: str = "class",
+    param_grid: Optional[Dict[str, List[Any]]] = None,
+    n_iter: Optional[int] = None,
+    n_splits: int = 3,
+    test_size: float = 0.25,
+    random_state: int = 42,
+    n_jobs: int = -1,
+    work_dir: Optional[str] = ".cache/search",
+    feature_store_dir: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Searches TF-IDF and LogisticRegression parameters on term counts computed once.
+
+    Args:
+        data: Cleaned DataFrame with text and target columns
+        param_grid: Candidate values per parameter (`C`, `solver`, `min_df`,
+            `max_df`, `sublinear_tf`, ...); a default grid when None
+        n_iter: Number of random settings sampled from the grid (all when None)
+        n_splits: Number of stratified folds, or 1 for a single split of `test_size`
+        n_jobs: Number of worker processes sharing the memory-mapped counts
+        work_dir: Where the shared memory-mapped arrays are written
+        feature_store_dir: Feature store reused for the term counts (disabled when None)
+
+    Returns:
+        One row per trial with its parameters, accuracy and fit time, best first.
+        Trials with parameters the estimator rejects are kept as failed rows
+        (NaN accuracy and an error message). Every trial is also logged as a
+        nested MLflow run.
+    """
+    print(f"Hyperparameter search step: counting terms of {len(data)} documents")
+
+    corpus = data[[text_column]].rename(columns={text_column: "text"})
+    store = FeatureStore(feature_store_dir) if feature_store_dir else None
+    entry = StoredTfidfFeatureEngineeringStrategy(store, corpus).entry
+    # Stored rows follow the corpus that first wrote the entry; align them with `data`
+    counts = entry.counts[entry.rows(corpus["text"])]
+    if n_splits > 1:
+        split_strategy = KFoldSplitStrategy(n_splits=n_splits, random_state=random_state)
+    else:
+        split_strategy = StratifiedTrainTestSplitStrategy(test_size=test_size, random_state=random_state)
+    splits = split_strategy.split_indices(data, target_column)
+
+    search = HyperparameterSearch(param_grid=param_grid, n_iter=n_iter, n_jobs=n_jobs,
+                                  random_state=random_state)
+    results = []
+    if not mlflow.active_run():
+        mlflow.start_run()
+    try:
+        for result in search.iter_results(counts, data[target_column].to_numpy(), splits, work_dir):
+            results.append(result)
+            with mlflow.start_run(run_name=f"trial-{result['trial']}", nested=True):
+                mlflow.log_params(result["params"])
+                if result["error"]:
+                    mlflow.set_tag("error", result["error"])
+                    print(f"Trial {result['trial']} failed: {result['error']} {result['params']}")
+                    continue
+                mlflow.log_metrics({name: result[name] for name in
+                                    ("accuracy", "accuracy_std", "fit_seconds", "n_features")})
+            print(f"Trial {result['trial']}: accuracy={result['accuracy']:.4f} "
+                  f"fit={result['fit_seconds']:.2f}s {result['params']}")
+        frame = results_frame(results)
+        succeeded = [result for result in results if not result["error"]]
+        if succeeded:
+            best = next(result for result in succeeded if result["trial"] == frame.loc[0, "trial"])
+            mlflow.log_params({f"best_{name}": value for name, value in best["params"].items()})
+            mlflow.log_metric("best_accuracy", best["accuracy"])
+    finally:
+        mlflow.end_run()
+    print(f"Hyperparameter search complete: {len(results)} trials")
+    return frame
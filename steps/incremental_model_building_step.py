@@ -0,0 +1,61 @@
+from typing import Annotated
+
+import mlflow
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.linear_model import SGDClassifier
+from zenml import ArtifactConfig, step
+from zenml.enums import ArtifactType
+from src.incremental_training import (IncrementalLogisticTrainer, iter_matrix_chunks,
+                                      matrix_fingerprint)
+from src.instrumentation import instrument_step
+
+from steps.model_building_step import model
+
+
+# The experiment tracker is attached at pipeline composition time
+@step(enable_cache=False, model=model)
+@instrument_step
+def incremental_model_building_step(
+    xv_train: csr_matrix,
+    y_train: pd.Series,
+    chunk_size: int = 10000,
+    epochs: int = 5,
+    alpha: float = 1e-5,
+    checkpoint_path: str = ".cache/checkpoints/incremental_model.joblib",
+) -> Annotated[SGDClassifier, ArtifactConfig(name="fake_news_detector_model", artifact_type=ArtifactType.MODEL)]:
+    """
+    Trains a logistic-loss SGD classifier with partial_fit over row chunks of
+    the training matrix, logging per-chunk loss to MLflow and checkpointing
+    so an interrupted run can resume.
+
+    The training matrix is an in-memory step input, so this step is not
+    out-of-core: chunking bounds the work per update and enables resuming.
+    Training on data larger than memory streams the file instead; see
+    `run_incremental_training.py`.
+    """
+    print("Incremental model building step: Training SGD logistic model")
+
+    if not isinstance(y_train, pd.Series):
+        raise ValueError("y_train must be a pandas Series")
+    if xv_train.shape[0] == 0 or y_train.empty:
+        raise ValueError("Training data is empty")
+
+    y = y_train.to_numpy()
+    fingerprint = matrix_fingerprint(xv_train, y, chunk_size)
+    if not mlflow.active_run():
+        mlflow.start_run()
+
+    try:
+        mlflow.log_params({"trainer": "sgd_log_loss", "chunk_size": chunk_size,
+                           "epochs": epochs, "alpha": alpha})
+        trainer = IncrementalLogisticTrainer(
+            classes=np.unique(y), epochs=epochs, alpha=alpha,
+            checkpoint_path=checkpoint_path, fingerprint=fingerprint,
+            metrics_callback=lambda metrics, step: mlflow.log_metrics(metrics, step=step))
+        trained_model = trainer.fit(
+            lambda epoch: iter_matrix_chunks(xv_train, y, chunk_size, epoch=epoch))
+    finally:
+        mlflow.end_run()
+    return trained_model
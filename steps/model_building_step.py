@@ -1,5 +1,4 @@
 from zenml.enums import ArtifactType
-from zenml.client import Client
 from zenml import ArtifactConfig, step
 from sklearn.linear_model import LogisticRegression
 import pandas as pd
@@ -8,9 +7,7 @@ import mlflow
 from typing import Annotated
 import logging
 from zenml import Model
-
-
-experiment_tracker = Client().active_stack.experiment_tracker
+from src.instrumentation import instrument_step
 
 
 model = Model(
@@ -21,7 +18,11 @@ model = Model(
 )
 
 
-@step(enable_cache=False, experiment_tracker=experiment_tracker.name, model=model)
+# The experiment tracker is attached at pipeline composition time via
+# `.with_options(experiment_tracker=experiment_tracker_name())`, so importing
+# this module does not need a ZenML client connection.
+@step(enable_cache=False, model=model)
+@instrument_step
 def model_building_step(xv_train: csr_matrix, y_train: pd.Series) -> Annotated[LogisticRegression, ArtifactConfig(name="fake_news_detector_model", artifact_type=ArtifactType.MODEL)]:
     """
     Trains a Logistic Regression model on the transformed training data.
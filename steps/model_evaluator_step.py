@@ -1,36 +1,65 @@
 import logging
-from typing import Tuple
+from typing import Any, Dict, Tuple
 
+import mlflow
 import pandas as pd
 from scipy.sparse import csr_matrix  # Import csr_matrix
-from sklearn.linear_model import LogisticRegression
+from sklearn.base import ClassifierMixin
 from zenml import step
-from src.model_evaluator import ModelEvaluator, RegressionModelEvaluatorStrategy
+from src.model_evaluator import ModelEvaluator, StreamingModelEvaluatorStrategy
+from src.instrumentation import instrument_step
 
 
+# The experiment tracker is attached at pipeline composition time
 @step(enable_cache=False)
+@instrument_step
 def model_evaluator_step(
-    trained_model: LogisticRegression,
+    trained_model: ClassifierMixin,
     xv_test: csr_matrix,  # Changed to csr_matrix
-    y_test: pd.Series
-) -> Tuple[float, str]:  # Return accuracy and classification report separately
+    y_test: pd.Series,
+    chunk_size: int = 10000,
+    n_bins: int = 1000
+) -> Tuple[float, str, Dict[str, Any]]:
     """
-    Evaluates the trained model using the specified evaluation strategy.
+    Evaluates the trained model on the test set in row chunks.
+
+    The test matrix is a materialized step input, built by the feature
+    engineering step, so memory is bounded only beyond it: scores,
+    predictions and metric state grow with `chunk_size`, not with the test
+    set. Test sets larger than memory are evaluated outside the pipeline
+    with StreamingModelEvaluatorStrategy.evaluate_chunks over a lazy source.
 
     Args:
-        model (LogisticRegression): The trained logistic regression model.
-        x_test (pd.DataFrame): The test features.
+        trained_model (ClassifierMixin): The trained classifier (LogisticRegression or SGDClassifier).
+        xv_test (csr_matrix): The test features.
         y_test (pd.Series): The true labels for the test set.
+        chunk_size (int): Rows scored at a time; bounds the memory used for scoring.
+        n_bins (int): Probability histogram bins used for ROC-AUC and PR-AUC.
 
     Returns:
-        dict: A dictionary containing evaluation metrics.
+        The accuracy, the classification report, and a dictionary of all
+        metrics: accuracy, log_loss, roc_auc, pr_auc, per_class precision,
+        recall and f1, confusion_matrix, rows_per_second and chunk latency
+        percentiles. Scalar metrics are logged to MLflow, the full dictionary
+        as `evaluation_metrics.json`.
     """
     logging.info("Initializing the model evaluator.")
-    evaluator = ModelEvaluator(strategy=RegressionModelEvaluatorStrategy())
+    evaluator = ModelEvaluator(strategy=StreamingModelEvaluatorStrategy(
+        chunk_size=chunk_size, n_bins=n_bins))
 
     logging.info("Evaluating the model.")
     metrics = evaluator.evaluate(trained_model, xv_test, y_test)
     accuracy = metrics["accuracy"]
-    classification_rep = metrics["classification_report"]
+    classification_rep = metrics.pop("classification_report")
+
+    if not mlflow.active_run():
+        mlflow.start_run()
+    try:
+        mlflow.log_metrics({f"evaluation/{name}": value for name, value in metrics.items()
+                            if isinstance(value, (int, float))})
+        mlflow.log_dict(metrics, "evaluation_metrics.json")
+        mlflow.log_text(classification_rep, "classification_report.txt")
+    finally:
+        mlflow.end_run()
 
-    return accuracy, classification_rep
+    return accuracy, classification_rep, metrics
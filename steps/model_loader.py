@@ -1,6 +1,7 @@
 from zenml import step, Model
 from sklearn.linear_model import LogisticRegression
 import logging
+from src.instrumentation import instrument_step
 # from typing import Any # Or a more specific model type like sklearn.base.BaseEstimator, tensorflow.keras.Model, etc.
 
 # Configure logging
@@ -9,6 +10,7 @@ logger = logging.getLogger(__name__)
 
 @step
 # -> Any: Add return type hint
+@instrument_step
 def model_loader(model_name: str) -> LogisticRegression:
     """
     Loads a pre-trained model from the model registry.
@@ -1,20 +1,45 @@
 from zenml import step
 import joblib
-from sklearn.linear_model import LogisticRegression
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.feature_extraction.text import TfidfVectorizer
+from src.model_artifacts import (DEFAULT_BLOCK_SIZE, artifact_bytes, remove_artifacts,
+                                  save_mmap_artifacts, save_quantized_artifacts)
 # For type hinting, can be LogisticRegression or TfidfVectorizer
-from typing import Union
+from typing import Optional, Union
+from src.instrumentation import instrument_step
 
 
 @step
+@instrument_step
 def model_serializer_step(
-    model: LogisticRegression,
-    vectorizer: TfidfVectorizer,
+    model: ClassifierMixin,
+    vectorizer: BaseEstimator,
     model_path: str = "model.pkl",
-    vectorizer_path: str = "vectorizer.pkl"
+    vectorizer_path: str = "vectorizer.pkl",
+    mmap_artifacts_dir: Optional[str] = None,
+    quantize: Optional[str] = None,
+    quantized_artifacts_dir: str = "model_artifacts_quantized",
+    quantize_block_size: int = DEFAULT_BLOCK_SIZE,
+    fidelity_data: Optional[pd.DataFrame] = None,
+    fidelity_indices: Optional[np.ndarray] = None,
+    text_column: str = "text",
+    fidelity_sample_size: int = 5000
 ) -> None:
     """
     Serializes (saves) the trained model and the TF-IDF vectorizer to disk.
+    When `mmap_artifacts_dir` is set, the pair is also exported as flat
+    memory-mappable arrays (see src.model_artifacts). If that export is
+    skipped or fails, the directory is removed so that servers fall back to
+    the pickles instead of an older model.
+    When `quantize` is "int8" or "int16", a compact quantized export is
+    written to `quantized_artifacts_dir`. It is checked against the float
+    model on a sample of the held-out rows `fidelity_indices` of
+    `fidelity_data`, and the fidelity report is saved in it as
+    fidelity.json. The directory is replaced only once the export and its
+    report are complete. A failed quantized export fails the step, since it
+    was explicitly requested.
     """
     print("Model serializer step: Saving model and vectorizer")
 
@@ -38,4 +63,37 @@ def model_serializer_step(
         except Exception as e:
             print(f"Error saving vectorizer to {vectorizer_path}: {e}")
 
+    # Servers prefer `mmap_artifacts_dir` over the pickles whenever it exists,
+    # so an export from an earlier model is removed when this one is not written
+    if mmap_artifacts_dir and (model is None or not isinstance(vectorizer, TfidfVectorizer)):
+        print("Memory-mappable artifacts need a model and a TfidfVectorizer; skipping export.")
+        remove_artifacts(mmap_artifacts_dir)
+    elif mmap_artifacts_dir:
+        try:
+            save_mmap_artifacts(model, vectorizer, mmap_artifacts_dir)
+            print(f"Memory-mappable artifacts saved to {mmap_artifacts_dir}")
+        except Exception as e:
+            print(f"Error saving memory-mappable artifacts to {mmap_artifacts_dir}: {e}")
+            remove_artifacts(mmap_artifacts_dir)
+
+    if quantize and not isinstance(vectorizer, TfidfVectorizer):
+        raise ValueError("Quantized artifacts need a TfidfVectorizer; "
+                         "disable artifact quantization for this feature strategy.")
+    elif quantize and model is not None:
+        sample = []
+        if fidelity_data is not None and fidelity_indices is not None:
+            fidelity_data = fidelity_data.iloc[fidelity_indices]
+        if fidelity_data is not None and len(fidelity_data):
+            sample = fidelity_data.sample(n=min(fidelity_sample_size, len(fidelity_data)),
+                                          random_state=0)[text_column].fillna("").tolist()
+        try:
+            report = save_quantized_artifacts(
+                model, vectorizer, quantized_artifacts_dir, dtype=quantize,
+                block_size=quantize_block_size, fidelity_texts=sample,
+                report={"float_artifact_bytes": artifact_bytes(model_path, vectorizer_path)})
+            print(f"{quantize} quantized artifacts saved to {quantized_artifacts_dir}: {report}")
+        except Exception as e:
+            print(f"Error saving quantized artifacts to {quantized_artifacts_dir}: {e}")
+            raise
+
     print("Model and vectorizer serialization step complete.")
@@ -1,26 +1,57 @@
+from typing import Optional
+
 from zenml import step
 import pandas as pd
+from src.instrumentation import instrument_step
+from src.outlier_detection import (
+    DropOutliers,
+    FlagOutliers,
+    OutlierBounds,
+    OutlierDetector,
+    TruncateOutliers,
+)
 
 
 @step
-def outlier_detection_step(data: pd.DataFrame, column_name: str) -> pd.DataFrame:
+@instrument_step
+def outlier_detection_step(
+    data: pd.DataFrame,
+    column_name: str,
+    action: str = "truncate",
+    max_chars: Optional[int] = 100000,
+    min_tokens: Optional[int] = 5,
+    max_tokens: Optional[int] = 15000,
+    max_non_alpha_ratio: Optional[float] = 0.5,
+    max_repetition_ratio: Optional[float] = 0.9,
+) -> pd.DataFrame:
     """
-    Detects and handles outliers in the specified column.
-    TODO: Determine if and how outlier detection is applicable for your text features.
-          This step is more common for numerical features. If using numerical representations
-          of text (e.g., certain embedding properties or derived metrics), it might be relevant.
-          Otherwise, this step might be removed or significantly adapted.
+    Detects and handles pathological documents in the specified text column,
+    such as huge scraped pages, markup dumps and repeated boilerplate, before
+    they dominate cleaning time and TF-IDF size.
+
+    Args:
+        data: Input DataFrame
+        column_name: Column containing the document text
+        action: "drop" removes outliers, "truncate" shortens over-long documents
+            and drops the rest, "flag" only adds is_outlier/outlier_reasons columns
+        max_chars, min_tokens, max_tokens, max_non_alpha_ratio, max_repetition_ratio:
+            Document bounds; None disables a bound
+
+    Returns:
+        DataFrame with outliers handled
     """
-    print(f"Outlier detection step: Processing column '{column_name}'")
-    # Placeholder: returning data as is
-    # Replace with actual outlier detection and handling logic if applicable
-    # Example for numerical data (conceptual):
-    # Q1 = data[column_name].quantile(0.25)
-    # Q3 = data[column_name].quantile(0.75)
-    # IQR = Q3 - Q1
-    # lower_bound = Q1 - 1.5 * IQR
-    # upper_bound = Q3 + 1.5 * IQR
-    # data_cleaned = data[(data[column_name] >= lower_bound) & (data[column_name] <= upper_bound)]
-    print(
-        f"Warning: Placeholder outlier detection for column '{column_name}'. Returning data as is.")
-    return data
+    print(f"Outlier detection step: Processing column '{column_name}' (action={action})")
+
+    strategies = {"drop": DropOutliers, "truncate": TruncateOutliers, "flag": FlagOutliers}
+    if action not in strategies:
+        raise ValueError(
+            f"Unknown outlier action '{action}'. Use 'drop', 'truncate' or 'flag'.")
+
+    bounds = OutlierBounds(
+        max_chars=max_chars, min_tokens=min_tokens, max_tokens=max_tokens,
+        max_non_alpha_ratio=max_non_alpha_ratio, max_repetition_ratio=max_repetition_ratio)
+    detector = OutlierDetector(strategies[action](), bounds)
+    result = detector.handle(data, column_name)
+
+    print(f"Outlier detection report: {detector.report}")
+    return result
@@ -1,9 +1,11 @@
 from zenml import step
 from zenml.integrations.mlflow.model_deployers import MLFlowModelDeployer
 from zenml.integrations.mlflow.services import MLFlowDeploymentService
+from src.instrumentation import instrument_step
 
 
 @step(enable_cache=False)
+@instrument_step
 def prediction_service_loader(pipeline_name: str, step_name: str) -> MLFlowDeploymentService:
     """Get the prediction service started by the deployment pipeline"""
 
@@ -1,22 +1,30 @@
-import joblib
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 from zenml import step
 from zenml.integrations.mlflow.services import MLFlowDeploymentService
-
-vectorizer = joblib.load('vectorizer.pkl')
+from src.data_clean import TextCleaningEngine
+from src.prediction_cache import PredictionCache
+from src.instrumentation import instrument_step
 
 
 @step(enable_cache=False)
+@instrument_step
 def predictor(
     service: MLFlowDeploymentService,
     input_data: pd.DataFrame,
+    cache_path: Optional[str] = None,
 ) -> np.ndarray:
     """Run an inference request against a prediction service.
 
+    The deployed model is a text-in pyfunc (see src.text_model) that cleans and
+    vectorizes on the server, so only the raw text is sent.
+
     Args:
         service (MLFlowDeploymentService): The deployed MLFlow service for prediction.
         input_data (pd.DataFrame): DataFrame containing text data for prediction.
+        cache_path (str, optional): SQLite file that keeps predictions across runs.
 
     Returns:
         np.ndarray: The model's prediction.
@@ -30,20 +38,16 @@ def predictor(
         raise ValueError(
             "Input data must contain a 'text' column for prediction")
 
-    # Extract just the text column for prediction
-    texts = input_data['text'].values
-
-    # Create a text processing pipeline similar to what was used in training
-    # This should match the vectorization process used during model training
-
-    # Transform the text data
-    X_vectorized = vectorizer.transform(texts)
-
-    # Convert to array format if needed
-    # Some MLFlow models expect dense arrays
-    X_array = X_vectorized.toarray()
-
-    # Run the prediction with vectorized data
-    prediction = service.predict(X_array)
+    # Duplicate articles are scored once. Cached results are reused until the
+    # service is pointed at a different model URI.
+    cache = PredictionCache(model_version=str(service.config.model_uri),
+                            max_entries=max(len(input_data), 1), disk_path=cache_path)
+    cleaned_texts = TextCleaningEngine().clean_batch(input_data['text'].astype(str))
+
+    # Send only the text; vectorization happens inside the model server
+    prediction = np.asarray(cache.get_or_compute_many(
+        cleaned_texts,
+        lambda texts: service.predict(pd.DataFrame({'text': texts})).tolist()))
+    print(f"Predictor: prediction cache stats {cache.stats()}")
 
     return prediction
@@ -1,29 +1,52 @@
+from typing import Optional
+
 from zenml import step
 import pandas as pd
-from src.data_clean import TextCleaner
+from src.data_clean import CLEANER_VERSION, TextCleaningEngine
+from src.feature_store import FeatureStore
+from src.instrumentation import instrument_step
 
 
 @step
-def text_cleaning_step(data: pd.DataFrame, text_column: str) -> pd.DataFrame:
+@instrument_step
+def text_cleaning_step(
+    data: pd.DataFrame,
+    text_column: str,
+    n_jobs: int = 1,
+    chunk_size: int = 10000,
+    feature_store_dir: Optional[str] = None,
+) -> pd.DataFrame:
     """
-    Cleans text data in the specified column using TextCleaner.
+    Cleans text data in the specified column using TextCleaningEngine.
 
     Args:
         data: Input DataFrame containing text to clean
         text_column: Column containing text to clean
+        n_jobs: Number of worker processes (1 = serial, -1 = all cores)
+        chunk_size: Number of rows cleaned per worker task
+        feature_store_dir: Feature store reused across runs for identical
+            input data and cleaner version (disabled when None)
 
     Returns:
         DataFrame with cleaned text
     """
-    print(f"Cleaning text in column: {text_column}")
+    print(f"Cleaning text in column: {text_column} (n_jobs={n_jobs})")
 
     # Create a copy to avoid modifying the original
     result = data.copy()
 
-    # Apply the TextCleaner to the specified column
-    result[text_column] = result[text_column].apply(
-        lambda text: TextCleaner(text).clean_text().get_cleaned_text()
-    )
+    store = FeatureStore(feature_store_dir) if feature_store_dir else None
+    cleaned = store.get_cleaned(result[text_column], CLEANER_VERSION) if store else None
+    if cleaned is None:
+        # Clean the whole column with the compiled engine, chunked across
+        # processes when n_jobs > 1
+        cleaned = TextCleaningEngine().clean_series(
+            result[text_column], n_jobs=n_jobs, chunk_size=chunk_size)
+        if store:
+            store.put_cleaned(result[text_column], CLEANER_VERSION, cleaned)
+    else:
+        print("Reusing cleaned text from the feature store")
+    result[text_column] = cleaned
 
     print("Text cleaning complete")
     return result
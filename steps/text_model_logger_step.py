@@ -0,0 +1,32 @@
+from typing import Annotated
+
+import mlflow
+from sklearn.base import BaseEstimator, ClassifierMixin
+from zenml import step
+from src.prediction_cache import record_deployed_model
+from src.text_model import log_text_model
+from src.instrumentation import instrument_step
+
+
+# The experiment tracker is attached at pipeline composition time
+@step(enable_cache=False)
+@instrument_step
+def text_model_logger_step(
+    model: ClassifierMixin,
+    vectorizer: BaseEstimator,
+    artifact_path: str = "text_model",
+) -> Annotated[str, "text_model_uri"]:
+    """
+    Logs a text-in MLflow pyfunc model that bundles the cleaner, vectorizer
+    and classifier, so the deployed service accepts raw article text.
+    The model URI is recorded for clients that cache the service's predictions.
+    """
+    print("Text model logger step: Logging pyfunc model")
+    if not mlflow.active_run():
+        mlflow.start_run()
+    try:
+        model_uri = log_text_model(model, vectorizer, artifact_path=artifact_path)
+    finally:
+        mlflow.end_run()
+    record_deployed_model(model_uri)
+    return model_uri
@@ -0,0 +1,88 @@
+from typing import List, Optional, Tuple, Union
+
+import mlflow
+import numpy as np
+import pandas as pd
+from zenml import step
+from src.feature_store import FeatureStore
+from src.instrumentation import instrument_step
+from src.vocabulary_budget import (
+    DEFAULT_TOLERANCE,
+    DEFAULT_VALIDATION_SIZE,
+    select_budget,
+    vocabulary_budget_report,
+)
+
+
+# The experiment tracker is attached at pipeline composition time
+@step(enable_cache=False)
+@instrument_step
+def vocabulary_budget_step(
+    data: pd.DataFrame,
+    train_indices: np.ndarray,
+    budgets: List[int],
+    text_column: str = "text",
+    target_column: str = "class",
+    min_df: Union[int, float] = 2,
+    max_df: Union[int, float] = 0.95,
+    feature_selection: str = "chi2",
+    tolerance: float = DEFAULT_TOLERANCE,
+    validation_size: float = DEFAULT_VALIDATION_SIZE,
+    random_state: int = 42,
+    feature_store_dir: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Union[int, float], Union[int, float], Optional[int]]:
+    """
+    Compares model size, transform throughput and accuracy across vocabulary budgets.
+
+    Args:
+        data: Cleaned DataFrame with text and target columns
+        train_indices: Positional indices of the training rows; budgets are
+            compared on a validation split of these rows, not on the test rows
+        budgets: Vocabulary sizes to evaluate after document-frequency pruning
+        min_df: Lowest document frequency kept (count, or proportion if float)
+        max_df: Highest document frequency kept (count, or proportion if float)
+        feature_selection: "chi2" or "frequency" selection down to each budget
+        tolerance: Largest accepted accuracy drop against the full vocabulary
+        validation_size: Share of the training rows held out for validation
+        random_state: Seed of the validation split
+        feature_store_dir: Feature store reused for the term counts (disabled when None)
+
+    Returns:
+        The report (one row per budget, full vocabulary first) and the
+        `min_df`, `max_df` and `max_features` of the smallest model within
+        `tolerance`, to be passed to the "budgeted" feature strategy. The
+        full vocabulary is returned as (1, 1.0, None), i.e. no pruning.
+    """
+    print(f"Vocabulary budget step: evaluating budgets {budgets} ({feature_selection})")
+
+    corpus = data[[text_column]].rename(columns={text_column: "text"})
+    store = FeatureStore(feature_store_dir) if feature_store_dir else None
+    report = vocabulary_budget_report(
+        corpus, data[target_column].to_numpy(), train_indices, budgets,
+        min_df=min_df, max_df=max_df, selection=feature_selection,
+        validation_size=validation_size, random_state=random_state, store=store)
+    selected = select_budget(report, tolerance)
+    max_features = None if pd.isna(selected["max_features"]) else int(selected["max_features"])
+    # The full vocabulary row is fitted without document-frequency pruning
+    selected_min_df, selected_max_df = (1, 1.0) if selected["budget"] == "full" else (min_df, max_df)
+
+    if not mlflow.active_run():
+        mlflow.start_run()
+    try:
+        for index, row in report.iterrows():
+            mlflow.log_metrics({
+                "vocabulary_budget/n_features": row["n_features"],
+                "vocabulary_budget/model_size_bytes": row["vectorizer_bytes"] + row["model_bytes"],
+                "vocabulary_budget/transform_docs_per_second": row["transform_docs_per_second"],
+                "vocabulary_budget/accuracy": row["accuracy"],
+            }, step=index)
+        mlflow.log_table(report, artifact_file="vocabulary_budget_report.json")
+        mlflow.log_params({"vocabulary_budget_selected": selected["budget"],
+                           "vocabulary_budget_tolerance": tolerance})
+    finally:
+        mlflow.end_run()
+
+    print(report.to_string(index=False))
+    print(f"Selected vocabulary budget: {selected['budget']} ({selected['n_features']} terms, "
+          f"accuracy drop {selected['accuracy_drop']:.4f})")
+    return report, selected_min_df, selected_max_df, max_features
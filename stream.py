@@ -1,23 +1,29 @@
 import streamlit as st
 import requests
 import json
-import joblib
 from time import sleep
+from src.data_clean import TextCleaningEngine
+from src.prediction_cache import PredictionCache, deployed_model_version
 
 # MUST be the first Streamlit command
 st.set_page_config(page_title="Fake News Detector",
                    page_icon="📰", layout="centered")
 
-# Load vectorizer
+# Cache predictions by cleaned text. The version follows the model logged
+# for deployment, which is the one the prediction service answers with, so
+# redeploying invalidates it. This app keeps its own SQLite file because the
+# local app versions its cache on different artifacts.
 
 
 @st.cache_resource
-def load_vectorizer():
-    vectorizer = joblib.load('vectorizer.pkl')
-    return vectorizer
+def load_prediction_cache():
+    return PredictionCache(
+        model_version=deployed_model_version,
+        disk_path=".cache/predictions-deployed.sqlite")
 
 
-vectorizer = load_vectorizer()
+prediction_cache = load_prediction_cache()
+cleaner = TextCleaningEngine()
 
 # Sidebar info
 st.sidebar.title("About")
@@ -36,20 +42,15 @@ news_input = st.text_area("News Article Text", height=250,
 # Function to call the deployed model
 
 
-def predict_with_deployed_model(text, vectorizer):
+def predict_with_deployed_model(text):
     # The URL should match what's printed in the run_deployment.py output
     prediction_url = "http://127.0.0.1:8000/invocations"
 
-    # First, vectorize the text
-    vectorized_text = vectorizer.transform([text])
-
-    # Convert to array format
-    vectorized_array = vectorized_text.toarray()
-
-    # Format the request as expected by MLflow serving
+    # The deployed model is text-in: cleaning and vectorization run on the
+    # server, so only the raw article is sent
     headers = {"Content-Type": "application/json"}
     request_data = {
-        "inputs": vectorized_array.tolist()
+        "dataframe_records": [{"text": text}]
     }
 
     try:
@@ -94,8 +95,16 @@ if st.button("🔍 Check News"):
         with st.spinner("Analyzing the news..."):
             sleep(1)  # Simulate processing delay
 
-            # Vectorize and predict using the deployed model
-            prediction = predict_with_deployed_model(news_input, vectorizer)
+            # Predict using the deployed model, reusing cached results for
+            # articles that clean to the same text. The service cleans the
+            # raw article itself; the cleaned text is only the cache key.
+            # Failed calls are not cached.
+            cleaned_input = cleaner.clean(news_input)
+            prediction = prediction_cache.get(cleaned_input)
+            if prediction is None:
+                prediction = predict_with_deployed_model(news_input)
+                if prediction is not None:
+                    prediction_cache.put(cleaned_input, prediction)
 
         if prediction is not None:
             try:
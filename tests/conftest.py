@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+# Make `src` importable when pytest is run from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def corpus() -> pd.DataFrame:
+    """Small labelled corpus: random shared words plus a few class-specific ones."""
+    rng = np.random.default_rng(0)
+    shared = [f"word{index}" for index in range(200)]
+    cues = {0: ["delta", "epsilon", "zeta"], 1: ["alpha", "beta", "gamma"]}
+    rows = []
+    for index in range(400):
+        label = index % 2
+        words = list(rng.choice(shared, size=rng.integers(5, 40))) + list(rng.choice(cues[label], size=3))
+        rng.shuffle(words)
+        rows.append({"text": " ".join(words), "class": label})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="session")
+def fitted(corpus):
+    """TfidfVectorizer and binary LogisticRegression fitted on the first 300 rows."""
+    vectorizer = TfidfVectorizer(sublinear_tf=True)
+    model = LogisticRegression()
+    model.fit(vectorizer.fit_transform(corpus["text"].iloc[:300]), corpus["class"].iloc[:300])
+    return model, vectorizer
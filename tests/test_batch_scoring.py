@@ -0,0 +1,111 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.batch_scoring import BatchScorer
+from src.data_clean import TextCleaningEngine
+
+
+@pytest.fixture
+def artifacts(fitted, tmp_path):
+    model, vectorizer = fitted
+    model_path, vectorizer_path = tmp_path / "model.pkl", tmp_path / "vectorizer.pkl"
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+    return str(model_path), str(vectorizer_path)
+
+
+@pytest.fixture
+def articles(corpus, tmp_path):
+    path = tmp_path / "articles.csv"
+    corpus.assign(id=np.arange(len(corpus)) * 10)[["id", "text"]].to_csv(path, index=False)
+    return str(path)
+
+
+def _scorer(artifacts, **kwargs):
+    return BatchScorer(*artifacts, id_column="id", chunk_size=50, **kwargs)
+
+
+def test_scores_match_the_model(corpus, fitted, artifacts, articles, tmp_path):
+    model, vectorizer = fitted
+    output = str(tmp_path / "scores.csv")
+    stats = _scorer(artifacts).score_file(articles, output)
+    result = pd.read_csv(output)
+    assert stats["rows_scored"] == len(corpus)
+    np.testing.assert_array_equal(result["row"], np.arange(len(corpus)))
+    np.testing.assert_array_equal(result["id"], np.arange(len(corpus)) * 10)
+    cleaned = TextCleaningEngine().clean_batch(corpus["text"])
+    expected = model.predict_proba(vectorizer.transform(cleaned))
+    np.testing.assert_allclose(result[["probability_0", "probability_1"]], expected, rtol=1e-12)
+
+
+def test_resume_continues_after_the_last_recorded_chunk(artifacts, articles, tmp_path):
+    expected_path = str(tmp_path / "expected.csv")
+    _scorer(artifacts).score_file(articles, expected_path, resume=False)
+
+    output = str(tmp_path / "scores.csv")
+    scorer = _scorer(artifacts)
+
+    class Interrupt(Exception):
+        pass
+
+    def stop_after_two_chunks(rows, total, seconds):
+        if rows >= 100:
+            raise Interrupt()
+
+    with pytest.raises(Interrupt):
+        scorer.score_file(articles, output, progress=stop_after_two_chunks)
+    # A partial line written after the last recorded chunk is discarded
+    with open(output, "a", encoding="utf-8") as f:
+        f.write("999,partial")
+    with open(scorer.progress_path(output), encoding="utf-8") as f:
+        assert json.load(f)["rows"] == 100
+
+    stats = scorer.score_file(articles, output)
+    assert stats["rows_skipped"] == 100 and stats["rows_total"] == 400
+    pd.testing.assert_frame_equal(pd.read_csv(output), pd.read_csv(expected_path))
+
+
+def test_parallel_scoring_matches_serial(artifacts, articles, tmp_path):
+    serial, parallel = str(tmp_path / "serial.csv"), str(tmp_path / "parallel.csv")
+    _scorer(artifacts).score_file(articles, serial)
+    _scorer(artifacts, n_jobs=2).score_file(articles, parallel)
+    pd.testing.assert_frame_equal(pd.read_csv(parallel), pd.read_csv(serial))
+
+
+def _interrupted_run(scorer, articles, output):
+    class Interrupt(Exception):
+        pass
+
+    def stop_after_one_chunk(rows, total, seconds):
+        raise Interrupt()
+
+    with pytest.raises(Interrupt):
+        scorer.score_file(articles, output, progress=stop_after_one_chunk)
+
+
+def test_resume_refuses_a_modified_input(corpus, artifacts, articles, tmp_path):
+    output = str(tmp_path / "scores.csv")
+    scorer = _scorer(artifacts)
+    _interrupted_run(scorer, articles, output)
+    corpus.iloc[::-1].assign(id=0)[["id", "text"]].to_csv(articles, index=False)
+    with pytest.raises(ValueError, match="changed since the interrupted run"):
+        scorer.score_file(articles, output)
+    stats = scorer.score_file(articles, output, resume=False)
+    assert stats["rows_skipped"] == 0 and (pd.read_csv(output)["id"] == 0).all()
+
+
+def test_existing_output_without_progress_is_not_overwritten(artifacts, articles, tmp_path):
+    output = tmp_path / "scores.csv"
+    output.write_text("unrelated,data\n1,2\n", encoding="utf-8")
+    scorer = _scorer(artifacts)
+    with pytest.raises(ValueError, match="without a progress file"):
+        scorer.score_file(articles, str(output))
+    assert output.read_text(encoding="utf-8") == "unrelated,data\n1,2\n"
+
+    # An empty output is simply written
+    output.write_text("", encoding="utf-8")
+    assert scorer.score_file(articles, str(output))["rows_scored"] == 400
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import joblib
+import numpy as np
+import pytest
+
+from src.batching_server import InferenceServer, MicroBatcher, load_batch_predictor
+from src.data_clean import TextCleaningEngine
+from src.model_artifacts import save_mmap_artifacts
+
+
+def _echo_batches(sizes):
+    def predict_batch(texts):
+        sizes.append(len(texts))
+        return [{"text": text} for text in texts]
+    return predict_batch
+
+
+async def _submit_all(batcher, texts):
+    task = asyncio.create_task(batcher.run())
+    await asyncio.sleep(0)
+    try:
+        return await asyncio.gather(*(batcher.submit(text) for text in texts), return_exceptions=True)
+    finally:
+        task.cancel()
+
+
+def test_concurrent_requests_are_batched_in_order():
+    sizes = []
+    batcher = MicroBatcher(_echo_batches(sizes), max_batch_size=4, max_wait_ms=50)
+    texts = [f"text {index}" for index in range(10)]
+    results = asyncio.run(_submit_all(batcher, texts))
+    assert [result["text"] for result in results] == texts
+    assert sizes == [4, 4, 2]
+    assert (batcher.batches, batcher.requests) == (3, 10)
+
+
+def test_a_failed_batch_fails_each_of_its_requests():
+    def fail(texts):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(fail, max_batch_size=2, max_wait_ms=1)
+    results = asyncio.run(_submit_all(batcher, ["a", "b"]))
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_batch_predictor_matches_the_model(corpus, fitted, tmp_path, mmap):
+    model, vectorizer = fitted
+    joblib.dump(model, tmp_path / "model.pkl")
+    joblib.dump(vectorizer, tmp_path / "vectorizer.pkl")
+    if mmap:
+        save_mmap_artifacts(model, vectorizer, str(tmp_path / "model_artifacts"))
+    predict_batch = load_batch_predictor(str(tmp_path / "model.pkl"), str(tmp_path / "vectorizer.pkl"),
+                                         mmap_artifacts_dir=str(tmp_path / "model_artifacts"))
+    texts = corpus["text"].iloc[300:].str.upper().tolist()
+    results = predict_batch(texts)
+    probabilities = model.predict_proba(vectorizer.transform(TextCleaningEngine().clean_batch(texts)))
+    assert [result["prediction"] for result in results] == model.classes_[probabilities.argmax(axis=1)].tolist()
+    np.testing.assert_allclose([result["probability"] for result in results], probabilities.max(axis=1))
+
+
+def test_http_predict_and_health():
+    async def exchange():
+        batcher = MicroBatcher(lambda texts: [{"prediction": len(text)} for text in texts], max_wait_ms=1)
+        batch_task = asyncio.create_task(batcher.run())
+        server = await asyncio.start_server(InferenceServer(batcher)._handle, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        responses = []
+        for request in (b'POST /predict HTTP/1.1\r\nContent-Length: 16\r\n\r\n{"text": "abcd"}',
+                        b'POST /predict HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}',
+                        b'GET /health HTTP/1.1\r\nConnection: close\r\n\r\n'):
+            writer.write(request)
+            status = (await reader.readline()).decode()
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            body = await reader.readexactly(int(headers["content-length"]))
+            responses.append((status.split(" ", 2)[1], json.loads(body)))
+        writer.close()
+        server.close()
+        batch_task.cancel()
+        return responses
+
+    ok, bad_request, health = asyncio.run(exchange())
+    assert ok == ("200", {"prediction": 4})
+    assert bad_request[0] == "400"
+    assert health == ("200", {"status": "ok", "requests": 1, "batches": 1})
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from src.data_clean import TextCleaner, TextCleaningEngine
+
+DOCUMENTS = [
+    "",
+    "Plain text",
+    "Breaking: [Reuters] Markets FELL 3% today!\nMore at https://example.com/a?b=1 or www.example.org.",
+    "<p>Hello <b>world</b></p> it's   spaced\n\nout",
+    "Words with digits: abc123 9am covid19 and 2024, plus a[b]c <unclosed",
+    "Ünïcödé café — “quotes” and emoji 🙂 stay",
+    "http://only.url",
+    "tabs\tand\r\ncarriage returns",
+]
+
+
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_engine_matches_reference_cleaner(text):
+    expected = TextCleaner(text).clean_text().get_cleaned_text()
+    assert TextCleaningEngine().clean(text) == expected
+
+
+def test_clean_batch_keeps_order():
+    engine = TextCleaningEngine()
+    assert engine.clean_batch(DOCUMENTS) == [engine.clean(text) for text in DOCUMENTS]
+
+
+
+def test_parallel_clean_series_matches_serial():
+    series = pd.Series(DOCUMENTS * 3, index=range(100, 100 + 3 * len(DOCUMENTS)), name="text")
+    engine = TextCleaningEngine()
+    serial = engine.clean_series(series)
+    parallel = engine.clean_series(series, n_jobs=2, chunk_size=4)
+    pd.testing.assert_series_equal(parallel, serial)
+    assert parallel.index.equals(series.index)
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_clean_series_rejects_non_positive_chunk_size(chunk_size):
+    with pytest.raises(ValueError, match="chunk_size"):
+        TextCleaningEngine().clean_series(pd.Series(DOCUMENTS), n_jobs=2, chunk_size=chunk_size)
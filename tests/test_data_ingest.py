@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_ingest import DataIngestorFactory
+
+
+def test_cached_csv_keeps_missing_text_and_prunes_columns(tmp_path):
+    path = tmp_path / "news.CSV"
+    pd.DataFrame({"text": ["a b", None, "c"], "extra": [1, 2, 3], "class": [0, 1, 0]}).to_csv(path, index=False)
+    cache_dir = str(tmp_path / "cache")
+    expected = pd.read_csv(path, usecols=["text", "class"], dtype={"text": str})
+    for _ in range(2):
+        df = DataIngestorFactory.get_data_ingestor(
+            str(path), columns=["text", "class"], dtype={"text": str}, cache_dir=cache_dir).ingest(str(path))
+        assert df["text"].isna().tolist() == [False, True, False]
+        pd.testing.assert_frame_equal(df.fillna(""), expected.fillna(""))
+    assert len(os.listdir(cache_dir)) == 1
+
+
+@pytest.mark.filterwarnings("ignore::pandas.errors.DtypeWarning")
+def test_cached_csv_stores_mixed_object_columns(tmp_path):
+    # read_csv infers types per block, so a long file can yield ints and strings in one column
+    n_rows = 300000
+    codes = np.arange(n_rows).astype(str)
+    codes[-1] = "x"
+    path = tmp_path / "news.csv"
+    pd.DataFrame({"text": "a b", "code": codes, "class": np.arange(n_rows) % 2}).to_csv(path, index=False)
+    cache_dir = str(tmp_path / "cache")
+    df = DataIngestorFactory.get_data_ingestor(
+        str(path), columns=["code", "class"], cache_dir=cache_dir).ingest(str(path))
+    assert len(df) == n_rows and df["code"].iloc[-1] == "x" and df["code"].iloc[0] == "0"
+    assert [name for name in os.listdir(cache_dir) if name.endswith(".parquet")]
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from src.data_prep import RemoveDuplicateDocuments
+
+
+def _article(seed, n_words=60):
+    return " ".join(f"word{(seed * 7919 + index * 104729) % 5003}" for index in range(n_words))
+
+
+def test_exact_and_near_duplicates_keep_the_first_copy():
+    original, other = _article(1), _article(2)
+    near_copy = original.replace(original.split()[-1], "changed")
+    data = pd.DataFrame({
+        "text": [original, other, "  " + original.upper() + " ", near_copy, _article(3)],
+        "class": [1, 0, 1, 1, 0],
+    }, index=[10, 11, 12, 13, 14])
+    strategy = RemoveDuplicateDocuments()
+    result = strategy.handle(data)
+    assert result.index.tolist() == [10, 11, 14]
+    assert strategy.report == {"input_rows": 5, "exact_duplicates": 1, "near_duplicates": 1,
+                               "conflicting_label_groups": 0, "conflicting_label_rows": 0,
+                               "output_rows": 3}
+
+
+def test_exact_duplicates_with_conflicting_labels_are_dropped():
+    data = pd.DataFrame({"text": [_article(1)] * 100 + [_article(2)], "class": [1] * 50 + [0] * 50 + [1]})
+    strategy = RemoveDuplicateDocuments()
+    result = strategy.handle(data)
+    assert result.index.tolist() == [100]
+    assert strategy.report["conflicting_label_groups"] == 1
+    assert strategy.report["conflicting_label_rows"] == 100
+
+
+def test_near_duplicates_with_conflicting_labels_are_dropped():
+    original = _article(1)
+    near_copy = original.replace(original.split()[0], "changed")
+    data = pd.DataFrame({"text": [original, near_copy, _article(2)], "class": [1, 0, 0]})
+    assert RemoveDuplicateDocuments().handle(data).index.tolist() == [2]
+
+
+def test_conflicting_groups_can_keep_their_first_row():
+    data = pd.DataFrame({"text": [_article(1)] * 4, "class": [0, 1, 1, 0]})
+    strategy = RemoveDuplicateDocuments(conflicting_labels="keep_first")
+    assert strategy.handle(data).index.tolist() == [0]
+    assert strategy.report["conflicting_label_groups"] == 1
+
+
+def test_unknown_conflict_handling_is_rejected():
+    with pytest.raises(ValueError):
+        RemoveDuplicateDocuments(conflicting_labels="vote")
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.data_splitter import (
+    KFoldSplitStrategy,
+    SimpleTrainTestSplitStrategy,
+    StratifiedTrainTestSplitStrategy,
+)
+
+
+def _frame(n_rows=1000, positive_share=0.2):
+    labels = (np.arange(n_rows) < n_rows * positive_share).astype(int)
+    return pd.DataFrame({"text": [f"doc {index}" for index in range(n_rows)], "class": labels})
+
+
+def test_simple_split_matches_train_test_split():
+    df = _frame()
+    train_indices, test_indices = SimpleTrainTestSplitStrategy(0.25, 42).split_indices(df, "class")[0]
+    expected_train, expected_test = train_test_split(np.arange(len(df)), test_size=0.25, random_state=42)
+    np.testing.assert_array_equal(train_indices, expected_train)
+    np.testing.assert_array_equal(test_indices, expected_test)
+
+
+def test_stratified_split_keeps_class_proportions():
+    df = _frame()
+    train_indices, test_indices = StratifiedTrainTestSplitStrategy(0.25, 0).split_indices(df, "class")[0]
+    assert len(np.intersect1d(train_indices, test_indices)) == 0
+    assert len(train_indices) + len(test_indices) == len(df)
+    labels = df["class"].to_numpy()
+    assert labels[test_indices].sum() == 50
+    assert labels[train_indices].sum() == 150
+
+
+def test_stratified_kfold_partitions_rows():
+    df = _frame()
+    splits = KFoldSplitStrategy(n_splits=4, random_state=0).split_indices(df, "class")
+    assert len(splits) == 4
+    test_rows = np.concatenate([test for _, test in splits])
+    np.testing.assert_array_equal(np.sort(test_rows), np.arange(len(df)))
+    labels = df["class"].to_numpy()
+    for train_indices, test_indices in splits:
+        assert len(np.intersect1d(train_indices, test_indices)) == 0
+        assert labels[test_indices].sum() == 50
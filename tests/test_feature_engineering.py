@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.feature_engineering import (
+    BudgetedTfidfFeatureEngineeringStrategy,
+    HashingFeatureEngineeringStrategy,
+    StoredTfidfFeatureEngineeringStrategy,
+    compact_csr,
+)
+from src.feature_store import FeatureStore
+
+TRAIN, TEST = np.arange(0, 300), np.arange(300, 400)
+
+
+def _max_difference(left, right) -> float:
+    return abs(left - right).max() if left.nnz or right.nnz else 0.0
+
+
+@pytest.mark.parametrize("use_idf", [True, False])
+def test_hashing_split_matches_a_fit_on_the_training_rows(corpus, use_idf):
+    strategy = HashingFeatureEngineeringStrategy(n_features=2 ** 10, use_idf=use_idf)
+    xv_train, xv_test = strategy.fit_transform_split(corpus, TRAIN, TEST)
+    reference = HashingFeatureEngineeringStrategy(n_features=2 ** 10, use_idf=use_idf)
+    assert _max_difference(xv_train, reference.fit_transform(corpus.iloc[TRAIN])) == 0
+    assert _max_difference(xv_test, reference.transform(corpus.iloc[TEST])) == 0
+    # The served estimator reproduces the test features from raw text
+    served = strategy.get_vectorizer().transform(corpus["text"].iloc[TEST])
+    assert _max_difference(served, xv_test) == pytest.approx(0, abs=1e-6)
+    assert xv_train.shape[1] == 2 ** 10
+
+
+def test_parallel_hashing_matches_serial(corpus):
+    serial = HashingFeatureEngineeringStrategy(n_features=2 ** 10)
+    parallel = HashingFeatureEngineeringStrategy(n_features=2 ** 10, n_jobs=2, chunk_size=64)
+    for expected, actual in zip(serial.fit_transform_split(corpus, TRAIN, TEST),
+                                parallel.fit_transform_split(corpus, TRAIN, TEST)):
+        assert _max_difference(expected, actual) == 0
+
+
+def _reference(corpus):
+    vectorizer = TfidfVectorizer(dtype=np.float32)
+    xv_train = vectorizer.fit_transform(corpus["text"].iloc[TRAIN])
+    return vectorizer, xv_train, vectorizer.transform(corpus["text"].iloc[TEST])
+
+
+def test_stored_counts_match_tfidf_vectorizer(corpus):
+    vectorizer, expected_train, expected_test = _reference(corpus)
+    strategy = StoredTfidfFeatureEngineeringStrategy(None, corpus[["text"]])
+    xv_train, xv_test = strategy.fit_transform_split(corpus, TRAIN, TEST)
+    assert _max_difference(xv_train, expected_train) == 0
+    assert _max_difference(xv_test, expected_test) == 0
+    assert strategy.get_vectorizer().vocabulary_ == vectorizer.vocabulary_
+
+
+def test_entry_written_in_another_row_order(corpus, tmp_path):
+    store = FeatureStore(str(tmp_path))
+    # The entry is keyed by content regardless of order, so it is shared
+    StoredTfidfFeatureEngineeringStrategy(store, corpus.iloc[::-1].reset_index(drop=True))
+    strategy = StoredTfidfFeatureEngineeringStrategy(store, corpus)
+    assert not np.array_equal(strategy.entry.rows(corpus["text"]), np.arange(len(corpus)))
+
+    _, expected_train, expected_test = _reference(corpus)
+    xv_train, xv_test = strategy.fit_transform_split(corpus, TRAIN, TEST)
+    assert _max_difference(xv_train, expected_train) == 0
+    assert _max_difference(xv_test, expected_test) == 0
+
+
+def test_rebuilt_vectorizer_serves_like_the_fitted_matrices(corpus):
+    strategy = StoredTfidfFeatureEngineeringStrategy(None, corpus)
+    _, xv_test = strategy.fit_transform_split(corpus, TRAIN, TEST)
+    vectorizer = strategy.get_vectorizer()
+    # The vocabulary is held once, as the fitted attribute
+    assert vectorizer.get_params()["vocabulary"] is None
+    assert _max_difference(vectorizer.transform(corpus["text"].iloc[TEST]), xv_test) == pytest.approx(0, abs=1e-6)
+
+
+def test_chi2_budget_does_not_depend_on_stored_row_order(corpus, tmp_path):
+    store = FeatureStore(str(tmp_path))
+    StoredTfidfFeatureEngineeringStrategy(store, corpus.iloc[::-1].reset_index(drop=True))
+    vocabularies = []
+    for strategy_store in (store, None):
+        strategy = BudgetedTfidfFeatureEngineeringStrategy(
+            strategy_store, corpus, max_features=6, selection="chi2", labels=corpus["class"])
+        strategy.fit_transform_split(corpus, TRAIN, TEST)
+        vocabularies.append(strategy.get_vectorizer().vocabulary_)
+    assert vocabularies[0] == vocabularies[1]
+    assert {"alpha", "beta", "gamma", "delta", "epsilon", "zeta"} == set(vocabularies[0])
+
+
+def test_chi2_budget_keeps_the_labels_of_duplicate_texts():
+    # The same text under both labels shares one stored row; it carries no
+    # class information, so only the cue words fit a budget of two terms
+    texts = ["breaking story"] * 100 + ["alpha report"] * 30 + ["delta report"] * 30
+    labels = np.array([1] * 50 + [0] * 50 + [1] * 30 + [0] * 30)
+    corpus = pd.DataFrame({"text": texts})
+    strategy = BudgetedTfidfFeatureEngineeringStrategy(
+        None, corpus, min_df=1, max_df=1.0, max_features=2, selection="chi2", labels=labels)
+    strategy.fit_transform_split(corpus, np.arange(len(corpus) - 1), np.array([len(corpus) - 1]))
+    assert set(strategy.get_vectorizer().vocabulary_) == {"alpha", "delta"}
+
+
+def test_compact_csr_does_not_modify_its_input():
+    matrix = csr_matrix(np.eye(4, dtype=np.float32))
+    matrix.indices = matrix.indices.astype(np.int64)
+    matrix.indptr = matrix.indptr.astype(np.int64)
+    compact = compact_csr(matrix)
+    assert compact.indices.dtype == np.int32 and compact.indptr.dtype == np.int32
+    assert matrix.indices.dtype == np.int64 and matrix.indptr.dtype == np.int64
+    assert _max_difference(compact, matrix) == 0
+    assert compact_csr(compact) is compact
+
+
+def test_float32_features_predict_like_float64(corpus):
+    labels = corpus["class"].to_numpy()
+    predictions = {}
+    for dtype in (np.float64, np.float32):
+        strategy = StoredTfidfFeatureEngineeringStrategy(None, corpus, dtype=dtype)
+        xv_train, xv_test = strategy.fit_transform_split(corpus, TRAIN, TEST)
+        xv_train, xv_test = compact_csr(xv_train, dtype), compact_csr(xv_test, dtype)
+        assert xv_train.dtype == dtype and xv_test.indices.dtype == np.int32
+        model = LogisticRegression().fit(xv_train, labels[TRAIN])
+        # Served from raw text, the rebuilt vectorizer keeps the dtype
+        assert strategy.get_vectorizer().transform(corpus["text"].iloc[TEST]).dtype == dtype
+        predictions[dtype] = model.predict(xv_test)
+    # Parity is only meaningful on a model well above chance
+    assert (predictions[np.float64] == labels[TEST]).mean() > 0.9
+    np.testing.assert_array_equal(predictions[np.float32], predictions[np.float64])
@@ -0,0 +1,52 @@
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.data_splitter import KFoldSplitStrategy
+from src.hyperparameter_search import HyperparameterSearch, load_mmap_csr, save_mmap_csr
+
+
+def _inputs(corpus):
+    counts = CountVectorizer().fit_transform(corpus["text"])
+    splits = KFoldSplitStrategy(n_splits=3, random_state=0).split_indices(corpus, "class")
+    return counts, corpus["class"].to_numpy(), splits
+
+
+def test_mmap_csr_round_trip(tmp_path, corpus):
+    counts = CountVectorizer().fit_transform(corpus["text"])
+    save_mmap_csr(counts, str(tmp_path))
+    loaded = load_mmap_csr(str(tmp_path))
+    # The arrays are read-only views of the mapped files, not copies
+    assert not loaded.data.flags.writeable
+    assert (loaded != counts).nnz == 0
+
+
+def test_search_ranks_trials_and_reports_failures_last(tmp_path, corpus):
+    counts, labels, splits = _inputs(corpus)
+    grid = {"C": [0.01, 10.0], "min_df": [1, 50], "penalty": ["l2", "elasticnet"]}
+    results = HyperparameterSearch(grid).run(counts, labels, splits, work_dir=str(tmp_path))
+
+    assert len(results) == 8
+    # lbfgs does not support elasticnet: those trials fail and sort last
+    failed = results[results["error"].notna()]
+    assert set(failed["penalty"]) == {"elasticnet"}
+    assert failed.index.min() == 4
+    assert failed["accuracy"].isna().all()
+
+    succeeded = results.iloc[:4]
+    assert succeeded["accuracy"].is_monotonic_decreasing
+    assert succeeded["accuracy"].iloc[0] > 0.9
+    assert (succeeded.loc[succeeded["min_df"] == 50, "n_features"].max()
+            < succeeded.loc[succeeded["min_df"] == 1, "n_features"].min())
+    # The shared arrays are removed with the search
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parallel_search_matches_sequential(corpus):
+    counts, labels, splits = _inputs(corpus)
+    grid = {"C": [0.1, 1.0], "sublinear_tf": [False, True]}
+    sequential = HyperparameterSearch(grid, n_jobs=1).run(counts, labels, splits)
+    parallel = HyperparameterSearch(grid, n_jobs=2).run(counts, labels, splits)
+    key = ["C", "sublinear_tf"]
+    sequential = sequential.sort_values(key, ignore_index=True)
+    parallel = parallel.sort_values(key, ignore_index=True)
+    np.testing.assert_allclose(parallel["accuracy"], sequential["accuracy"])
@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.data_clean import TextCleaningEngine
+from src.incremental_training import (
+    IncrementalLogisticTrainer,
+    iter_matrix_chunks,
+    matrix_fingerprint,
+    train_from_file,
+)
+
+
+class Interrupt(Exception):
+    pass
+
+
+def _interrupt_at(step_number):
+    def callback(metrics, step):
+        if step == step_number:
+            raise Interrupt()
+    return callback
+
+
+@pytest.fixture(scope="module")
+def features(corpus):
+    X = TfidfVectorizer().fit_transform(corpus["text"])
+    return X, corpus["class"].to_numpy()
+
+
+def test_fingerprint_covers_values_not_just_sparsity(features):
+    X, y = features
+    fingerprint = matrix_fingerprint(X, y, 50)
+    assert matrix_fingerprint(X.copy(), y.copy(), 50) == fingerprint
+    assert matrix_fingerprint(X.astype(np.float32), y, 50) != fingerprint
+    rescaled = X.copy()
+    rescaled.data = rescaled.data * 2
+    assert matrix_fingerprint(rescaled, y, 50) != fingerprint
+    assert matrix_fingerprint(X, 1 - y, 50) != fingerprint
+    assert matrix_fingerprint(X, y, 40) != fingerprint
+
+
+def _trainer(y, checkpoint_path, fingerprint, **kwargs):
+    return IncrementalLogisticTrainer(classes=np.unique(y), epochs=3, checkpoint_path=checkpoint_path,
+                                      checkpoint_every=1, fingerprint=fingerprint, **kwargs)
+
+
+def test_resumed_training_matches_an_uninterrupted_run(features, tmp_path):
+    X, y = features
+    chunks = lambda epoch: iter_matrix_chunks(X, y, 50, epoch=epoch)  # noqa: E731
+    fingerprint = matrix_fingerprint(X, y, 50)
+    expected = _trainer(y, None, fingerprint).fit(chunks)
+
+    checkpoint = str(tmp_path / "checkpoint.joblib")
+    with pytest.raises(Interrupt):
+        _trainer(y, checkpoint, fingerprint, metrics_callback=_interrupt_at(13)).fit(chunks)
+    assert os.path.exists(checkpoint)
+    resumed = _trainer(y, checkpoint, fingerprint)
+    model = resumed.fit(chunks)
+    np.testing.assert_allclose(model.coef_, expected.coef_)
+    assert resumed.global_step == 3 * 8
+    assert not os.path.exists(checkpoint)
+
+
+def test_checkpoint_for_other_features_is_ignored(features, tmp_path):
+    X, y = features
+    checkpoint = str(tmp_path / "checkpoint.joblib")
+    with pytest.raises(Interrupt):
+        _trainer(y, checkpoint, matrix_fingerprint(X, y, 50),
+                 metrics_callback=_interrupt_at(13)).fit(lambda epoch: iter_matrix_chunks(X, y, 50, epoch=epoch))
+    X32 = X.astype(np.float32)
+    trainer = _trainer(y, checkpoint, matrix_fingerprint(X32, y, 50))
+    trainer.fit(lambda epoch: iter_matrix_chunks(X32, y, 50, epoch=epoch))
+    assert trainer.global_step == 3 * 8
+
+
+def test_train_from_file_streams_the_file(corpus, tmp_path):
+    path = str(tmp_path / "articles.csv")
+    corpus.to_csv(path, index=False)
+    checkpoint = str(tmp_path / "checkpoint.joblib")
+    kwargs = dict(classes=np.array([0, 1]), chunk_size=64, n_features=2 ** 12, epochs=2)
+    expected, vectorizer = train_from_file(path, **kwargs)
+
+    with pytest.raises(Interrupt):
+        train_from_file(path, checkpoint_path=checkpoint, checkpoint_every=1,
+                        metrics_callback=_interrupt_at(9), **kwargs)
+    model, _ = train_from_file(path, checkpoint_path=checkpoint, **kwargs)
+    np.testing.assert_allclose(model.coef_, expected.coef_)
+
+    cleaned = TextCleaningEngine().clean_batch(corpus["text"])
+    accuracy = (model.predict(vectorizer.transform(cleaned)) == corpus["class"]).mean()
+    assert accuracy > 0.95
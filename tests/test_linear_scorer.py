@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.linear_scorer import FusedLinearScorer, build_fused_scorer
+
+UNSEEN = ["", "entirely unseen tokens here", "alpha alpha alpha word1"]
+
+
+@pytest.mark.parametrize("params", [{}, {"sublinear_tf": True}, {"binary": True, "norm": "l1"},
+                                    {"use_idf": False, "ngram_range": (1, 2)}])
+def test_fused_scorer_matches_sklearn(corpus, params):
+    vectorizer = TfidfVectorizer(**params)
+    model = LogisticRegression().fit(vectorizer.fit_transform(corpus["text"].iloc[:300]),
+                                     corpus["class"].iloc[:300])
+    texts = corpus["text"].iloc[300:].tolist() + UNSEEN
+    scorer = FusedLinearScorer.from_fitted(vectorizer, model)
+    np.testing.assert_allclose(scorer.decision_function(texts),
+                               model.decision_function(vectorizer.transform(texts)), atol=1e-10)
+    np.testing.assert_array_equal(scorer.predict(texts), model.predict(vectorizer.transform(texts)))
+
+
+def test_unsupported_pairs_fall_back(corpus, fitted):
+    model, _ = fitted
+    assert build_fused_scorer(HashingVectorizer(), model) is None
+    vectorizer = TfidfVectorizer()
+    multiclass = LogisticRegression().fit(vectorizer.fit_transform(corpus["text"]), np.arange(len(corpus)) % 3)
+    assert build_fused_scorer(vectorizer, multiclass) is None
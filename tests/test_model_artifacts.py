@@ -0,0 +1,112 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.model_artifacts import (
+    FIDELITY_FILE,
+    MmapLinearScorer,
+    QuantizedLinearScorer,
+    load_mmap_scorer,
+    quantize_blocks,
+    remove_artifacts,
+    save_mmap_artifacts,
+    save_quantized_artifacts,
+)
+
+UNSEEN = ["", "entirely unseen tokens here", "alpha alpha alpha word1"]
+
+
+def _texts(corpus):
+    return corpus["text"].iloc[300:].tolist() + UNSEEN
+
+
+def test_mmap_scorer_matches_sklearn(corpus, fitted, tmp_path):
+    model, vectorizer = fitted
+    texts = _texts(corpus)
+    save_mmap_artifacts(model, vectorizer, str(tmp_path))
+    scorer = load_mmap_scorer(str(tmp_path))
+    assert type(scorer) is MmapLinearScorer
+    np.testing.assert_allclose(scorer.predict_proba(texts),
+                               model.predict_proba(vectorizer.transform(texts)), atol=1e-10)
+    assert abs(scorer.transform(texts) - vectorizer.transform(texts)).max() < 1e-10
+
+
+def test_export_replaces_the_previous_directory(corpus, fitted, tmp_path):
+    model, vectorizer = fitted
+    directory = tmp_path / "model_artifacts"
+    directory.mkdir()
+    (directory / "stale.npy").write_bytes(b"old")
+    save_mmap_artifacts(model, vectorizer, str(directory))
+    assert not (directory / "stale.npy").exists()
+    assert os.listdir(tmp_path) == ["model_artifacts"]
+    np.testing.assert_allclose(load_mmap_scorer(str(directory)).decision_function(_texts(corpus)),
+                               model.decision_function(vectorizer.transform(_texts(corpus))), atol=1e-10)
+
+
+def test_failed_export_leaves_the_previous_directory(fitted, tmp_path, monkeypatch):
+    model, vectorizer = fitted
+    directory = str(tmp_path / "model_artifacts")
+    save_mmap_artifacts(model, vectorizer, directory)
+    before = sorted(os.listdir(directory))
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    # Fail after the arrays are written, before meta.json
+    monkeypatch.setattr("src.model_artifacts._write_meta", fail)
+    with pytest.raises(OSError):
+        save_mmap_artifacts(model, vectorizer, directory)
+    assert sorted(os.listdir(directory)) == before
+    assert os.listdir(tmp_path) == ["model_artifacts"]
+    remove_artifacts(directory)
+    assert not os.path.exists(directory)
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("int16", 1e-3), ("int8", 5e-2)])
+def test_quantized_scorer_tracks_sklearn(corpus, fitted, tmp_path, dtype, tolerance):
+    model, vectorizer = fitted
+    texts = _texts(corpus)
+    report = save_quantized_artifacts(model, vectorizer, str(tmp_path), dtype=dtype, block_size=64,
+                                      fidelity_texts=texts, report={"note": "test"})
+    scorer = load_mmap_scorer(str(tmp_path))
+    assert type(scorer) is QuantizedLinearScorer
+    with open(tmp_path / FIDELITY_FILE, encoding="utf-8") as f:
+        assert json.load(f) == report
+    assert report["n_documents"] == len(texts) and report["note"] == "test"
+    assert report["max_probability_delta"] < tolerance
+    assert report["agreement_rate"] >= 0.99
+    # Same vocabulary and sparsity as the float vectorizer
+    expected = vectorizer.transform(texts)
+    assert (scorer.transform(texts) != 0).toarray().tolist() == (expected != 0).toarray().tolist()
+
+
+def test_failed_fidelity_check_keeps_the_previous_quantized_export(fitted, tmp_path, monkeypatch):
+    model, vectorizer = fitted
+    directory = str(tmp_path / "model_artifacts_quantized")
+    save_quantized_artifacts(model, vectorizer, directory, dtype="int16", fidelity_texts=["alpha"])
+    before = {name: os.path.getmtime(os.path.join(directory, name)) for name in os.listdir(directory)}
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("fidelity check failed")
+
+    monkeypatch.setattr("src.model_artifacts.quantization_fidelity", fail)
+    with pytest.raises(RuntimeError):
+        save_quantized_artifacts(model, vectorizer, directory, dtype="int8", fidelity_texts=["alpha"])
+    assert {name: os.path.getmtime(os.path.join(directory, name)) for name in os.listdir(directory)} == before
+    assert load_mmap_scorer(directory).block_size and os.listdir(tmp_path) == ["model_artifacts_quantized"]
+
+
+@pytest.mark.parametrize("dtype", ["int8", "int16"])
+def test_quantize_blocks_error_is_within_half_a_step(dtype):
+    values = np.random.default_rng(0).normal(size=1000) * np.repeat([1e-3, 1.0, 50.0, 0.0], 250)
+    quantized, scales = quantize_blocks(values, dtype, block_size=100)
+    assert quantized.dtype == np.dtype(dtype) and len(scales) == 10
+    restored = quantized * np.repeat(scales.astype(np.float64), 100)
+    assert np.all(np.abs(restored - values) <= np.repeat(scales, 100) * (0.5 + 1e-6))
+
+
+def test_quantize_blocks_rejects_unknown_types():
+    with pytest.raises(ValueError):
+        quantize_blocks(np.ones(3), "int4")
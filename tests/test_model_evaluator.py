@@ -0,0 +1,32 @@
+import pytest
+from sklearn.metrics import accuracy_score, average_precision_score, confusion_matrix, log_loss, roc_auc_score
+
+from src.model_evaluator import StreamingModelEvaluatorStrategy
+
+
+def test_streaming_metrics_match_sklearn(corpus, fitted):
+    model, vectorizer = fitted
+    xv_test = vectorizer.transform(corpus["text"].iloc[300:])
+    y_test = corpus["class"].iloc[300:]
+    probabilities = model.predict_proba(xv_test)
+    predictions = model.predict(xv_test)
+
+    metrics = StreamingModelEvaluatorStrategy(chunk_size=17).evaluate(model, xv_test, y_test)
+    assert metrics["chunks"] == 6
+    assert metrics["accuracy"] == pytest.approx(accuracy_score(y_test, predictions))
+    assert metrics["log_loss"] == pytest.approx(log_loss(y_test, probabilities), rel=1e-9)
+    assert metrics["confusion_matrix"] == confusion_matrix(y_test, predictions).tolist()
+    # Exact up to the histogram resolution
+    assert metrics["roc_auc"] == pytest.approx(roc_auc_score(y_test, probabilities[:, 1]), abs=1e-2)
+    assert metrics["pr_auc"] == pytest.approx(average_precision_score(y_test, probabilities[:, 1]), abs=1e-2)
+
+
+def test_chunk_size_does_not_change_the_metrics(corpus, fitted):
+    model, vectorizer = fitted
+    xv_test = vectorizer.transform(corpus["text"].iloc[300:])
+    y_test = corpus["class"].iloc[300:]
+    whole = StreamingModelEvaluatorStrategy(chunk_size=1000).evaluate(model, xv_test, y_test)
+    chunked = StreamingModelEvaluatorStrategy(chunk_size=7).evaluate(model, xv_test, y_test)
+    for name in ("accuracy", "roc_auc", "pr_auc", "confusion_matrix"):
+        assert chunked[name] == whole[name]
+    assert chunked["log_loss"] == pytest.approx(whole["log_loss"], rel=1e-12)
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from src.outlier_detection import (
+    DropOutliers,
+    FlagOutliers,
+    OutlierBounds,
+    OutlierDetector,
+    TruncateOutliers,
+    compute_document_stats,
+)
+
+NORMAL = "the senate passed the budget bill after a long debate on spending"
+BOUNDS = OutlierBounds(max_chars=200, min_tokens=3, max_tokens=30,
+                       max_non_alpha_ratio=0.5, max_repetition_ratio=0.8)
+
+
+def _articles():
+    return pd.DataFrame({"text": [
+        NORMAL,
+        " ".join(f"word{index}" for index in range(10)) + " " + NORMAL * 5,  # too long
+        "hi there",  # too few tokens
+        "<div>{{123}}</div> <p>$$$ ### 9999</p>",  # markup dump
+        "subscribe now " * 10,  # repeated boilerplate
+        None,
+    ], "class": [1, 0, 1, 0, 1, 0]}, index=[10, 11, 12, 13, 14, 15])
+
+
+def test_document_stats():
+    stats = compute_document_stats(pd.Series(["a b a", "1 2", None]))
+    assert stats["token_count"].tolist() == [3, 2, 0]
+    assert stats["unique_tokens"].tolist() == [2, 2, 0]
+    assert stats["repetition_ratio"].iloc[0] == pytest.approx(1 / 3)
+    assert stats["non_alpha_ratio"].tolist() == [0.0, 1.0, 0.0]
+
+
+def test_flag_reports_every_reason():
+    result = OutlierDetector(FlagOutliers(), BOUNDS).handle(_articles(), "text")
+    assert result["is_outlier"].tolist() == [False, True, True, True, True, True]
+    reasons = result["outlier_reasons"]
+    assert "too_long" in reasons[11] and "too_many_tokens" in reasons[11]
+    assert reasons[12] == "too_few_tokens" and reasons[15] == "too_few_tokens"
+    assert reasons[13] == "non_alphabetic" and reasons[14] == "repetitive"
+
+
+def test_drop_removes_outliers_and_reports_savings():
+    detector = OutlierDetector(DropOutliers(), BOUNDS)
+    result = detector.handle(_articles(), "text")
+    assert result.index.tolist() == [10]
+    assert detector.report["outliers"] == 5 and detector.report["output_rows"] == 1
+    assert detector.report["chars_removed"] > 0 and detector.report["estimated_nnz_saved"] > 0
+
+
+def test_truncate_shortens_long_documents_at_a_token_boundary():
+    articles = _articles()
+    detector = OutlierDetector(TruncateOutliers(), BOUNDS)
+    result = detector.handle(articles, "text")
+    assert result.index.tolist() == [10, 11]
+    truncated = result.loc[11, "text"]
+    assert len(truncated) <= BOUNDS.max_chars and len(truncated.split()) <= BOUNDS.max_tokens
+    assert articles.loc[11, "text"].startswith(truncated)
+    assert set(truncated.split()) <= set(articles.loc[11, "text"].split())
+    assert result.loc[10, "text"] == NORMAL
@@ -0,0 +1,58 @@
+import sqlite3
+
+from src.prediction_cache import PredictionCache, deployed_model_version, record_deployed_model
+
+
+def test_misses_are_computed_once_and_then_served_from_cache():
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        return [len(text) for text in texts]
+
+    cache = PredictionCache(model_version="v1")
+    assert cache.get_or_compute_many(["ab", "abc", "ab"], compute) == [2, 3, 2]
+    assert cache.get_or_compute_many(["abc", "abcd"], compute) == [3, 4]
+    assert calls == [["ab", "abc"], ["abcd"]]
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_are_evicted_least_recently_used_first():
+    cache = PredictionCache(model_version="v1", max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_a_new_model_version_invalidates_memory_and_disk(tmp_path):
+    path = str(tmp_path / "predictions.sqlite")
+    version = {"current": "v1"}
+    cache = PredictionCache(model_version=lambda: version["current"], disk_path=path)
+    cache.put("article", 1)
+    assert PredictionCache(model_version="v1", disk_path=path).get("article") == 1
+    version["current"] = "v2"
+    assert cache.get("article") is None
+    assert PredictionCache(model_version="v1", disk_path=path).get("article") is None
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    path = str(tmp_path / "predictions.sqlite")
+    cache = PredictionCache(model_version="v1", disk_path=path, max_disk_entries=5)
+    for index in range(12):
+        cache.put(f"article {index}", index)
+    PredictionCache(model_version="v1", disk_path=path, max_disk_entries=5)
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] <= 5
+    assert PredictionCache(model_version="v1", disk_path=path).get("article 11") == 11
+
+
+def test_deployed_model_version_follows_the_recorded_uri(tmp_path):
+    path = str(tmp_path / "deployed_model_uri")
+    assert deployed_model_version(path) == "unknown"
+    record_deployed_model("runs:/1/model", path)
+    first = deployed_model_version(path)
+    record_deployed_model("runs:/2/model", path)
+    assert deployed_model_version(path) not in (first, "unknown")
@@ -0,0 +1,26 @@
+import numpy as np
+
+from src.vocabulary_budget import select_budget, vocabulary_budget_report
+
+TRAIN = np.arange(0, 300)
+
+
+def test_report_compares_budgets_on_training_rows_only(corpus):
+    labels = corpus["class"].to_numpy()
+    report = vocabulary_budget_report(corpus, labels, TRAIN, [6, 50], min_df=2, max_df=0.95)
+    assert list(report["budget"]) == ["full", "6", "50"]
+    assert list(report["n_features"].iloc[1:]) == [6, 50]
+    assert report.loc[0, "accuracy_drop"] == 0
+    assert (report["accuracy"] > 0.9).all()
+
+    # Labels outside the training rows are never read
+    flipped = labels.copy()
+    flipped[300:] = 1 - flipped[300:]
+    again = vocabulary_budget_report(corpus, flipped, TRAIN, [6, 50], min_df=2, max_df=0.95)
+    np.testing.assert_array_equal(again["accuracy"], report["accuracy"])
+
+
+def test_select_budget_picks_the_smallest_model_within_tolerance(corpus):
+    report = vocabulary_budget_report(corpus, corpus["class"].to_numpy(), TRAIN, [6, 50])
+    selected = select_budget(report, tolerance=0.05)
+    assert selected["budget"] == "6"